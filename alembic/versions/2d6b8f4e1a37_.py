@@ -0,0 +1,29 @@
+"""empty message
+
+Revision ID: 2d6b8f4e1a37
+Revises: 7c3f1a9d2e58
+Create Date: 2025-10-30 14:26:51.903412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d6b8f4e1a37'
+down_revision: Union[str, Sequence[str], None] = '7c3f1a9d2e58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('trgm_sample_name_idx', 'sample', [sa.text('lower(name) gin_trgm_ops')], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('trgm_sample_name_idx', table_name='sample', postgresql_using='gin')
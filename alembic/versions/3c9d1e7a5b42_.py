@@ -0,0 +1,47 @@
+"""empty message
+
+Revision ID: 3c9d1e7a5b42
+Revises: e55c814fd42e
+Create Date: 2025-10-20 09:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d1e7a5b42'
+down_revision: Union[str, Sequence[str], None] = 'e55c814fd42e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'media_blob',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sha256', sa.CHAR(length=64), nullable=False),
+        sa.Column('extension', sa.String(length=16), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('timestamp_utc', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('unreferenced_utc', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('sha256', 'extension', name='uq_media_blob_sha256_extension'),
+    )
+    op.create_index('ix_media_blob_unreferenced_utc', 'media_blob', ['unreferenced_utc'], unique=False, postgresql_where=sa.text('unreferenced_utc IS NOT NULL'))
+    op.add_column('media_file', sa.Column('blob_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_media_file_blob_id'), 'media_file', ['blob_id'], unique=False)
+    op.create_foreign_key(None, 'media_file', 'media_blob', ['blob_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('media_file_blob_id_fkey', 'media_file', type_='foreignkey')
+    op.drop_index(op.f('ix_media_file_blob_id'), table_name='media_file')
+    op.drop_column('media_file', 'blob_id')
+    op.drop_index('ix_media_blob_unreferenced_utc', table_name='media_blob', postgresql_where=sa.text('unreferenced_utc IS NOT NULL'))
+    op.drop_table('media_blob')
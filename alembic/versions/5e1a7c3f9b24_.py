@@ -0,0 +1,38 @@
+"""empty message
+
+Revision ID: 5e1a7c3f9b24
+Revises: 8b2f4c6d1e90
+Create Date: 2025-10-24 09:41:52.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1a7c3f9b24'
+down_revision: Union[str, Sequence[str], None] = '8b2f4c6d1e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # keep the latest row of duplicated (library, experiment, lane) qualities
+    op.execute("""
+        DELETE FROM seqquality AS q USING seqquality AS newer
+        WHERE q.library_id IS NOT DISTINCT FROM newer.library_id
+        AND q.experiment_id = newer.experiment_id
+        AND q.lane = newer.lane
+        AND q.id < newer.id
+    """)
+    op.create_unique_constraint(
+        'uq_seqquality_library_experiment_lane', 'seqquality', ['library_id', 'experiment_id', 'lane'],
+        postgresql_nulls_not_distinct=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_seqquality_library_experiment_lane', 'seqquality', type_='unique')
@@ -0,0 +1,173 @@
+"""empty message
+
+Revision ID: 5e9a3c7b1d42
+Revises: 2d6b8f4e1a37
+Create Date: 2025-10-31 11:08:43.207915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9a3c7b1d42'
+down_revision: Union[str, Sequence[str], None] = '2d6b8f4e1a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OVERVIEW_TABLES = {
+    "lane": "experiment_overview_rows_changed",
+    "lane_pool_link": "experiment_overview_rows_changed",
+    "pool": "experiment_overview_pools_changed",
+    "library": "experiment_overview_libraries_changed",
+    "seq_request": "experiment_overview_seq_requests_changed",
+}
+
+TRANSITION_TABLES = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+# only renames of a request are shown in the overview
+TABLE_EVENTS = {
+    "seq_request": ("UPDATE",),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('experiment_overview',
+    sa.Column('experiment_id', sa.Integer(), nullable=False),
+    sa.Column('graph', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('lanes', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('stale', sa.Boolean(), nullable=False),
+    sa.Column('computed_utc', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['experiment_id'], ['experiment.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('experiment_id')
+    )
+    op.execute("""
+    CREATE OR REPLACE FUNCTION mark_experiment_overviews_stale(experiment_ids integer[]) RETURNS void AS $$
+    DECLARE
+        marked integer[];
+        chunk integer[];
+    BEGIN
+        WITH upserted AS (
+            INSERT INTO experiment_overview (experiment_id, stale)
+            SELECT experiment.id, true FROM experiment WHERE experiment.id = ANY(experiment_ids)
+            ON CONFLICT (experiment_id) DO UPDATE SET stale = true
+            RETURNING experiment_id
+        )
+        SELECT array_agg(experiment_id ORDER BY experiment_id) INTO marked FROM upserted;
+
+        FOR chunk IN
+            SELECT array_agg(parts.id ORDER BY parts.id) FROM (
+                SELECT id, (row_number() OVER (ORDER BY id) - 1) / 500 AS part FROM unnest(marked) AS id
+            ) AS parts
+            GROUP BY parts.part
+        LOOP
+            PERFORM pg_notify('experiment_overview_stale', json_build_object('table', 'experiment_overview', 'ids', chunk)::text);
+        END LOOP;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE OR REPLACE FUNCTION experiment_overview_rows_changed() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            PERFORM mark_experiment_overviews_stale(ARRAY(SELECT experiment_id FROM new_rows));
+        ELSIF TG_OP = 'DELETE' THEN
+            PERFORM mark_experiment_overviews_stale(ARRAY(SELECT experiment_id FROM old_rows));
+        ELSE
+            PERFORM mark_experiment_overviews_stale(ARRAY(
+                SELECT experiment_id FROM new_rows UNION SELECT experiment_id FROM old_rows
+            ));
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE OR REPLACE FUNCTION experiment_overview_pools_changed() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            PERFORM mark_experiment_overviews_stale(ARRAY(SELECT experiment_id FROM new_rows));
+        ELSIF TG_OP = 'DELETE' THEN
+            PERFORM mark_experiment_overviews_stale(ARRAY(SELECT experiment_id FROM old_rows));
+        ELSE
+            PERFORM mark_experiment_overviews_stale(ARRAY(
+                SELECT unnest(ARRAY[new_rows.experiment_id, old_rows.experiment_id])
+                FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE (new_rows.experiment_id, new_rows.name, new_rows.num_m_reads_requested)
+                    IS DISTINCT FROM (old_rows.experiment_id, old_rows.name, old_rows.num_m_reads_requested)
+            ));
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE OR REPLACE FUNCTION experiment_overview_libraries_changed() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            PERFORM mark_experiment_overviews_stale(ARRAY(
+                SELECT pool.experiment_id FROM new_rows JOIN pool ON pool.id = new_rows.pool_id
+            ));
+        ELSIF TG_OP = 'DELETE' THEN
+            PERFORM mark_experiment_overviews_stale(ARRAY(
+                SELECT pool.experiment_id FROM old_rows JOIN pool ON pool.id = old_rows.pool_id
+            ));
+        ELSE
+            PERFORM mark_experiment_overviews_stale(ARRAY(
+                SELECT pool.experiment_id
+                FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+                JOIN pool ON pool.id IN (new_rows.pool_id, old_rows.pool_id)
+                WHERE (new_rows.pool_id, new_rows.type_id, new_rows.seq_request_id)
+                    IS DISTINCT FROM (old_rows.pool_id, old_rows.type_id, old_rows.seq_request_id)
+            ));
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE OR REPLACE FUNCTION experiment_overview_seq_requests_changed() RETURNS trigger AS $$
+    BEGIN
+        PERFORM mark_experiment_overviews_stale(ARRAY(
+            SELECT DISTINCT pool.experiment_id
+            FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+            JOIN library ON library.seq_request_id = new_rows.id
+            JOIN pool ON pool.id = library.pool_id
+            WHERE new_rows.name IS DISTINCT FROM old_rows.name
+        ));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    for table, function in OVERVIEW_TABLES.items():
+        for event in TABLE_EVENTS.get(table, TRANSITION_TABLES):
+            op.execute(f"""
+            CREATE OR REPLACE TRIGGER {table}_overview_{event.lower()}
+            AFTER {event} ON {table}
+            REFERENCING {TRANSITION_TABLES[event]}
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+            """)
+
+    # computed by the next experiment_overviews run of the scheduler
+    op.execute("INSERT INTO experiment_overview (experiment_id, stale) SELECT id, true FROM experiment")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in OVERVIEW_TABLES:
+        for event in TABLE_EVENTS.get(table, TRANSITION_TABLES):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_overview_{event.lower()} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS experiment_overview_seq_requests_changed()")
+    op.execute("DROP FUNCTION IF EXISTS experiment_overview_rows_changed()")
+    op.execute("DROP FUNCTION IF EXISTS experiment_overview_pools_changed()")
+    op.execute("DROP FUNCTION IF EXISTS experiment_overview_libraries_changed()")
+    op.execute("DROP FUNCTION IF EXISTS mark_experiment_overviews_stale(integer[])")
+    op.drop_table('experiment_overview')
@@ -0,0 +1,56 @@
+"""empty message
+
+Revision ID: 7c3f1a9d2e58
+Revises: a4d8e2b6c1f3
+Create Date: 2025-10-29 09:42:17.518306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3f1a9d2e58'
+down_revision: Union[str, Sequence[str], None] = 'a4d8e2b6c1f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUS_TABLES = ("seq_run", "experiment", "library", "project")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+    CREATE OR REPLACE FUNCTION notify_status_changed() RETURNS trigger AS $$
+    DECLARE
+        chunk integer[];
+    BEGIN
+        FOR chunk IN
+            SELECT array_agg(changed.id ORDER BY changed.id) FROM (
+                SELECT new_rows.id, (row_number() OVER (ORDER BY new_rows.id) - 1) / 500 AS part
+                FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE new_rows.status_id IS DISTINCT FROM old_rows.status_id
+            ) AS changed
+            GROUP BY changed.part
+        LOOP
+            PERFORM pg_notify('status_changed', json_build_object('table', TG_TABLE_NAME, 'ids', chunk)::text);
+        END LOOP;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    for table in STATUS_TABLES:
+        op.execute(f"""
+        CREATE OR REPLACE TRIGGER {table}_status_changed
+        AFTER UPDATE ON {table}
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_status_changed()
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in STATUS_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_status_changed ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_status_changed()")
@@ -0,0 +1,64 @@
+"""empty message
+
+Revision ID: 8b2f4c6d1e90
+Revises: 3c9d1e7a5b42
+Create Date: 2025-10-22 14:03:17.502931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2f4c6d1e90'
+down_revision: Union[str, Sequence[str], None] = '3c9d1e7a5b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'seq_run_metric',
+        sa.Column('seq_run_id', sa.Integer(), nullable=False),
+        sa.Column('metric', sa.String(length=64), nullable=False),
+        sa.Column('lane', sa.SmallInteger(), nullable=False),
+        sa.Column('read', sa.SmallInteger(), nullable=False),
+        sa.Column('value', sa.Float(), nullable=False),
+        sa.Column('unit', sa.String(length=16), nullable=False),
+        sa.ForeignKeyConstraint(['seq_run_id'], ['seq_run.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('seq_run_id', 'metric', 'lane', 'read'),
+    )
+    op.create_index('ix_seq_run_metric_metric_lane_read', 'seq_run_metric', ['metric', 'lane', 'read'], unique=False)
+
+    # quantities were stored as {"value": <base value>, "unit": <base unit>, "dimension": ...}
+    op.execute("""
+        INSERT INTO seq_run_metric (seq_run_id, metric, lane, read, value, unit)
+        SELECT seq_run.id, q.key, 0, 0, (q.value->>'value')::float, q.value->>'unit'
+        FROM seq_run, jsonb_each(seq_run.quantities) AS q
+        WHERE seq_run.quantities IS NOT NULL AND q.value->>'value' IS NOT NULL AND q.value->>'unit' IS NOT NULL
+    """)
+    op.drop_column('seq_run', 'quantities')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('seq_run', sa.Column('quantities', postgresql.JSONB(astext_type=sa.Text()), autoincrement=False, nullable=True))
+    op.execute("""
+        UPDATE seq_run SET quantities = summary.quantities
+        FROM (
+            SELECT seq_run_id, jsonb_object_agg(metric, jsonb_build_object(
+                'value', value, 'unit', unit,
+                'dimension', CASE unit WHEN 'read' THEN 'read_count' WHEN 'percent' THEN 'percentage' ELSE 'count' END
+            )) AS quantities
+            FROM seq_run_metric
+            WHERE lane = 0 AND read = 0
+            GROUP BY seq_run_id
+        ) AS summary
+        WHERE seq_run.id = summary.seq_run_id
+    """)
+    op.drop_index('ix_seq_run_metric_metric_lane_read', table_name='seq_run_metric')
+    op.drop_table('seq_run_metric')
@@ -0,0 +1,46 @@
+"""empty message
+
+Revision ID: a4d8e2b6c1f3
+Revises: 5e1a7c3f9b24
+Create Date: 2025-10-27 11:18:06.734215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d8e2b6c1f3'
+down_revision: Union[str, Sequence[str], None] = '5e1a7c3f9b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'slow_query',
+        sa.Column('fingerprint', sa.CHAR(length=32), nullable=False),
+        sa.Column('statement', sa.Text(), nullable=False),
+        sa.Column('calls', sa.BigInteger(), nullable=False),
+        sa.Column('total_ms', sa.Float(), nullable=False),
+        sa.Column('max_ms', sa.Float(), nullable=False),
+        sa.Column('first_seen_utc', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_seen_utc', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_statement', sa.Text(), nullable=False),
+        sa.Column('last_parameters', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('last_source', sa.String(length=256), nullable=True),
+        sa.Column('last_ms', sa.Float(), nullable=False),
+        sa.Column('plan', sa.Text(), nullable=True),
+        sa.Column('plan_source', sa.String(length=256), nullable=True),
+        sa.Column('plan_utc', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('fingerprint'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('slow_query')
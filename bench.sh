@@ -0,0 +1,14 @@
+#!/bin/bash
+# Runs the benchmark suite against the test database. Results are saved as JSON in services/pytest/.benchmarks,
+# named after the current commit, e.g. compare with a previous run: ./bench.sh --benchmark-compare=0001
+# Dataset sizes (number of libraries): BENCHMARK_SIZES=1000,10000,100000 ./bench.sh
+
+COMMIT=$(git rev-parse --short HEAD)
+mkdir -p services/pytest/.benchmarks
+
+docker compose -f compose.test.yaml -p opengsync-benchmark --profile benchmark run --build --rm opengsync-benchmark \
+    pytest benchmarks/ --benchmark-storage=/app/.benchmarks --benchmark-save="$COMMIT" --benchmark-columns=min,mean,median,rounds "$@"
+STATUS=$?
+docker compose -f compose.test.yaml -p opengsync-benchmark --profile benchmark down --volumes
+
+exit $STATUS
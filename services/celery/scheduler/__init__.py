@@ -12,12 +12,18 @@ REDIS_PORT = int(os.environ["REDIS_PORT"])
 
 celery = Celery("scheduler", broker=f"redis://redis-cache:{REDIS_PORT}/4",)
 
+from scheduler import metrics  # noqa: E402
+if (metrics_port := config["scheduler"].get("metrics_port")) is not None:
+    metrics.serve(int(metrics_port), config["scheduler"].get("metrics_addr", "127.0.0.1"))
+
 from scheduler import tasks  # noqa: E402, F401
 celery.autodiscover_tasks()
 
 run_folder = Path(config["illumina_run_folder"])
 upload_folder = Path(config["uploads_folder"])
 upload_folder_file_age_days = config["scheduler"]["upload_folder_file_age_days"]
+media_folder = Path(config["media_folder"])
+media_blob_grace_period_hours = config["scheduler"]["media_blob_grace_period_hours"]
 
 
 def parse_schedule(schedule_value):
@@ -54,11 +60,21 @@ beat_schedule = {
         "schedule": parse_schedule(config["scheduler"]["status_update_interval_min"] * 60),
         "args": (),
     },
+    "experiment_overviews": {
+        "task": "scheduler.tasks.update_experiment_overviews_wrapper",
+        "schedule": parse_schedule(config["scheduler"]["experiment_overview_interval_min"] * 60),
+        "args": (),
+    },
     "clean_upload_folder": {
         "task": "scheduler.tasks.clean_upload_folder_wrapper",
         "schedule": parse_schedule(config["scheduler"]["upload_folder_clean_schedule"]),
         "args": (upload_folder.as_posix(), upload_folder_file_age_days,),
     },
+    "clean_media_blobs": {
+        "task": "scheduler.tasks.clean_media_blobs_wrapper",
+        "schedule": parse_schedule(config["scheduler"]["media_blob_clean_schedule"]),
+        "args": (media_folder.as_posix(), media_blob_grace_period_hours,),
+    },
 }
 
 celery.conf.beat_schedule = beat_schedule
\ No newline at end of file
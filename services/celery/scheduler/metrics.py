@@ -0,0 +1,77 @@
+import os
+import time
+import shutil
+
+# must be set before prometheus_client is imported, the prefork pool children write their samples to this directory
+multiproc_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/scheduler-metrics")
+
+import sqlalchemy as sa  # noqa: E402
+from celery.signals import task_prerun, task_postrun, worker_init, worker_ready, worker_process_shutdown  # noqa: E402
+from prometheus_client import CollectorRegistry, Counter, Histogram, multiprocess, start_http_server  # noqa: E402
+
+task_duration = Histogram(
+    "opengsync_celery_task_duration_seconds", "Celery task run time",
+    ["task", "state"], buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+)
+
+task_db_checkouts = Counter(
+    "opengsync_celery_task_db_checkouts_total", "DB connections checked out from the worker's pool per task",
+    ["task"]
+)
+task_db_checkout_duration = Histogram(
+    "opengsync_celery_task_db_checkout_seconds", "Time a task held a DB connection, per checkout",
+    ["task"], buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0, 600.0)
+)
+
+__started: dict[str, float] = {}
+__current_task: str | None = None
+
+
+@task_prerun.connect
+def on_task_prerun(task_id: str, task, **kwargs):
+    global __current_task
+    __started[task_id] = time.perf_counter()
+    __current_task = task.name
+
+
+@task_postrun.connect
+def on_task_postrun(task_id: str, task, state: str | None = None, **kwargs):
+    global __current_task
+    __current_task = None
+    if (start := __started.pop(task_id, None)) is not None:
+        task_duration.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - start)
+
+
+def instrument_engine(engine: sa.Engine) -> None:
+    """Counts and times connection checkouts of `engine`, labelled with the task running in this pool process."""
+    @sa.event.listens_for(engine.pool, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        task = __current_task or "none"
+        connection_record.info["metrics_checkout"] = (task, time.perf_counter())
+        task_db_checkouts.labels(task).inc()
+
+    @sa.event.listens_for(engine.pool, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        if (checkout := connection_record.info.pop("metrics_checkout", None)) is not None:
+            task, start = checkout
+            task_db_checkout_duration.labels(task).observe(time.perf_counter() - start)
+
+
+@worker_init.connect
+def on_worker_init(**kwargs):
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    os.makedirs(multiproc_dir, exist_ok=True)
+
+
+@worker_process_shutdown.connect
+def on_worker_process_shutdown(pid: int | None = None, **kwargs):
+    multiprocess.mark_process_dead(pid or os.getpid())
+
+
+def serve(port: int, addr: str = "127.0.0.1"):
+    """Serves the metrics of all pool processes from the worker's main process."""
+    @worker_ready.connect(weak=False)
+    def on_worker_ready(**kwargs):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        start_http_server(port, addr=addr, registry=registry)
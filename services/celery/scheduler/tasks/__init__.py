@@ -2,16 +2,23 @@ import os
 import traceback
 import yaml
 from pathlib import Path
+from typing import Iterator
+from contextlib import contextmanager
 
 from loguru import logger
+from psycopg.conninfo import make_conninfo
+from celery.signals import task_prerun, task_postrun, worker_process_init, worker_process_shutdown, worker_ready, worker_shutdown
 
-from opengsync_db import DBHandler
+from opengsync_db import DBHandler, query_source, STATUS_CHANNEL, OVERVIEW_CHANNEL
 
-from scheduler import celery
+from scheduler import celery, metrics
 
 from scheduler.tasks.clean_upload_folder import clean_upload_folder
+from scheduler.tasks.clean_media_blobs import clean_media_blobs
 from scheduler.tasks.rf_scanner import process_run_folder
+from scheduler.tasks.demux_stats import process_demux_stats
 from scheduler.tasks.status_updater import update_statuses
+from scheduler.tasks.status_listener import StatusListener
 
 logger.remove()
 
@@ -31,38 +38,165 @@ def connect() -> DBHandler:
         host=os.environ["POSTGRES_HOST"],
         port=os.environ["POSTGRES_PORT"],
         db=os.environ["POSTGRES_DB"],
+        pool_pre_ping=True,
     )
+    # only needed to check the connection, tasks check out connections from the pool
+    db.close_connection()
+    metrics.instrument_engine(db._engine)
+    if (slow_query_threshold_ms := config["db"].get("slow_query_threshold_ms")) is not None:
+        db.enable_slow_query_log(
+            threshold_ms=float(slow_query_threshold_ms),
+            explain_sample_rate=float(config["db"].get("slow_query_explain_sample_rate", 0.1)),
+        )
     return db
 
 
+__db: DBHandler | None = None
+
+
+@worker_process_init.connect
+def init_db(**kwargs):
+    # one engine per pool process, created after the fork so that no connection is shared between processes
+    global __db
+    __db = connect()
+
+
+@worker_process_shutdown.connect
+def dispose_db(**kwargs):
+    global __db
+    if __db is not None:
+        __db._engine.dispose()
+        __db = None
+
+
+def get_db() -> DBHandler:
+    """DBHandler of this worker process, created on first use when the pool does not fork (e.g. `--pool solo`)."""
+    global __db
+    if __db is None:
+        __db = connect()
+    return __db
+
+
+@contextmanager
+def task_session() -> Iterator[DBHandler]:
+    """Session for one task, committed when the block succeeds, rolled back otherwise and always closed."""
+    db = get_db()
+    db.open_session()
+    rollback = True
+    try:
+        yield db
+        rollback = False
+    finally:
+        db.close_session(rollback=rollback)
+
+
+__query_sources = {}
+
+
+@task_prerun.connect
+def set_query_source(task_id: str, task, **kwargs):
+    __query_sources[task_id] = query_source(task.name)
+    __query_sources[task_id].__enter__()
+
+
+@task_postrun.connect
+def reset_query_source(task_id: str, **kwargs):
+    if (source := __query_sources.pop(task_id, None)) is not None:
+        source.__exit__(None, None, None)
+
+
 @celery.task
 def process_run_folder_wrapper(run_folder: str):
-    db = connect()
-    rollback = False
     logger.info("Starting run folder processing task...")
     try:
-        db.open_session()
-        process_run_folder(Path(run_folder), db)
+        with task_session() as db:
+            demux_pending = process_run_folder(Path(run_folder), db)
     except Exception as e:
         logger.error(f"\n-------- Exception [ process_run_folder ] --------\n\tError: {e.__repr__()}\n\tMessage: {e}\n\tTraceback: {traceback.format_exc()}\n-------- END ERROR --------")
-        rollback = True
-    finally:
-        db.close_session(rollback=rollback)
+        return
+
+    for demux_folder, experiment_name in demux_pending:
+        process_demux_stats_wrapper.delay(demux_folder.as_posix(), experiment_name)
+
+
+@celery.task
+def process_demux_stats_wrapper(run_folder: str, experiment_name: str):
+    logger.info(f"Starting demultiplexing statistics task for {experiment_name}...")
+    try:
+        with task_session() as db:
+            process_demux_stats(Path(run_folder), experiment_name, db)
+    except Exception as e:
+        logger.error(f"\n-------- Exception [ process_demux_stats ] --------\n\tError: {e.__repr__()}\n\tMessage: {e}\n\tTraceback: {traceback.format_exc()}\n-------- END ERROR --------")
 
 
 @celery.task
 def update_statuses_wrapper():
-    db = connect()
-    rollback = False
     logger.info("Starting status update task...")
     try:
-        db.open_session()
-        update_statuses(db)
+        with task_session() as db:
+            update_statuses(db)
     except Exception as e:
         logger.error(f"\n-------- Exception [ update_statuses ] --------\n\tError: {e.__repr__()}\n\tMessage: {e}\n\tTraceback: {traceback.format_exc()}\n-------- END ERROR --------")
-        rollback = True
-    finally:
-        db.close_session(rollback=rollback)
+
+
+@celery.task
+def propagate_statuses_wrapper(changed: dict[str, list[int]]):
+    logger.info("Starting status propagation task...")
+    try:
+        with task_session() as db:
+            update_statuses(db, changed={table: set(ids) for table, ids in changed.items()})
+    except Exception as e:
+        logger.error(f"\n-------- Exception [ propagate_statuses ] --------\n\tError: {e.__repr__()}\n\tMessage: {e}\n\tTraceback: {traceback.format_exc()}\n-------- END ERROR --------")
+
+
+@celery.task
+def update_experiment_overviews_wrapper(experiment_ids: list[int] | None = None):
+    logger.info("Starting experiment overview update task...")
+    try:
+        with task_session() as db:
+            updated = db.experiments.update_overviews(experiment_ids)
+            logger.info(f"Updated {len(updated)} experiment overviews")
+    except Exception as e:
+        logger.error(f"\n-------- Exception [ update_experiment_overviews ] --------\n\tError: {e.__repr__()}\n\tMessage: {e}\n\tTraceback: {traceback.format_exc()}\n-------- END ERROR --------")
+
+
+def on_changes(changed: dict[str, list[int]]) -> None:
+    if (experiment_ids := changed.pop("experiment_overview", None)) is not None:
+        update_experiment_overviews_wrapper.delay(experiment_ids)
+    if changed:
+        propagate_statuses_wrapper.delay(changed)
+
+
+def on_reconnect() -> None:
+    update_statuses_wrapper.delay()
+    update_experiment_overviews_wrapper.delay()
+
+
+__status_listener: StatusListener | None = None
+
+
+@worker_ready.connect
+def start_status_listener(**kwargs):
+    # runs in the main worker process, changes are handed to the pool as tasks
+    global __status_listener
+    if not config["scheduler"].get("status_listener", True):
+        return
+    __status_listener = StatusListener(
+        conninfo=make_conninfo(
+            host=os.environ["POSTGRES_HOST"], port=os.environ["POSTGRES_PORT"], dbname=os.environ["POSTGRES_DB"],
+            user=os.environ["POSTGRES_USER"], password=os.environ["POSTGRES_PASSWORD"],
+        ),
+        on_changes=on_changes,
+        on_reconnect=on_reconnect,
+        channels=(STATUS_CHANNEL, OVERVIEW_CHANNEL),
+    )
+    __status_listener.start()
+
+
+@worker_shutdown.connect
+def stop_status_listener(**kwargs):
+    if __status_listener is not None:
+        __status_listener.stop()
 
 
 @celery.task
@@ -72,3 +206,13 @@ def clean_upload_folder_wrapper(upload_folder: str, upload_folder_file_age_days:
         clean_upload_folder(directory=Path(upload_folder), days_old=upload_folder_file_age_days)
     except Exception as e:
         logger.error(f"\n-------- Exception [ clean_upload_folder ] --------\n\tError: {e.__repr__()}\n\tMessage: {e}\n\tTraceback: {traceback.format_exc()}\n-------- END ERROR --------")
+
+
+@celery.task
+def clean_media_blobs_wrapper(media_folder: str, grace_period_hours: int):
+    logger.info("Starting media blob cleanup task...")
+    try:
+        with task_session() as db:
+            clean_media_blobs(db, media_folder=Path(media_folder), grace_period_hours=grace_period_hours)
+    except Exception as e:
+        logger.error(f"\n-------- Exception [ clean_media_blobs ] --------\n\tError: {e.__repr__()}\n\tMessage: {e}\n\tTraceback: {traceback.format_exc()}\n-------- END ERROR --------")
@@ -0,0 +1,47 @@
+import os
+import time
+from pathlib import Path
+from datetime import timedelta
+
+from opengsync_db import DBHandler, models
+
+from . import logger
+
+
+def clean_media_blobs(db: DBHandler, media_folder: Path, grace_period_hours: int):
+    """Removes blobs that are no longer referenced by any MediaFile for longer than the grace period."""
+    grace_period = timedelta(hours=grace_period_hours)
+    logs = [f"Cleaning up media blobs unreferenced for more than {grace_period_hours} hours.."]
+
+    # rows are locked (skip locked), so a concurrent upload of the same content either waits for us or is skipped
+    for blob in db.media_files.get_orphaned_blobs(grace_period=grace_period):
+        path = media_folder / blob.path
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error deleting {path}: {e}")
+            continue
+        db.media_files.delete_blob(blob.id, flush=False)
+        logs.append(f"Deleted blob: {path}")
+
+    db.flush()
+
+    # files without a row, e.g. written by an upload whose transaction was rolled back
+    cutoff = time.time() - grace_period.total_seconds()
+    for root, _, files in os.walk(media_folder / models.MediaBlob.BLOB_DIR):
+        for name in files:
+            filepath = os.path.join(root, name)
+            if os.path.getmtime(filepath) >= cutoff:
+                continue
+            sha256, extension = name[:64], name[64:]
+            if db.media_files.get_blob(sha256=sha256, extension=extension) is not None:
+                continue
+            try:
+                os.remove(filepath)
+                logs.append(f"Deleted stray blob: {filepath}")
+            except Exception as e:
+                logger.error(f"Error deleting {filepath}: {e}")
+
+    logger.info("\n".join(logs))
@@ -0,0 +1,113 @@
+import os
+import glob
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from opengsync_db.core import DBHandler
+
+from . import logger
+
+# BCL Convert output of the instrument (NovaSeq X) or of a manual run into <run_folder>/Reports
+DEMUX_STATS_PATTERNS = [
+    os.path.join("Analysis", "*", "Data", "Demux", "Demultiplex_Stats.csv"),
+    os.path.join("Analysis", "*", "Data", "Reports", "Demultiplex_Stats.csv"),
+    os.path.join("Reports", "Demultiplex_Stats.csv"),
+]
+
+UNDETERMINED = "Undetermined"
+
+
+def find_demux_stats(run_folder: Path) -> Path | None:
+    """Latest `Demultiplex_Stats.csv` in the run folder, `None` if the run is not demultiplexed."""
+    paths = [Path(path) for pattern in DEMUX_STATS_PATTERNS for path in glob.glob(os.path.join(run_folder, pattern))]
+    if len(paths) == 0:
+        return None
+    return max(paths, key=lambda path: path.stat().st_mtime)
+
+
+def demux_modified(demux_stats: Path) -> datetime:
+    return datetime.fromtimestamp(demux_stats.stat().st_mtime)
+
+
+def parse_demux_stats(demux_stats: Path, chunk_size: int = 50_000) -> pd.DataFrame:
+    """Reads per lane and sample from `Demultiplex_Stats.csv` and the PF mean quality / Q30 per read from
+    `Quality_Metrics.csv` next to it. Returns one row per `lane` and `sample_id` with `num_lane_reads`, `num_library_reads`,
+    `mean_quality_pf_<read>` and `q30_perc_<read>` columns, the `Undetermined` row included."""
+    reads = pd.concat(pd.read_csv(
+        demux_stats, usecols=["Lane", "SampleID", "# Reads"],
+        dtype={"Lane": "int64", "SampleID": "string", "# Reads": "int64"}, chunksize=chunk_size,
+    ), ignore_index=True).rename(columns={"Lane": "lane", "SampleID": "sample_id", "# Reads": "num_library_reads"})
+
+    # a sample can be listed once per index combination
+    df = reads.groupby(["lane", "sample_id"], as_index=False)["num_library_reads"].sum()
+    df["num_lane_reads"] = df.groupby("lane")["num_library_reads"].transform("sum")
+
+    if not (quality_metrics := demux_stats.parent / "Quality_Metrics.csv").exists():
+        logger.warning(f"{quality_metrics} not found, only read counts are loaded.")
+        return df
+
+    quality = pd.concat(pd.read_csv(
+        quality_metrics, usecols=["Lane", "SampleID", "ReadNumber", "Yield", "YieldQ30", "QualityScoreSum"],
+        dtype={"Lane": "int64", "SampleID": "string", "ReadNumber": "string"}, chunksize=chunk_size,
+    ), ignore_index=True).rename(columns={"Lane": "lane", "SampleID": "sample_id"})
+
+    # ReadNumber is 1/2 for reads and I1/I2 for index reads (--output-index-metrics)
+    quality["read"] = quality["ReadNumber"].str.lower().map(lambda read: read if read.startswith("i") else f"r{read}")
+    quality = quality.groupby(["lane", "sample_id", "read"], as_index=False)[["Yield", "YieldQ30", "QualityScoreSum"]].sum()
+    quality["mean_quality_pf"] = quality["QualityScoreSum"] / quality["Yield"].where(quality["Yield"] > 0)
+    quality["q30_perc"] = quality["YieldQ30"] / quality["Yield"].where(quality["Yield"] > 0) * 100.0
+
+    quality = quality.pivot(index=["lane", "sample_id"], columns="read", values=["mean_quality_pf", "q30_perc"])
+    quality.columns = [f"{metric}_{read}" for metric, read in quality.columns]
+
+    return df.merge(quality.reset_index(), on=["lane", "sample_id"], how="left")
+
+
+def map_library_ids(df: pd.DataFrame, libraries: pd.DataFrame) -> pd.DataFrame:
+    """Adds `library_id` by matching `sample_id` to the library name (or id) of the experiment.
+    `Undetermined` is kept without library, samples that are not in the experiment are dropped.
+    Names shared by several libraries of the experiment are ambiguous and only matched by id."""
+    libraries = libraries.drop_duplicates("library_id")
+    if (ambiguous := libraries["library_name"].duplicated(keep=False)).any():
+        logger.warning(f"Library names not unique in experiment: {', '.join(libraries.loc[ambiguous, 'library_name'].unique())}")
+    library_ids = libraries[~ambiguous].set_index("library_name")["library_id"]
+    df["library_id"] = df["sample_id"].map(library_ids).astype("Int64")
+
+    # sample sheets can also use the library id as Sample_ID
+    by_id = df["library_id"].isna() & df["sample_id"].str.fullmatch(r"\d+").fillna(False)
+    df.loc[by_id, "library_id"] = pd.to_numeric(df.loc[by_id, "sample_id"]).where(lambda ids: ids.isin(libraries["library_id"])).astype("Int64")
+
+    undetermined = df["sample_id"] == UNDETERMINED
+    if len(unknown := df.loc[df["library_id"].isna() & ~undetermined, "sample_id"].unique()) > 0:
+        logger.warning(f"Samples not found in experiment: {', '.join(unknown)}")
+
+    return df[df["library_id"].notna() | undetermined]
+
+
+def mark_demultiplexed(db: DBHandler, experiment_name: str, demux_stats: Path) -> None:
+    """rf_scanner queues the run folder again until its statistics are newer than the `demultiplexed` timestamp."""
+    if (seq_run := db.seq_runs.get(experiment_name)) is not None:
+        seq_run.set_timestamp("demultiplexed", demux_modified(demux_stats))
+        db.seq_runs.update(seq_run)
+
+
+def process_demux_stats(run_folder: Path, experiment_name: str, db: DBHandler) -> int:
+    if (demux_stats := find_demux_stats(run_folder)) is None:
+        logger.warning(f"{run_folder}: No demultiplexing statistics found.")
+        return 0
+
+    if (experiment := db.experiments.get(experiment_name)) is None:
+        logger.warning(f"{run_folder}: Experiment '{experiment_name}' not found, skipping its demultiplexing statistics.")
+        mark_demultiplexed(db, experiment_name, demux_stats)
+        return 0
+
+    df = parse_demux_stats(demux_stats)
+    df = map_library_ids(df, db.pd.get_experiment_libraries(experiment.id))
+
+    n = db.libraries.set_seq_qualities(experiment.id, df)
+    mark_demultiplexed(db, experiment_name, demux_stats)
+
+    logger.info(f"{experiment_name}: Loaded {n} read qualities from {demux_stats}.")
+    return n
@@ -14,6 +14,7 @@ from opengsync_db.core import DBHandler
 from opengsync_db import units
 
 from . import logger
+from .demux_stats import find_demux_stats, demux_modified
 
 
 def get_dom_value(dom, tag_name: str) -> str | None:
@@ -97,9 +98,8 @@ class UnitParse:
     rename: str | None = None
 
 
-def parse_quantitities(run_folder: Path, quantities: list[UnitParse]) -> dict[str, units.Quantity]:
-    metrics = interop.read(run_folder.as_posix())
-    df = pd.DataFrame(interop.summary(metrics))
+def summary_table(metrics, level: str) -> pd.DataFrame:
+    df = pd.DataFrame(interop.summary(metrics, level=level))
     df.columns = [(
         str(col)
         .replace(" >", ">")
@@ -110,35 +110,57 @@ def parse_quantitities(run_folder: Path, quantities: list[UnitParse]) -> dict[st
         .replace("%", "pct")
         .lower()
     ) for col in df.columns]
+    return df
 
-    res = {}
 
-    if len(df) > 1:
-        logger.warning(f"{run_folder}: Expected 1 row in metrics DataFrame, found {len(df)}. Using the first row.")
-    elif len(df) == 0:
-        logger.error(f"{run_folder}: Metrics DataFrame is empty. Cannot parse quantities.")
-        return {}
+def parse_quantitities(run_folder: Path, quantities: list[UnitParse]) -> pd.DataFrame:
+    """Returns the InterOp summary as long table with columns `metric`, `lane`, `read`, `value` (in base unit) and `unit`.
+    Run totals have `lane` = `read` = 0, per-read rows `lane` = 0 and per-lane rows both set."""
+    columns = ["metric", "lane", "read", "value", "unit"]
+    metrics = interop.read(run_folder.as_posix())
 
-    variables = df.iloc[0].to_dict()
+    tables = []
+    for level in ("Total", "Read", "Lane"):
+        try:
+            df = summary_table(metrics, level)
+        except Exception as e:
+            logger.warning(f"{run_folder}: Could not read '{level}' summary: {e}")
+            continue
 
-    def parse_quantity(name: str, unit: units.Unit, new_name: str):
-        if name in variables.keys():
-            res[new_name] = variables.pop(name) * unit
+        if level == "Total":
+            if len(df) > 1:
+                logger.warning(f"{run_folder}: Expected 1 row in metrics DataFrame, found {len(df)}. Using the first row.")
+            df = df.iloc[:1]
+        
+        df = df.rename(columns={"readnumber": "read"})
+        if "lane" not in df.columns:
+            df["lane"] = 0
+        if "read" not in df.columns:
+            df["read"] = 0
+        df = df.drop(columns=[col for col in ("isindex", "surface") if col in df.columns])
+        tables.append(df.melt(id_vars=["lane", "read"], var_name="metric", value_name="value"))
+
+    if len(tables) == 0 or (df := pd.concat(tables, ignore_index=True)).empty:
+        logger.error(f"{run_folder}: Metrics DataFrame is empty. Cannot parse quantities.")
+        return pd.DataFrame(columns=columns)
 
-    for conv in quantities:
-        parse_quantity(
-            name=conv.label,
-            unit=conv.unit,
-            new_name=conv.rename or conv.label
-        )
+    df["value"] = pd.to_numeric(df["value"], errors="coerce")
+    df = df.dropna(subset=["value"])
+    df[["lane", "read"]] = df[["lane", "read"]].astype(int)
 
-    for name, value in variables.items():
-        res[name] = value * units.count
+    # vectorized conversion to base unit, metrics without explicit unit are counts
+    conversions = {conv.label: conv for conv in quantities}
+    metric_units = {metric: conversions[metric].unit if metric in conversions else units.count for metric in df["metric"].unique()}
+    for metric, unit in metric_units.items():
+        mask = (df["metric"] == metric).to_numpy()
+        df.loc[mask, "value"] = units.QuantityArray(df.loc[mask, "value"].to_numpy(), unit).to_base().values
+    df["unit"] = df["metric"].map(lambda metric: metric_units[metric].base_unit.name)
+    df["metric"] = df["metric"].map(lambda metric: conversions[metric].rename or metric if metric in conversions else metric)
 
-    return res
+    return df[columns].drop_duplicates(["metric", "lane", "read"], keep="last").reset_index(drop=True)
 
 
-def parse_metrics(run_folder: Path) -> dict[str, units.Quantity]:
+def parse_metrics(run_folder: Path) -> pd.DataFrame:
     quantities = parse_quantitities(
         run_folder,
         [
@@ -156,7 +178,9 @@ def parse_metrics(run_folder: Path) -> dict[str, units.Quantity]:
     return quantities
 
 
-def process_run_folder(illumina_run_folder: Path, db: DBHandler):
+def process_run_folder(illumina_run_folder: Path, db: DBHandler) -> list[tuple[Path, str]]:
+    """Syncs the runs in the run folder and returns `(run_folder, experiment_name)` of finished runs
+    with new demultiplexing output."""
     logger.info(f"Processing run folder: {illumina_run_folder}")
     
     active_runs, _ = db.seq_runs.find(
@@ -247,10 +271,8 @@ def process_run_folder(illumina_run_folder: Path, db: DBHandler):
             run.i1_cycles = parsed_data["i1_cycles"]
             run.i2_cycles = parsed_data["i2_cycles"]
 
-            for key, value in metrics.items():
-                run.set_quantity(key, value)
-
             db.seq_runs.update(run)
+            db.seq_runs.set_metrics(run.id, metrics)
             active_runs[experiment_name] = run
             logger.info("Updated!")
         else:
@@ -274,8 +296,8 @@ def process_run_folder(illumina_run_folder: Path, db: DBHandler):
                 r2_cycles=parsed_data.get("r2_cycles"),
                 i1_cycles=parsed_data.get("i1_cycles"),
                 i2_cycles=parsed_data.get("i2_cycles"),
-                quantities=metrics,
             )
+            db.seq_runs.set_metrics(run.id, metrics)
             if completed is not None:
                 run.set_timestamp("completed", completed)
             if started is not None and isinstance(started, datetime):
@@ -296,3 +318,15 @@ def process_run_folder(illumina_run_folder: Path, db: DBHandler):
 
             active_runs[experiment_name] = run
             logger.info("Added!")
+
+    demux_pending = []
+    for run in active_runs.values():
+        if run.status != RunStatus.FINISHED:
+            continue
+        run_folder = illumina_run_folder / run.run_folder
+        if (demux_stats := find_demux_stats(run_folder)) is None:
+            continue
+        if (demultiplexed := run.get_timestamp("demultiplexed")) is None or demux_modified(demux_stats) > demultiplexed:
+            demux_pending.append((run_folder, run.experiment_name))
+            
+    return demux_pending
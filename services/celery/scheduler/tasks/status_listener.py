@@ -0,0 +1,69 @@
+import time
+import threading
+from typing import Callable
+
+import psycopg
+
+from opengsync_db import STATUS_CHANNEL, parse_status_notification
+
+from . import logger
+
+
+class StatusListener(threading.Thread):
+    """LISTENs on `channels` (default `STATUS_CHANNEL`) and hands the changed ids per table to `on_changes`, merged per
+    `debounce_seconds`, so that a burst of updates (e.g. a whole experiment finishing) results in one task.
+    Notifications sent while the listener is disconnected are lost, `on_reconnect` is called to catch up."""
+
+    RECONNECT_SECONDS = (1, 5, 30, 60)
+
+    def __init__(
+        self, conninfo: str,
+        on_changes: Callable[[dict[str, list[int]]], None],
+        on_reconnect: Callable[[], None],
+        debounce_seconds: float = 2.0,
+        channels: tuple[str, ...] = (STATUS_CHANNEL,),
+    ):
+        super().__init__(name="status-listener", daemon=True)
+        self.conninfo = conninfo
+        self.on_changes = on_changes
+        self.on_reconnect = on_reconnect
+        self.debounce_seconds = debounce_seconds
+        self.channels = channels
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        failures = 0
+        while not self._stop_event.is_set():
+            try:
+                with psycopg.connect(self.conninfo, autocommit=True) as conn:
+                    for channel in self.channels:
+                        conn.execute(f"LISTEN {channel}")
+                    logger.info(f"Listening for changes on {', '.join(self.channels)}")
+                    if failures > 0:
+                        self.on_reconnect()
+                    failures = 0
+                    self._listen(conn)
+            except Exception as e:
+                delay = StatusListener.RECONNECT_SECONDS[min(failures, len(StatusListener.RECONNECT_SECONDS) - 1)]
+                failures += 1
+                logger.warning(f"Status listener disconnected, reconnecting in {delay}s: {e}")
+                self._stop_event.wait(delay)
+
+    def _listen(self, conn: psycopg.Connection) -> None:
+        pending: dict[str, set[int]] = {}
+        deadline: float | None = None
+        while not self._stop_event.is_set():
+            timeout = self.debounce_seconds if deadline is None else max(deadline - time.monotonic(), 0.01)
+            for notify in conn.notifies(timeout=timeout):
+                table, ids = parse_status_notification(notify.payload)
+                pending.setdefault(table, set()).update(ids)
+                if deadline is None:
+                    deadline = time.monotonic() + self.debounce_seconds
+
+            if deadline is not None and time.monotonic() >= deadline:
+                self.on_changes({table: sorted(ids) for table, ids in pending.items()})
+                pending = {}
+                deadline = None
@@ -1,4 +1,7 @@
+from typing import Callable
+
 import sqlalchemy as sa
+from sqlalchemy.orm import Query
 
 from opengsync_db.core import DBHandler
 from opengsync_db import categories, models
@@ -85,98 +88,128 @@ def __find_finished_seq_requests(q):
     )
 
 
-def update_statuses(db: DBHandler):
-    logs = ["Checking statuses.."]
-
-    for run in db.seq_runs.find(
-        status=categories.RunStatus.RUNNING, limit=None
-    )[0]:
-        if run.experiment is not None:
-            run.experiment.status = categories.ExperimentStatus.SEQUENCING
-            logs.append(f"Updating experiment {run.experiment.id} status to {run.experiment.status}")
-            db.seq_runs.update(run)
-
-    db.flush()
-
-    for experiment in db.experiments.find(
-        limit=None, custom_query=__find_finished_experiments,
-        status_in=[
-            categories.ExperimentStatus.DRAFT,
-            categories.ExperimentStatus.LOADED,
-            categories.ExperimentStatus.SEQUENCING,
-        ],
-    )[0]:
-        if experiment.seq_run is None:
-            experiment.status = categories.ExperimentStatus.FINISHED
-        else:
-            if experiment.seq_run.status == categories.RunStatus.FINISHED:
+def update_statuses(db: DBHandler, changed: dict[str, set[int]] | None = None):
+    """Propagates statuses from runs to experiments, libraries, samples, pools, requests and projects.
+    `changed` maps table names to ids whose status changed (see `opengsync_db.STATUS_CHANNEL`), only the entities
+    depending on them are checked. Without `changed` everything is checked, this is the periodic safety sweep."""
+    logs = ["Checking statuses.." if changed is None else f"Checking statuses depending on {', '.join(f'{len(ids)} {table}' for table, ids in changed.items())}.."]
+
+    def scope(table: str, condition: Callable[[list[int]], sa.ColumnElement[bool]]) -> Callable[[Query], Query] | None:
+        """Restricts a step to the rows depending on changed `table` rows, `None` if none of them changed."""
+        if changed is None:
+            return lambda q: q
+        if not (ids := changed.get(table)):
+            return None
+        return lambda q: q.where(condition(list(ids)))
+
+    if (scoped := scope("seq_run", lambda ids: models.SeqRun.id.in_(ids))) is not None:
+        for run in db.seq_runs.find(
+            status=categories.RunStatus.RUNNING, limit=None, custom_query=scoped
+        )[0]:
+            if run.experiment is not None:
+                run.experiment.status = categories.ExperimentStatus.SEQUENCING
+                logs.append(f"Updating experiment {run.experiment.id} status to {run.experiment.status}")
+                db.seq_runs.update(run)
+
+        db.flush()
+
+        for experiment in db.experiments.find(
+            limit=None, custom_query=lambda q: scoped(__find_finished_experiments(q)),
+            status_in=[
+                categories.ExperimentStatus.DRAFT,
+                categories.ExperimentStatus.LOADED,
+                categories.ExperimentStatus.SEQUENCING,
+            ],
+        )[0]:
+            if experiment.seq_run is None:
                 experiment.status = categories.ExperimentStatus.FINISHED
-            elif experiment.seq_run.status == categories.RunStatus.ARCHIVED:
-                experiment.status = categories.ExperimentStatus.ARCHIVED
             else:
-                continue
-            logs.append(f"Updating experiment {experiment.id} status to {experiment.status}")
-            db.experiments.update(experiment)
-
-    db.flush()
-
-    for library in db.libraries.find(
-        status_in=[
-            categories.LibraryStatus.POOLED, categories.LibraryStatus.STORED, categories.LibraryStatus.PREPARING,
-            categories.LibraryStatus.ACCEPTED, categories.LibraryStatus.SUBMITTED, categories.LibraryStatus.DRAFT,
-        ], custom_query=__find_finished_libraries, limit=None
-    )[0]:
-        if library.experiment is not None:
-            library.status = categories.LibraryStatus.SEQUENCED
-            logs.append(f"Updating library {library.id} status to {library.status}")
-            db.libraries.update(library)
-    
-    db.flush()
-
-    for sample in db.samples.find(
-        status=categories.SampleStatus.WAITING_DELIVERY, limit=None,
-        custom_query=__find_stored_samples,
-    )[0]:
-        sample.status = categories.SampleStatus.STORED
-        logs.append(f"Updating sample {sample.id} status to {sample.status}")
-        db.samples.update(sample)
-
-    db.flush()
-
-    for pool in db.pools.find(
-        status_in=[categories.PoolStatus.ACCEPTED, categories.PoolStatus.STORED],
-        custom_query=__find_sequenced_pools, limit=None
-    )[0]:
-        pool.status = categories.PoolStatus.SEQUENCED
-        logs.append(f"Updating pool {pool.id} status to {pool.status}")
-        db.pools.update(pool)
-
-    db.flush()
-
-    for seq_request in db.seq_requests.find(
-        status_in=[categories.SeqRequestStatus.ACCEPTED, categories.SeqRequestStatus.SAMPLES_RECEIVED, categories.SeqRequestStatus.PREPARED],
-        custom_query=__find_sequenced_seq_requests, limit=None
-    )[0]:
-        seq_request.status = categories.SeqRequestStatus.DATA_PROCESSING
-        logs.append(f"Updating seq_request {seq_request.id} status to {seq_request.status}")
-        db.seq_requests.update(seq_request)
-
-    db.flush()
-
-    for project in db.projects.find(
-        status=categories.ProjectStatus.PROCESSING, custom_query=__find_sequenced_projects, limit=None
-    )[0]:
-        project.status = categories.ProjectStatus.SEQUENCED
-        db.projects.update(project)
-        logs.append(f"Updating project {project.id} status to {project.status}")
-
-    db.flush()
-
-    for seq_request in db.seq_requests.find(
-        status=categories.SeqRequestStatus.DATA_PROCESSING, custom_query=__find_finished_seq_requests, limit=None
-    )[0]:
-        seq_request.status = categories.SeqRequestStatus.FINISHED
-        db.seq_requests.update(seq_request)
-        logs.append(f"Updating seq_request {seq_request.id} status to {seq_request.status}")
-
-    logger.info("\n".join(logs))
\ No newline at end of file
+                if experiment.seq_run.status == categories.RunStatus.FINISHED:
+                    experiment.status = categories.ExperimentStatus.FINISHED
+                elif experiment.seq_run.status == categories.RunStatus.ARCHIVED:
+                    experiment.status = categories.ExperimentStatus.ARCHIVED
+                else:
+                    continue
+                logs.append(f"Updating experiment {experiment.id} status to {experiment.status}")
+                db.experiments.update(experiment)
+
+        db.flush()
+
+    if (scoped := scope("experiment", lambda ids: models.Library.experiment_id.in_(ids))) is not None:
+        for library in db.libraries.find(
+            status_in=[
+                categories.LibraryStatus.POOLED, categories.LibraryStatus.STORED, categories.LibraryStatus.PREPARING,
+                categories.LibraryStatus.ACCEPTED, categories.LibraryStatus.SUBMITTED, categories.LibraryStatus.DRAFT,
+            ], custom_query=lambda q: scoped(__find_finished_libraries(q)), limit=None
+        )[0]:
+            if library.experiment is not None:
+                library.status = categories.LibraryStatus.SEQUENCED
+                logs.append(f"Updating library {library.id} status to {library.status}")
+                db.libraries.update(library)
+        
+        db.flush()
+
+    if (scoped := scope("library", lambda ids: sa.exists().where(
+        (models.links.SampleLibraryLink.sample_id == models.Sample.id) &
+        (models.links.SampleLibraryLink.library_id.in_(ids))
+    ))) is not None:
+        for sample in db.samples.find(
+            status=categories.SampleStatus.WAITING_DELIVERY, limit=None,
+            custom_query=lambda q: scoped(__find_stored_samples(q)),
+        )[0]:
+            sample.status = categories.SampleStatus.STORED
+            logs.append(f"Updating sample {sample.id} status to {sample.status}")
+            db.samples.update(sample)
+
+        db.flush()
+
+    if (scoped := scope("experiment", lambda ids: models.Pool.experiment_id.in_(ids))) is not None:
+        for pool in db.pools.find(
+            status_in=[categories.PoolStatus.ACCEPTED, categories.PoolStatus.STORED],
+            custom_query=lambda q: scoped(__find_sequenced_pools(q)), limit=None
+        )[0]:
+            pool.status = categories.PoolStatus.SEQUENCED
+            logs.append(f"Updating pool {pool.id} status to {pool.status}")
+            db.pools.update(pool)
+
+        db.flush()
+
+    if (scoped := scope("library", lambda ids: models.Library.id.in_(ids))) is not None:
+        for seq_request in db.seq_requests.find(
+            status_in=[categories.SeqRequestStatus.ACCEPTED, categories.SeqRequestStatus.SAMPLES_RECEIVED, categories.SeqRequestStatus.PREPARED],
+            custom_query=lambda q: scoped(__find_sequenced_seq_requests(q)), limit=None
+        )[0]:
+            seq_request.status = categories.SeqRequestStatus.DATA_PROCESSING
+            logs.append(f"Updating seq_request {seq_request.id} status to {seq_request.status}")
+            db.seq_requests.update(seq_request)
+
+        db.flush()
+
+    if (scoped := scope("library", lambda ids: sa.exists().where(
+        (models.Sample.project_id == models.Project.id) &
+        (models.links.SampleLibraryLink.sample_id == models.Sample.id) &
+        (models.links.SampleLibraryLink.library_id.in_(ids))
+    ))) is not None:
+        for project in db.projects.find(
+            status=categories.ProjectStatus.PROCESSING, custom_query=lambda q: scoped(__find_sequenced_projects(q)), limit=None
+        )[0]:
+            project.status = categories.ProjectStatus.SEQUENCED
+            db.projects.update(project)
+            logs.append(f"Updating project {project.id} status to {project.status}")
+
+        db.flush()
+
+    if (scoped := scope("project", lambda ids: sa.exists().where(
+        (models.Library.seq_request_id == models.SeqRequest.id) &
+        (models.links.SampleLibraryLink.library_id == models.Library.id) &
+        (models.Sample.id == models.links.SampleLibraryLink.sample_id) &
+        (models.Sample.project_id.in_(ids))
+    ))) is not None:
+        for seq_request in db.seq_requests.find(
+            status=categories.SeqRequestStatus.DATA_PROCESSING, custom_query=lambda q: scoped(__find_finished_seq_requests(q)), limit=None
+        )[0]:
+            seq_request.status = categories.SeqRequestStatus.FINISHED
+            db.seq_requests.update(seq_request)
+            logs.append(f"Updating seq_request {seq_request.id} status to {seq_request.status}")
+
+    logger.info("\n".join(logs))
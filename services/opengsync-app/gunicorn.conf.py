@@ -0,0 +1,17 @@
+# loaded by gunicorn from the working directory (/app)
+import os
+import shutil
+
+# must be set before prometheus_client is imported, so that all workers write their samples to this directory
+multiproc_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/opengsync-metrics")
+
+from prometheus_client import multiprocess  # noqa: E402
+
+
+def on_starting(server):
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    multiprocess.mark_process_dead(worker.pid)
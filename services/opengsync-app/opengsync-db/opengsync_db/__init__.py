@@ -59,4 +59,8 @@ def db_session(db: DBHandler):
         return wrapper
     return decorator
 
-from .core import units  # noqa
\ No newline at end of file
+from .core import units  # noqa
+from .core import pooling  # noqa
+from .core.SlowQueryLog import query_source  # noqa
+from .core.status_events import STATUS_CHANNEL, parse_status_notification  # noqa
+from .core.experiment_overview import OVERVIEW_CHANNEL  # noqa
@@ -1,24 +1,41 @@
-from typing import Callable, TypeVar, Any, TYPE_CHECKING
+from typing import Callable, TypeVar, Any, Iterable, TYPE_CHECKING
 from functools import wraps
 
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql.base import ExecutableOption
+
+from . import exceptions
+from ..categories import AccessType, AccessTypeEnum
+
 F = TypeVar('F', bound=Callable[..., Any])
+Q = TypeVar('Q')
 
 if TYPE_CHECKING:
     from .DBHandler import DBHandler
+    from ..models.Base import Base
+    from ..models import User
 
 
 class DBBlueprint:
+    model: type["Base"] | None = None
+
     def __init__(self, name: str, db: "DBHandler") -> None:
         self.name = name
         self.db = db
         self._register_transactions()
 
     def _register_transactions(self) -> None:
-        """Automatically wraps all methods marked with @transaction."""
-        for name, method in self.__class__.__dict__.items():
-            if callable(method) and hasattr(method, "_is_transaction"):
-                wrapped = self._create_wrapped_transaction(method)
-                setattr(self, name, wrapped)
+        """Automatically wraps all methods marked with @transaction, including inherited ones."""
+        registered = set()
+        for cls in self.__class__.__mro__:
+            for name, method in cls.__dict__.items():
+                if name in registered:
+                    continue
+                registered.add(name)
+                if callable(method) and hasattr(method, "_is_transaction"):
+                    wrapped = self._create_wrapped_transaction(method)
+                    setattr(self, name, wrapped)
 
     def _create_wrapped_transaction(self, func: F) -> F:
         """Creates a wrapped transaction method with session management."""
@@ -38,8 +55,101 @@ class DBBlueprint:
                 return func(self, *args, **kwargs)
         return wrapped  # type: ignore[return-value]
 
-    @classmethod
-    def transaction(cls, func: F) -> F:
+    @staticmethod
+    def transaction(func: F) -> F:
         """Decorator to mark methods as transactions."""
         func._is_transaction = True  # type: ignore
-        return func
\ No newline at end of file
+        return func
+
+    @transaction
+    def get_many(self, ids: Iterable[Any], options: ExecutableOption | None = None, missing_ok: bool = False) -> dict[Any, Any]:
+        """Fetches all elements with one `WHERE id = ANY(:ids)` query and returns them keyed by id.
+        Raises ElementDoesNotExist listing the missing ids, unless `missing_ok`."""
+        if self.model is None:
+            raise NotImplementedError(f"Blueprint '{self.name}' has no model.")
+        
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return {}
+
+        mapper = sa.inspect(self.model)
+        pk = mapper.primary_key[0]
+        key = mapper.get_property_by_column(pk).key
+        query = self.db.session.query(self.model).where(
+            pk == sa.any_(sa.bindparam("ids", ids, type_=ARRAY(pk.type)))
+        )
+        if options is not None:
+            query = query.options(options)
+
+        res = {getattr(obj, key): obj for obj in query.all()}
+
+        if not missing_ok and len(res) < len(ids):
+            missing = [_id for _id in ids if _id not in res]
+            raise exceptions.ElementDoesNotExist(f"{self.model.__name__} with ids {missing} not found.")
+        
+        return res
+
+    def _resolve_access_types(
+        self, ids: Iterable[int], user: "User",
+        owner_id: sa.ColumnElement[int], affiliated: sa.ColumnElement[bool],
+    ) -> dict[int, AccessTypeEnum]:
+        """Access of `user` to the elements with `ids`, resolved with one query selecting `owner_id == user.id` and
+        the (correlated) `affiliated` condition per element. Results are memoized in `db.access_types` until the
+        session writes or is closed, ids that do not exist resolve to `AccessType.NONE`."""
+        if self.model is None:
+            raise NotImplementedError(f"Blueprint '{self.name}' has no model.")
+
+        ids = list(dict.fromkeys(ids))
+        if user.is_admin():
+            return {_id: AccessType.ADMIN for _id in ids}
+        if user.is_insider():
+            return {_id: AccessType.INSIDER for _id in ids}
+
+        memo = self.db.access_types
+        if (unresolved := [_id for _id in ids if (self.name, user.id, _id) not in memo]):
+            pk = sa.inspect(self.model).primary_key[0]
+            rows = self.db.session.execute(
+                sa.select(pk, owner_id == user.id, affiliated)
+                .where(pk == sa.any_(sa.bindparam("ids", unresolved, type_=ARRAY(pk.type))))
+            ).all()
+            for _id in unresolved:
+                memo[(self.name, user.id, _id)] = AccessType.NONE
+            for _id, is_owner, is_affiliated in rows:
+                memo[(self.name, user.id, _id)] = AccessType.OWNER if is_owner else AccessType.EDIT if is_affiliated else AccessType.NONE
+
+        return {_id: memo[(self.name, user.id, _id)] for _id in ids}
+
+    @staticmethod
+    def word_match(word: str, column: sa.ColumnElement[str]) -> sa.ColumnElement[bool]:
+        """`word <% lower(column)`, true if `word` is similar to a word in `column` by at least
+        `pg_trgm.word_similarity_threshold` (see `DBHandler.connect`). Served by the `gin_trgm_ops` index on `lower(column)`."""
+        return sa.literal(word.lower(), sa.String).op("<%")(sa.func.lower(column))
+
+    @staticmethod
+    def word_similarity(word: str, *columns: sa.ColumnElement[str]) -> sa.ColumnElement[float]:
+        """Best `word_similarity` of `word` to any of `columns`."""
+        similarities = [sa.func.word_similarity(word.lower(), sa.func.lower(column)) for column in columns]
+        return similarities[0] if len(similarities) == 1 else sa.func.greatest(*similarities)
+
+    @staticmethod
+    def fuzzy_search(query: Q, word: str, *columns: sa.ColumnElement[str]) -> Q:
+        """Restricts `query` to rows matching `word` in any of `columns` (see `word_match`) and ranks only those
+        candidates by `word_similarity`. An empty `word` leaves `query` unfiltered."""
+        if not (word := word.strip()):
+            return query
+        return query.where(  # type: ignore[attr-defined]
+            sa.or_(*[DBBlueprint.word_match(word, column) for column in columns])
+        ).order_by(
+            sa.nulls_last(DBBlueprint.word_similarity(word, *columns).desc())
+        )
+
+    @staticmethod
+    def next_ids(model: type["Base"]) -> sa.Function:
+        """`nextval()` of the primary key sequence of `model`, allocates ids for an `INSERT ... SELECT` up front
+        so that the original -> new id mapping is known without relying on the order of `RETURNING`."""
+        return sa.func.nextval(sa.func.pg_get_serial_sequence(model.__tablename__, "id"))
+
+    @staticmethod
+    def id_mapping(rows: Iterable[tuple[int, ...]], *columns: str, name: str = "id_mapping") -> sa.Values:
+        """`VALUES` clause of id tuples, e.g. `(old_id, new_id)`, to join `INSERT ... SELECT` statements against."""
+        return sa.values(*[sa.column(column, sa.Integer) for column in columns], name=name).data(list(rows))
@@ -8,6 +8,10 @@ from sqlalchemy import orm
 
 from ..models.Base import Base
 from .. import models
+from ..categories import AccessTypeEnum
+from .SlowQueryLog import SlowQueryLog
+from .status_events import install_status_triggers
+from .experiment_overview import install_overview_triggers
 
 
 class DBHandler():
@@ -25,6 +29,8 @@ class DBHandler():
         self.expire_on_commit = expire_on_commit
         self.lab_protocol_start_number = lab_protocol_start_number
         self.__needs_commit = False
+        # (blueprint, user_id, id) -> access type, valid until the session writes or is closed
+        self.access_types: dict[tuple[str, int, int], AccessTypeEnum] = {}
         self.auto_open = auto_open
         self.auto_commit = auto_commit
 
@@ -54,6 +60,8 @@ class DBHandler():
         from .blueprints.GroupBP import GroupBP
         from .blueprints.ShareBP import ShareBP
         from .blueprints.DataPathBP import DataPathBP
+        from .blueprints.SlowQueryBP import SlowQueryBP
+        from .blueprints.SearchBP import SearchBP
         from .blueprints.PandasBP import PandasBP
 
         self.seq_requests = SeqRequestBP("seq_requests", self)
@@ -82,14 +90,24 @@ class DBHandler():
         self.groups = GroupBP("groups", self)
         self.shares = ShareBP("shares", self)
         self.data_paths = DataPathBP("data_paths", self)
+        self.slow_queries = SlowQueryBP("slow_queries", self)
+        self.search = SearchBP("search", self)
         self.pd = PandasBP("pd", self)
+        self.slow_query_log: SlowQueryLog | None = None
 
     def connect(
-        self, user: str, password: str, host: str, db: str = "opengsync_db", port: Union[str, int] = 5432
+        self, user: str, password: str, host: str, db: str = "opengsync_db", port: Union[str, int] = 5432,
+        pool_pre_ping: bool = False, word_similarity_threshold: float | None = None
     ) -> None:
+        """`pool_pre_ping` tests pooled connections before handing them out, for long-lived handlers that are idle for minutes.
+        `word_similarity_threshold` sets `pg_trgm.word_similarity_threshold` of every connection, the minimum similarity
+        of search results of the `query()` methods (server default 0.6)."""
         self._url = f"postgresql+psycopg://{user}:{password}@{host}:{port}/{db}"
         self.public_url = f"{self._url.split(':')[0]}://{host}:{port}/{db}"
-        self._engine = sa.create_engine(self._url)
+        connect_args = {}
+        if word_similarity_threshold is not None:
+            connect_args["options"] = f"-c pg_trgm.word_similarity_threshold={float(word_similarity_threshold)}"
+        self._engine = sa.create_engine(self._url, pool_pre_ping=pool_pre_ping, connect_args=connect_args)
         try:
             self._connection = self._engine.connect()
         except Exception as e:
@@ -101,6 +119,24 @@ class DBHandler():
         DBHandler.Session = orm.scoped_session(self.session_factory)
         from . import listeners  # noqa: F401
 
+    def enable_slow_query_log(
+        self, threshold_ms: float = 500.0, explain_sample_rate: float = 0.1,
+        explain_interval_seconds: float = 3600.0
+    ) -> SlowQueryLog:
+        """Records statements slower than `threshold_ms` in `slow_query` (see `SlowQueryLog`), call after `connect()`."""
+        if self.slow_query_log is not None:
+            self.slow_query_log.threshold_ms = threshold_ms
+            self.slow_query_log.explain_sample_rate = explain_sample_rate
+            self.slow_query_log.explain_interval_seconds = explain_interval_seconds
+            return self.slow_query_log
+        
+        self.slow_query_log = SlowQueryLog(
+            self, threshold_ms=threshold_ms, explain_sample_rate=explain_sample_rate,
+            explain_interval_seconds=explain_interval_seconds
+        )
+        self.slow_query_log.attach(self._engine)
+        return self.slow_query_log
+
     def info(self, *values: object) -> None:
         message = " ".join([str(value) for value in values])
         if self._logger is not None:
@@ -148,12 +184,14 @@ class DBHandler():
         if self._session is not None:
             self._session.commit()
             self.__needs_commit = False
+            self.access_types.clear()
         else:
             raise Exception("Session is not open, cannot commit changes.")
 
     def flush(self) -> None:
         if self._session is not None:
             self.__needs_commit = True
+            self.access_types.clear()
             self._session.flush()
         else:
             raise Exception("Session is not open, cannot flush changes.")
@@ -179,6 +217,12 @@ class DBHandler():
                 
                 Base.metadata.create_all(conn)
                 self.info("Successfully created all tables")
+
+                install_status_triggers(conn)
+                self.info("Created status change triggers")
+
+                install_overview_triggers(conn)
+                self.info("Created experiment overview triggers")
                 
         except Exception as e:
             self.error(f"Failed to create tables: {str(e)}")
@@ -189,6 +233,7 @@ class DBHandler():
             self.warn("Session is already open")
             return
         self._session = DBHandler.Session(autoflush=autoflush)
+        self.access_types.clear()
 
     def close_session(self, commit: bool | None = None, rollback: bool = False) -> bool:
         """ returns True if db was modified """
@@ -200,23 +245,27 @@ class DBHandler():
         if commit is None:
             commit = self.auto_commit
 
-        if commit and not rollback:
-            if self.needs_commit:
-                try:
-                    self._session.commit()
-                except Exception:
-                    self.error("Commit failed: - rolling back transaction.")
-                    self._session.rollback()
-                    raise
-                self.__needs_commit = False
-                modified = True
-        elif rollback:
-            self.info("Rolling back transaction...")
-            self._session.rollback()
-        else:
-            if not commit and self.needs_commit:
-                self.warn("Session was not committed, but changes were made. This may lead to data loss. Use 'db.commit()', if you want changes to be written to the database.")
-        self._session = DBHandler.Session.remove()
+        try:
+            if commit and not rollback:
+                if self.needs_commit:
+                    try:
+                        self._session.commit()
+                    except Exception:
+                        self.error("Commit failed: - rolling back transaction.")
+                        self._session.rollback()
+                        raise
+                    modified = True
+            elif rollback:
+                self.info("Rolling back transaction...")
+                self._session.rollback()
+            else:
+                if not commit and self.needs_commit:
+                    self.warn("Session was not committed, but changes were made. This may lead to data loss. Use 'db.commit()', if you want changes to be written to the database.")
+        finally:
+            # the handler can outlive the session (e.g. one per celery worker), never hand a failed session to the next one
+            self.__needs_commit = False
+            self._session = DBHandler.Session.remove()
+            self.access_types.clear()
         return modified
 
     def rollback(self) -> None:
@@ -225,6 +274,7 @@ class DBHandler():
             raise Exception("Session is not open, cannot rollback.")
         self.info("Rolling back transaction...")
         self._session.rollback()
+        self.access_types.clear()
 
     def close_connection(self) -> None:
         if self._connection is not None:
@@ -0,0 +1,187 @@
+import re
+import time
+import random
+import hashlib
+from typing import Any, TYPE_CHECKING
+from datetime import datetime, timezone
+from contextlib import contextmanager
+from contextvars import ContextVar
+from concurrent.futures import ThreadPoolExecutor
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert
+
+from .. import models
+
+if TYPE_CHECKING:
+    from .DBHandler import DBHandler
+
+_source: ContextVar[str | None] = ContextVar("slow_query_source", default=None)
+_recording: ContextVar[bool] = ContextVar("slow_query_recording", default=False)
+
+
+@contextmanager
+def query_source(source: str | None):
+    """Attributes statements executed in this context to `source` (route or task name)."""
+    token = _source.set(source)
+    try:
+        yield
+    finally:
+        _source.reset(token)
+
+
+__placeholder = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+__literal = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+__placeholder_list = re.compile(r"\?(?:\s*,\s*\?)+")
+__whitespace = re.compile(r"\s+")
+
+
+def normalize(statement: str) -> str:
+    """Statement with literals and bind parameters replaced by `?`, IN-lists collapsed and whitespace squeezed."""
+    statement = __placeholder.sub("?", statement)
+    statement = __literal.sub("?", statement)
+    statement = __placeholder_list.sub("?, ...", statement)
+    return __whitespace.sub(" ", statement).strip()
+
+
+def fingerprint(statement: str) -> tuple[str, str]:
+    normalized = normalize(statement)
+    return hashlib.md5(normalized.encode()).hexdigest(), normalized
+
+
+def _jsonable(parameters: Any, max_items: int = 100, max_length: int = 200) -> Any:
+    if isinstance(parameters, dict):
+        return {str(key): _jsonable(value) for key, value in list(parameters.items())[:max_items]}
+    if isinstance(parameters, (list, tuple)):
+        return [_jsonable(value) for value in list(parameters)[:max_items]]
+    if parameters is None or isinstance(parameters, (bool, int, float)):
+        return parameters
+    return str(parameters)[:max_length]
+
+
+class SlowQueryLog:
+    """Records statements slower than `threshold_ms` in `slow_query`, one row per statement fingerprint.
+    A sample (`explain_sample_rate`) of slow SELECTs is re-run with `EXPLAIN (ANALYZE, BUFFERS)` in a read-only
+    transaction in a background thread, at most once per fingerprint and `explain_interval_seconds` in this process.
+    Recording uses its own connection, failures are logged and never reach the caller."""
+
+    __dml = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|TRUNCATE|CREATE|DROP|ALTER)\b", re.IGNORECASE)
+
+    def __init__(
+        self, db: "DBHandler", threshold_ms: float = 500.0,
+        explain_sample_rate: float = 0.1, explain_interval_seconds: float = 3600.0,
+        explain_timeout_ms: int = 30_000,
+    ):
+        self.db = db
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_interval_seconds = explain_interval_seconds
+        self.explain_timeout_ms = explain_timeout_ms
+        self._explained: dict[str, float] = {}
+        self.__executor: ThreadPoolExecutor | None = None
+
+    def attach(self, engine: sa.Engine) -> None:
+        @sa.event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if not _recording.get():
+                conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+        @sa.event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if _recording.get() or not (starts := conn.info.get("slow_query_start")):
+                return
+            duration_ms = (time.perf_counter() - starts.pop()) * 1000
+            if duration_ms >= self.threshold_ms:
+                self.record(engine, statement, None if executemany else parameters, duration_ms)
+
+        @sa.event.listens_for(engine, "handle_error")
+        def handle_error(context):
+            if context.connection is not None and (starts := context.connection.info.get("slow_query_start")):
+                starts.pop()
+
+    def _should_explain(self, key: str, statement: str, parameters: Any) -> bool:
+        if parameters is not None and not isinstance(parameters, dict):
+            return False
+        if not statement.lstrip().upper().startswith(("SELECT", "WITH")) or SlowQueryLog.__dml.search(statement):
+            return False
+        if (last := self._explained.get(key)) is not None and time.monotonic() - last < self.explain_interval_seconds:
+            return False
+        return random.random() < self.explain_sample_rate
+
+    def explain(self, engine: sa.Engine, statement: str, parameters: dict | None) -> str:
+        with engine.connect() as conn:
+            conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+            rows = conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters or {}).all()
+            conn.rollback()
+        return "\n".join(row[0] for row in rows)
+
+    def __explain_background(
+        self, engine: sa.Engine, key: str, statement: str, parameters: dict | None, source: str | None
+    ) -> None:
+        token = _recording.set(True)
+        try:
+            plan = self.explain(engine, statement, parameters)
+            with engine.begin() as conn:
+                conn.execute(
+                    sa.update(models.SlowQuery)
+                    .where(models.SlowQuery.fingerprint == key)
+                    .values(plan=plan, plan_source=source, plan_utc=datetime.now(timezone.utc))
+                )
+        except Exception as e:
+            self.db.warn(f"EXPLAIN of slow query {key} failed: {e}")
+        finally:
+            _recording.reset(token)
+
+    def submit_explain(
+        self, engine: sa.Engine, key: str, statement: str, parameters: dict | None, source: str | None
+    ) -> None:
+        """Explains the statement in a background thread, i.e. not in the request that was slow."""
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self.__executor.submit(self.__explain_background, engine, key, statement, parameters, source)
+
+    def wait(self) -> None:
+        """Blocks until the submitted EXPLAINs are done."""
+        if self.__executor is not None:
+            self.__executor.submit(lambda: None).result()
+
+    def record(self, engine: sa.Engine, statement: str, parameters: Any, duration_ms: float) -> None:
+        token = _recording.set(True)
+        try:
+            key, normalized = fingerprint(statement)
+            source = _source.get()
+            now = datetime.now(timezone.utc)
+
+            table = models.SlowQuery.__table__
+            stmt = insert(table).values(
+                fingerprint=key, statement=normalized,
+                calls=1, total_ms=duration_ms, max_ms=duration_ms,
+                first_seen_utc=now, last_seen_utc=now,
+                last_statement=statement, last_parameters=_jsonable(parameters),
+                last_source=source, last_ms=duration_ms,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.fingerprint],
+                set_={
+                    "calls": table.c.calls + 1,
+                    "total_ms": table.c.total_ms + stmt.excluded.total_ms,
+                    "max_ms": sa.func.greatest(table.c.max_ms, stmt.excluded.max_ms),
+                    "last_seen_utc": stmt.excluded.last_seen_utc,
+                    "last_statement": stmt.excluded.last_statement,
+                    "last_parameters": stmt.excluded.last_parameters,
+                    "last_source": stmt.excluded.last_source,
+                    "last_ms": stmt.excluded.last_ms,
+                },
+            )
+            with engine.begin() as conn:
+                conn.execute(stmt)
+
+            # after the insert, so that the background thread finds the row to attach the plan to
+            if self._should_explain(key, statement, parameters):
+                self._explained[key] = time.monotonic()
+                self.submit_explain(engine, key, statement, parameters, source)
+        except Exception as e:
+            self.db.warn(f"Could not record slow query: {e}")
+        finally:
+            _recording.reset(token)
@@ -9,6 +9,8 @@ from ..DBBlueprint import DBBlueprint
 
 
 class AdapterBP(DBBlueprint):
+    model = models.Adapter
+
     @DBBlueprint.transaction
     def create(
         self, index_kit_id: int,
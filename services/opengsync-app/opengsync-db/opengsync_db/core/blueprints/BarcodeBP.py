@@ -10,6 +10,8 @@ from ..DBBlueprint import DBBlueprint
 
 
 class BarcodeBP(DBBlueprint):
+    model = models.Barcode
+
     @DBBlueprint.transaction
     def create(
         self, name: str, sequence: str, well: str | None,
@@ -5,6 +5,8 @@ from ..DBBlueprint import DBBlueprint
 
 
 class CommentBP(DBBlueprint):
+    model = models.Comment
+
     @DBBlueprint.transaction
     def create(
         self, text: str, author_id: int, file_id: int | None = None,
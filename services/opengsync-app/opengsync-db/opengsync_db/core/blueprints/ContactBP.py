@@ -5,6 +5,8 @@ from ..DBBlueprint import DBBlueprint
 
 
 class ContactBP(DBBlueprint):
+    model = models.Contact
+
     @DBBlueprint.transaction
     def create_contact(
         self, name: str,
@@ -14,6 +14,8 @@ from ..DBBlueprint import DBBlueprint
 
 
 class DataPathBP(DBBlueprint):
+    model = models.DataPath
+
     @classmethod
     def where(
         cls,
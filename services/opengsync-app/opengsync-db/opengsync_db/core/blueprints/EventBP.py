@@ -9,6 +9,8 @@ from ..DBBlueprint import DBBlueprint
 
 
 class EventBP(DBBlueprint):
+    model = models.Event
+
     @DBBlueprint.transaction
     def create(
         self, title: str, timestamp_utc: datetime, type: EventTypeEnum,
@@ -1,17 +1,21 @@
 import math
-from typing import Optional, Callable, Iterable
+from typing import Optional, Callable, Iterable, Any
 
 import sqlalchemy as sa
+from sqlalchemy import orm
 from sqlalchemy.orm import Query, interfaces
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.sql.base import ExecutableOption
 
 from ... import models, PAGE_LIMIT
 from .. import exceptions
-from ...categories import ExperimentWorkFlowEnum, ExperimentStatusEnum, ExperimentWorkFlow
+from ...categories import ExperimentWorkFlowEnum, ExperimentStatusEnum, ExperimentWorkFlow, LibraryType
 from ..DBBlueprint import DBBlueprint
 
 
 class ExperimentBP(DBBlueprint):
+    model = models.Experiment
+
     @classmethod
     def where(
         cls,
@@ -202,9 +206,7 @@ class ExperimentBP(DBBlueprint):
         if workflow_in is not None:
             query = query.where(models.Experiment.workflow_id.in_([w.id for w in workflow_in]))
 
-        query = query.order_by(
-            sa.func.similarity(models.Experiment.name, word).desc()
-        )
+        query = ExperimentBP.fuzzy_search(query, word, models.Experiment.name)
 
         if limit is not None:
             query = query.limit(limit)
@@ -213,6 +215,167 @@ class ExperimentBP(DBBlueprint):
 
         return experiments
     
+    @DBBlueprint.transaction
+    def compute_overview(self, experiment_id: int) -> tuple[dict[str, list[dict[str, Any]]], list[dict[str, Any]]]:
+        """Request -> library -> pool -> lane -> experiment flow graph (`nodes` and `links` of the Sankey plot)
+        and the summary of each lane of the experiment."""
+        if (experiment := self.db.session.get(models.Experiment, experiment_id)) is None:
+            raise exceptions.ElementDoesNotExist(f"Experiment with id {experiment_id} does not exist")
+
+        lanes = self.db.session.query(models.Lane).where(
+            models.Lane.experiment_id == experiment_id
+        ).options(
+            orm.selectinload(models.Lane.pool_links).joinedload(models.links.LanePoolLink.pool)
+        ).order_by(models.Lane.number).populate_existing().all()
+
+        rows = self.db.session.execute(
+            sa.select(
+                models.Lane.number, models.Pool.id, models.Pool.name,
+                models.Library.id, models.Library.type_id,
+                models.SeqRequest.id, models.SeqRequest.name,
+            ).join(
+                models.links.LanePoolLink,
+                models.links.LanePoolLink.lane_id == models.Lane.id
+            ).join(
+                models.Pool,
+                models.Pool.id == models.links.LanePoolLink.pool_id
+            ).join(
+                models.Library,
+                models.Library.pool_id == models.Pool.id
+            ).join(
+                models.SeqRequest,
+                models.SeqRequest.id == models.Library.seq_request_id
+            ).where(
+                models.Lane.experiment_id == experiment_id
+            ).order_by(models.Lane.number, models.Pool.id, models.Library.id)
+        ).all()
+
+        # a pool on several lanes splits its libraries evenly between them
+        pool_num_lanes: dict[int, int] = {}
+        for lane in lanes:
+            for link in lane.pool_links:
+                pool_num_lanes[link.pool_id] = pool_num_lanes.get(link.pool_id, 0) + 1
+
+        nodes: list[dict[str, Any]] = []
+        links: list[dict[str, Any]] = []
+        if rows:
+            nodes.append({"node": 0, "name": experiment.name})
+
+            lane_nodes: dict[int, dict[str, Any]] = {}
+            lane_widths: dict[int, float] = {}
+            for lane_num in sorted(set(row[0] for row in rows)):
+                lane_nodes[lane_num] = {"node": len(nodes), "name": f"Lane {lane_num}"}
+                nodes.append(lane_nodes[lane_num])
+                lane_widths[lane_num] = 0.0
+
+            # (request) -> (pool, lane) -> libraries
+            requests: dict[tuple[int, str], dict[tuple[int, str, int], list[tuple[int, int]]]] = {}
+            for lane_num, pool_id, pool_name, library_id, library_type_id, seq_request_id, request_name in rows:
+                requests.setdefault((seq_request_id, request_name), {}).setdefault(
+                    (pool_id, pool_name, lane_num), []
+                ).append((library_id, library_type_id))
+
+            pool_nodes: dict[int, dict[str, Any]] = {}
+            library_nodes: dict[int, dict[str, Any]] = {}
+            for (_, request_name), pool_lanes in sorted(requests.items()):
+                request_node = {"node": len(nodes), "name": request_name}
+                nodes.append(request_node)
+                for (pool_id, pool_name, lane_num), libraries in sorted(pool_lanes.items()):
+                    if (pool_node := pool_nodes.get(pool_id)) is None:
+                        pool_node = {"node": len(nodes), "name": pool_name}
+                        nodes.append(pool_node)
+                        pool_nodes[pool_id] = pool_node
+
+                    width = len(libraries) / pool_num_lanes[pool_id]
+                    links.append({"source": pool_node["node"], "target": lane_nodes[lane_num]["node"], "value": width})
+                    lane_widths[lane_num] += width
+
+                    for library_id, library_type_id in libraries:
+                        if library_id in library_nodes:
+                            continue
+                        library_node = {"node": len(nodes), "name": LibraryType.get(library_type_id).name}
+                        nodes.append(library_node)
+                        library_nodes[library_id] = library_node
+                        links.append({"source": library_node["node"], "target": pool_node["node"], "value": 1})
+                        links.append({"source": request_node["node"], "target": library_node["node"], "value": 1})
+
+            for lane_num, lane_node in lane_nodes.items():
+                links.append({"source": lane_node["node"], "target": 0, "value": lane_widths[lane_num]})
+
+        lane_num_libraries: dict[int, int] = {}
+        for row in rows:
+            lane_num_libraries[row[0]] = lane_num_libraries.get(row[0], 0) + 1
+
+        summaries: list[dict[str, Any]] = []
+        for lane in lanes:
+            num_m_reads_requested = 0.0
+            for link in lane.pool_links:
+                if link.pool.num_m_reads_requested is not None:
+                    num_m_reads_requested += link.pool.num_m_reads_requested / pool_num_lanes[link.pool_id]
+
+            num_m_reads: float | None = None
+            if lane.pool_links and all(link.num_m_reads is not None for link in lane.pool_links):
+                num_m_reads = sum(link.num_m_reads for link in lane.pool_links)  # type: ignore[misc]
+
+            summaries.append({
+                "lane": lane.number,
+                "num_pools": len(lane.pool_links),
+                "num_libraries": lane_num_libraries.get(lane.number, 0),
+                "num_m_reads_requested": num_m_reads_requested,
+                "num_m_reads": num_m_reads,
+                "molarity": lane.molarity,
+                "share": None,
+            })
+
+        total_m_reads = sum(summary["num_m_reads"] or 0.0 for summary in summaries)
+        if total_m_reads > 0:
+            for summary in summaries:
+                if summary["num_m_reads"] is not None:
+                    summary["share"] = summary["num_m_reads"] / total_m_reads
+
+        return {"nodes": nodes, "links": links}, summaries
+
+    @DBBlueprint.transaction
+    def get_overview(self, experiment_id: int) -> models.ExperimentOverview | None:
+        return self.db.session.get(models.ExperimentOverview, experiment_id)
+
+    @DBBlueprint.transaction
+    def update_overviews(self, experiment_ids: list[int] | None = None) -> list[int]:
+        """Recomputes and stores the overviews of `experiment_ids`, or of all stale overviews if None.
+        Returns the ids of the updated experiments, deleted experiments are skipped."""
+        if experiment_ids is None:
+            experiment_ids = list(self.db.session.execute(
+                sa.select(models.ExperimentOverview.experiment_id).where(models.ExperimentOverview.stale)
+            ).scalars().all())
+
+        existing = set(self.db.session.execute(
+            sa.select(models.Experiment.id).where(models.Experiment.id.in_(experiment_ids))
+        ).scalars().all())
+
+        table = models.ExperimentOverview.__table__
+        updated = []
+        for experiment_id in experiment_ids:
+            if experiment_id not in existing:
+                continue
+            graph, lanes = self.compute_overview(experiment_id)
+            stmt = insert(table).values(
+                experiment_id=experiment_id, graph=graph, lanes=lanes, stale=False, computed_utc=sa.func.now()
+            )
+            self.db.session.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c.experiment_id],
+                set_={
+                    "graph": stmt.excluded.graph,
+                    "lanes": stmt.excluded.lanes,
+                    "stale": False,
+                    "computed_utc": stmt.excluded.computed_utc,
+                },
+            ))
+            updated.append(experiment_id)
+
+        # marks the session for commit, the upserts above leave no dirty objects behind
+        self.db.flush()
+        return updated
+
     @DBBlueprint.transaction
     def __getitem__(self, key: int | str) -> models.Experiment:
         if (experiment := self.get(key)) is None:
@@ -10,6 +10,8 @@ from .. import exceptions
 
 
 class FeatureBP(DBBlueprint):
+    model = models.Feature
+
     @DBBlueprint.transaction
     def create(
         self,
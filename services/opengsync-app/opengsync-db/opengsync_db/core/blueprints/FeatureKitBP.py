@@ -9,6 +9,8 @@ from ..DBBlueprint import DBBlueprint
 
 
 class FeatureKitBP(DBBlueprint):
+    model = models.FeatureKit
+
     @DBBlueprint.transaction
     def create(
         self, identifier: str, name: str,
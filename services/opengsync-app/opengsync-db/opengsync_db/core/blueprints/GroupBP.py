@@ -1,7 +1,6 @@
 import math
 from typing import Optional
 
-import sqlalchemy as sa
 from sqlalchemy.orm import Query
 
 from ... import models
@@ -12,6 +11,8 @@ from ...categories import AffiliationType, AffiliationTypeEnum, GroupTypeEnum
 
 
 class GroupBP(DBBlueprint):
+    model = models.Group
+
     @classmethod
     def where(
         cls, query: Query, user_id: Optional[int], type: Optional[GroupTypeEnum] = None,
@@ -105,9 +106,7 @@ class GroupBP(DBBlueprint):
         query = self.db.session.query(models.Group)
         query = GroupBP.where(query, user_id=user_id, type=type, type_in=type_in)
 
-        query = query.order_by(
-            sa.func.similarity(models.Group.name, name).desc()
-        )
+        query = GroupBP.fuzzy_search(query, name, models.Group.name)
 
         if limit is not None:
             query = query.limit(limit)
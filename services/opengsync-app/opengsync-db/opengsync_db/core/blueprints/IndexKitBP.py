@@ -2,6 +2,7 @@ import math
 from typing import Optional
 
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 
 from ...categories import IndexTypeEnum, LabProtocolEnum, KitType
 from ... import models, PAGE_LIMIT
@@ -10,6 +11,8 @@ from ..DBBlueprint import DBBlueprint
 
 
 class IndexKitBP(DBBlueprint):
+    model = models.IndexKit
+
     @DBBlueprint.transaction
     def create(
         self, identifier: str, name: str,
@@ -65,9 +68,7 @@ class IndexKitBP(DBBlueprint):
         if index_type_in is not None:
             query = query.where(models.IndexKit.type_id.in_([t.id for t in index_type_in]))
 
-        query = query.order_by(
-            sa.func.similarity(models.IndexKit.identifier + ' ' + models.IndexKit.name, word).desc()
-        )
+        query = IndexKitBP.fuzzy_search(query, word, models.IndexKit.identifier + sa.literal_column("' '") + models.IndexKit.name)
 
         if limit is not None:
             query = query.limit(limit)
@@ -124,6 +125,26 @@ class IndexKitBP(DBBlueprint):
         res = query.all()
         return res, n_pages
 
+    @DBBlueprint.transaction
+    def get_content_hashes(self) -> dict[int, str]:
+        """md5 over the kits and barcodes of each index type, keyed by index type id. Changes whenever a kit of
+        that type is added, renamed or retyped, or its barcodes are edited."""
+        content = sa.func.concat_ws(
+            "|", models.IndexKit.id, models.IndexKit.identifier,
+            models.Barcode.id, models.Barcode.sequence, models.Barcode.name, models.Barcode.well,
+            models.Barcode.adapter_id, models.Barcode.type_id,
+        )
+        query = sa.select(
+            models.IndexKit.type_id,
+            sa.func.md5(sa.func.string_agg(
+                content, aggregate_order_by(sa.literal_column("','"), models.IndexKit.id, models.Barcode.id)
+            ))
+        ).outerjoin(
+            models.Barcode, models.Barcode.index_kit_id == models.IndexKit.id
+        ).group_by(models.IndexKit.type_id)
+
+        return {type_id: content_hash for type_id, content_hash in self.db.session.execute(query).all()}
+
     @DBBlueprint.transaction
     def update(self, index_kit: models.IndexKit):
         self.db.session.add(index_kit)
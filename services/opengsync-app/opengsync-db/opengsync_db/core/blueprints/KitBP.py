@@ -8,6 +8,8 @@ from ..DBBlueprint import DBBlueprint
 
 
 class KitBP(DBBlueprint):
+    model = models.Kit
+
     @DBBlueprint.transaction
     def create(
         self,
@@ -97,9 +99,7 @@ class KitBP(DBBlueprint):
         if kit_type is not None:
             query = query.where(models.Kit.kit_type_id == kit_type.id)
 
-        query = query.order_by(
-            sa.func.similarity(models.Kit.identifier + ' ' + models.Kit.name, word).desc()
-        )
+        query = KitBP.fuzzy_search(query, word, models.Kit.identifier + sa.literal_column("' '") + models.Kit.name)
 
         if limit is not None:
             query = query.limit(limit)
@@ -1,7 +1,6 @@
 import math
 from typing import Optional
 
-import sqlalchemy as sa
 from sqlalchemy.sql.base import ExecutableOption
 
 from ... import models, PAGE_LIMIT
@@ -11,6 +10,8 @@ from .. import exceptions
 
 
 class LabPrepBP(DBBlueprint):
+    model = models.LabPrep
+
     @DBBlueprint.transaction
     def create(
         self,
@@ -133,17 +134,13 @@ class LabPrepBP(DBBlueprint):
             query = query.where(models.LabPrep.status_id.in_([s.id for s in status_in]))
 
         if name is not None:
-            query = query.order_by(
-                sa.func.similarity(models.LabPrep.name, name).desc()
-            )
+            query = LabPrepBP.fuzzy_search(query, name, models.LabPrep.name)
         elif creator is not None:
             query = query.join(
                 models.User,
                 models.User.id == models.LabPrep.creator_id
             )
-            query = query.order_by(
-                sa.func.similarity(models.User.first_name + ' ' + models.User.last_name, creator).desc()
-            )
+            query = LabPrepBP.fuzzy_search(query, creator, models.User.full_name)
         else:
             raise ValueError("Either 'name' or 'owner' must be provided.")
         
@@ -9,6 +9,8 @@ from .. import exceptions
 
 
 class LaneBP(DBBlueprint):
+    model = models.Lane
+
     @DBBlueprint.transaction
     def create(
         self, number: int, experiment_id: int
@@ -1,7 +1,9 @@
 import math
-from typing import Optional, Callable, Iterator
+from typing import Optional, Callable, Iterator, Sequence
 
+import pandas as pd
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm.query import Query
 from sqlalchemy.sql.base import ExecutableOption
 from sqlalchemy.orm import aliased
@@ -16,6 +18,8 @@ from ..DBBlueprint import DBBlueprint
 
 
 class LibraryBP(DBBlueprint):
+    model = models.Library
+
     @classmethod
     def where(
         cls,
@@ -305,17 +309,13 @@ class LibraryBP(DBBlueprint):
         )
 
         if name is not None:
-            query = query.order_by(
-                sa.func.similarity(models.Library.name, name).desc()
-            )
+            query = LibraryBP.fuzzy_search(query, name, models.Library.name)
         elif owner is not None:
             query = query.join(
                 models.User,
                 models.User.id == models.Library.owner_id
             )
-            query = query.order_by(
-                sa.func.similarity(models.User.first_name + ' ' + models.User.last_name, owner).desc()
-            )
+            query = LibraryBP.fuzzy_search(query, owner, models.User.full_name)
         else:
             raise ValueError("At least one of 'name' or 'owner' must be provided")
 
@@ -393,6 +393,68 @@ class LibraryBP(DBBlueprint):
 
         return quality
 
+    @staticmethod
+    def _merge_seq_qualities(records: pd.DataFrame) -> pd.DataFrame:
+        """Combines rows of the same library and lane (e.g. a library listed under its name and its id):
+        read counts are summed, qualities are averaged weighted by the library reads."""
+        keys = [records["library_id"], records["lane"]]
+        merged = records.groupby(keys, dropna=False, sort=False).agg(
+            experiment_id=("experiment_id", "first"),
+            num_lane_reads=("num_lane_reads", "max"),
+            num_library_reads=("num_library_reads", "sum"),
+        )
+        for col in records.columns:
+            if not col.startswith(("mean_quality_pf_", "q30_perc_")):
+                continue
+            weights = records["num_library_reads"].astype("float64").where(records[col].notna())
+            total = weights.groupby(keys, dropna=False, sort=False).sum(min_count=1)
+            merged[col] = (records[col] * weights).groupby(keys, dropna=False, sort=False).sum(min_count=1) / total.where(total > 0)
+        return merged.reset_index()
+
+    @DBBlueprint.transaction
+    def set_seq_qualities(self, experiment_id: int, qualities: pd.DataFrame, chunk_size: int = 2000) -> int:
+        """Upserts read qualities from a DataFrame with columns `library_id` (NA for undetermined reads), `lane`,
+        `num_lane_reads`, `num_library_reads` and optional `mean_quality_pf_*` / `q30_perc_*` columns.
+        Sequenced libraries and their pools are set to `SEQUENCED`."""
+        columns = [
+            "library_id", "lane", "num_lane_reads", "num_library_reads",
+            "mean_quality_pf_r1", "q30_perc_r1", "mean_quality_pf_r2", "q30_perc_r2",
+            "mean_quality_pf_i1", "q30_perc_i1", "mean_quality_pf_i2", "q30_perc_i2",
+        ]
+        records = qualities.reindex(columns=columns).assign(experiment_id=experiment_id)
+        records = records.astype({"library_id": "Int64", "lane": "Int64", "num_lane_reads": "Int64", "num_library_reads": "Int64"})
+        if records.duplicated(subset=["library_id", "lane"]).any():
+            # one upsert statement cannot update the same row twice
+            records = LibraryBP._merge_seq_qualities(records)
+        records = records.astype(object).where(records.notna(), None)
+
+        for start in range(0, len(records), chunk_size):
+            stmt = insert(models.SeqQuality).values(records.iloc[start:start + chunk_size].to_dict(orient="records"))
+            self.db.session.execute(stmt.on_conflict_do_update(
+                index_elements=["library_id", "experiment_id", "lane"],
+                set_={col: stmt.excluded[col] for col in columns if col not in ("library_id", "lane")},
+            ))
+
+        if len(library_ids := [int(library_id) for library_id in qualities["library_id"].dropna().unique()]) > 0:
+            self.db.session.execute(
+                sa.update(models.Pool).where(
+                    models.Pool.id.in_(sa.select(models.Library.pool_id).where(models.Library.id.in_(library_ids)))
+                ).values(status_id=PoolStatus.SEQUENCED.id).execution_options(synchronize_session="fetch")
+            )
+            self.db.session.execute(
+                sa.update(models.Library).where(
+                    models.Library.id.in_(library_ids)
+                ).values(status_id=LibraryStatus.SEQUENCED.id).execution_options(synchronize_session="fetch")
+            )
+
+        # qualities were written without the ORM
+        if (experiment := self.db.session.identity_map.get(self.db.session.identity_key(models.Experiment, experiment_id))) is not None:
+            self.db.session.expire(experiment, ["read_qualities"])
+
+        # marks the session for commit, the statements above leave no dirty objects behind
+        self.db.flush()
+        return len(records)
+
     @DBBlueprint.transaction
     def add_index(
         self, library_id: int,
@@ -456,71 +518,106 @@ class LibraryBP(DBBlueprint):
             return AccessType.INSIDER
         if library.owner_id == user.id:
             return AccessType.OWNER
-        
-        has_access: bool = self.db.session.query(
-            sa.exists().where(
+        return self.get_access_types([library.id], user)[library.id]
+
+    @DBBlueprint.transaction
+    def get_access_types(self, library_ids: Sequence[int], user: models.User) -> dict[int, AccessTypeEnum]:
+        """Access type of `user` per library id, resolved with a single query and memoized for the session."""
+        return self._resolve_access_types(
+            library_ids, user, owner_id=models.Library.owner_id,
+            affiliated=sa.exists().where(
                 (models.links.UserAffiliation.user_id == user.id) &
-                (models.links.UserAffiliation.group_id == library.seq_request.group_id)
+                (models.SeqRequest.id == models.Library.seq_request_id) &
+                (models.links.UserAffiliation.group_id == models.SeqRequest.group_id)
             )
-        ).scalar()
-
-        if has_access:
-            return AccessType.EDIT
-
-        return AccessType.NONE
+        )
 
     @DBBlueprint.transaction
     def clone(
         self, library_id: int, seq_request_id: int, indexed: bool, status: LibraryStatusEnum
     ) -> models.Library:
-
-        if (library := self.db.session.get(models.Library, library_id)) is None:
+        if (cloned_library_id := self.clone_many([library_id], seq_request_id=seq_request_id, indexed=indexed, status=status).get(library_id)) is None:
             raise exceptions.ElementDoesNotExist(f"Library with id {library_id} does not exist")
 
-        cloned_library = self.create(
-            name=library.name,
-            sample_name=library.sample_name,
-            library_type=library.type,
-            seq_request_id=seq_request_id,
-            owner_id=library.owner_id,
-            genome_ref=library.genome_ref,
-            assay_type=library.assay_type,
-            mux_type=library.mux_type,
-            properties=library.properties,
-            index_type=library.index_type,
-            nuclei_isolation=library.nuclei_isolation,
-            original_library_id=library.original_library_id if library.original_library_id is not None else library.id,
-            status=status
-        )
+        return self.db.session.get(models.Library, cloned_library_id)  # type: ignore[return-value]
 
-        for sample_link in library.sample_links:
-            self.db.links.link_sample_library(
-                sample_id=sample_link.sample_id,
-                library_id=cloned_library.id,
-                mux=sample_link.mux if sample_link.mux is not None else None,
-            )
+    @DBBlueprint.transaction
+    def clone_many(
+        self, library_ids: Sequence[int] | sa.Select, seq_request_id: int, indexed: bool, status: LibraryStatusEnum,
+        pool_ids: dict[int, int] | None = None,
+    ) -> dict[int, int]:
+        """Clones the libraries into `seq_request_id` with their sample and feature links (and indices if `indexed`),
+        one `INSERT ... SELECT` per table. Libraries of the pools in `pool_ids` (original -> cloned pool id) are added
+        to the cloned pool. Returns original -> cloned library ids."""
+        if self.db.session.get(models.SeqRequest, seq_request_id) is None:
+            raise exceptions.ElementDoesNotExist(f"Seq request with id {seq_request_id} does not exist")
+
+        id_map: dict[int, int] = dict(self.db.session.execute(
+            sa.select(models.Library.id, DBBlueprint.next_ids(models.Library)).where(models.Library.id.in_(library_ids))
+        ).tuples().all())
+
+        if len(id_map) == 0:
+            return id_map
+
+        mapping = DBBlueprint.id_mapping(id_map.items(), "old_id", "new_id")
+
+        # clones of the same original are numbered consecutively, after the existing ones
+        original_library_id = sa.func.coalesce(models.Library.original_library_id, models.Library.id)
+        clones = aliased(models.Library)
+        clone_number = sa.select(sa.func.count()).where(
+            clones.original_library_id == original_library_id
+        ).scalar_subquery() + sa.func.row_number().over(partition_by=original_library_id, order_by=models.Library.id)
+
+        if pool_ids:
+            pool_mapping = DBBlueprint.id_mapping(pool_ids.items(), "old_id", "new_id", name="pool_mapping")
+            pool_id = pool_mapping.c.new_id
+        else:
+            pool_id = sa.null()
+
+        query = sa.select(
+            mapping.c.new_id, models.Library.name, models.Library.sample_name, clone_number, original_library_id,
+            models.Library.type_id, sa.literal(status.id), models.Library.genome_ref_id, models.Library.assay_type_id,
+            models.Library.mux_type_id, models.Library.index_type_id, models.Library.nuclei_isolation,
+            models.Library.properties, models.Library.owner_id, sa.literal(seq_request_id),
+            pool_id,
+        ).select_from(models.Library).join(mapping, mapping.c.old_id == models.Library.id)
+
+        if pool_ids:
+            query = query.outerjoin(pool_mapping, pool_mapping.c.old_id == models.Library.pool_id)
+
+        self.db.session.execute(sa.insert(models.Library).from_select([
+            "id", "name", "sample_name", "clone_number", "original_library_id", "type_id", "status_id", "genome_ref_id",
+            "assay_type_id", "mux_type_id", "index_type_id", "nuclei_isolation", "properties", "owner_id", "seq_request_id",
+            "pool_id",
+        ], query))
+
+        self.db.session.execute(sa.insert(models.links.SampleLibraryLink).from_select(
+            ["sample_id", "library_id", "mux"],
+            sa.select(
+                models.links.SampleLibraryLink.sample_id, mapping.c.new_id, models.links.SampleLibraryLink.mux
+            ).select_from(models.links.SampleLibraryLink).join(mapping, mapping.c.old_id == models.links.SampleLibraryLink.library_id)
+        ))
 
-        for feature in library.features:
-            self.db.links.link_feature_library(
-                feature_id=feature.id,
-                library_id=cloned_library.id
-            )
+        self.db.session.execute(sa.insert(models.links.LibraryFeatureLink).from_select(
+            ["library_id", "feature_id"],
+            sa.select(
+                mapping.c.new_id, models.links.LibraryFeatureLink.feature_id
+            ).select_from(models.links.LibraryFeatureLink).join(mapping, mapping.c.old_id == models.links.LibraryFeatureLink.library_id)
+        ))
 
         if indexed:
-            for index in library.indices:
-                self.add_index(
-                    library_id=cloned_library.id,
-                    index_kit_i7_id=index.index_kit_i7_id,
-                    name_i7=index.name_i7,
-                    sequence_i7=index.sequence_i7,
-                    index_kit_i5_id=index.index_kit_i5_id,
-                    name_i5=index.name_i5,
-                    sequence_i5=index.sequence_i5,
-                    orientation=index.orientation,
-                )
+            self.db.session.execute(sa.insert(models.LibraryIndex).from_select(
+                ["library_id", "index_kit_i7_id", "name_i7", "sequence_i7", "index_kit_i5_id", "name_i5", "sequence_i5", "orientation"],
+                sa.select(
+                    mapping.c.new_id, models.LibraryIndex.index_kit_i7_id, models.LibraryIndex.name_i7, models.LibraryIndex.sequence_i7,
+                    models.LibraryIndex.index_kit_i5_id, models.LibraryIndex.name_i5, models.LibraryIndex.sequence_i5,
+                    models.LibraryIndex._orientation,
+                ).select_from(models.LibraryIndex).join(mapping, mapping.c.old_id == models.LibraryIndex.library_id)
+            ))
+
+        self.db.flush()
+        return id_map
 
-        return cloned_library
-    
     @DBBlueprint.transaction
     def __getitem__(self, id: int) -> models.Library:
         if (library := self.db.session.get(models.Library, id)) is None:
@@ -1,6 +1,9 @@
 from uuid_extensions import uuid7str
 from typing import Optional
+from datetime import timedelta
 
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.sql.base import ExecutableOption
 
 from ...categories import MediaFileTypeEnum
@@ -10,6 +13,8 @@ from .. import exceptions
 
 
 class MediaFileBP(DBBlueprint):
+    model = models.MediaFile
+
     @DBBlueprint.transaction
     def create(
         self, name: str, type: MediaFileTypeEnum,
@@ -18,6 +23,7 @@ class MediaFileBP(DBBlueprint):
         seq_request_id: int | None = None,
         experiment_id: int | None = None,
         lab_prep_id: int | None = None,
+        sha256: str | None = None,
         flush: bool = True
     ) -> models.MediaFile:
         if seq_request_id is not None:
@@ -42,17 +48,24 @@ class MediaFileBP(DBBlueprint):
             uuid = uuid7str()
 
         name = name[:models.MediaFile.name.type.length]
+        extension = extension.lower().strip()
+
+        if sha256 is not None:
+            blob_id = self.acquire_blob(sha256=sha256, extension=extension, size_bytes=size_bytes).id
+        else:
+            blob_id = None
 
         file = models.MediaFile(
             name=name,
             type_id=type.id,
-            extension=extension.lower().strip(),
+            extension=extension,
             uuid=uuid,
             uploader_id=uploader_id,
             size_bytes=size_bytes,
             experiment_id=experiment_id,
             seq_request_id=seq_request_id,
             lab_prep_id=lab_prep_id,
+            blob_id=blob_id,
         )
 
         self.db.session.add(file)
@@ -125,4 +138,55 @@ class MediaFileBP(DBBlueprint):
     def __getitem__(self, file_id: int) -> models.MediaFile:
         if (file := self.db.session.get(models.MediaFile, file_id)) is None:
             raise exceptions.ElementDoesNotExist(f"File with id '{file_id}', not found.")
-        return file
\ No newline at end of file
+        return file
+
+    @DBBlueprint.transaction
+    def acquire_blob(self, sha256: str, extension: str, size_bytes: int) -> models.MediaBlob:
+        """Returns the blob for the content, creating it if needed. The blob row stays locked until the
+        transaction ends, so the caller can write the file to `blob.path` without racing the garbage collector."""
+        extension = extension.lower().strip()
+        stmt = insert(models.MediaBlob).values(
+            sha256=sha256, extension=extension, size_bytes=size_bytes, ref_count=0, unreferenced_utc=sa.func.now(),
+        ).on_conflict_do_update(
+            constraint="uq_media_blob_sha256_extension",
+            # restarts the grace period of an orphaned blob, the reference is counted once the MediaFile is flushed
+            set_={"unreferenced_utc": sa.case((models.MediaBlob.ref_count <= 0, sa.func.now()), else_=None)},
+        ).returning(models.MediaBlob.id)
+
+        blob_id = self.db.session.execute(stmt).scalar_one()
+        if (blob := self.db.session.get(models.MediaBlob, blob_id, populate_existing=True)) is None:
+            raise exceptions.ElementDoesNotExist(f"MediaBlob with id '{blob_id}', not found.")
+        return blob
+    
+    @DBBlueprint.transaction
+    def get_orphaned_blobs(self, grace_period: timedelta, limit: int | None = None) -> list[models.MediaBlob]:
+        """Unreferenced blobs older than `grace_period`, locked for deletion. Blobs that are being
+        re-acquired by a concurrent upload are skipped."""
+        query = self.db.session.query(models.MediaBlob).where(
+            models.MediaBlob.ref_count <= 0,
+            models.MediaBlob.unreferenced_utc < sa.func.now() - grace_period,
+        ).order_by(models.MediaBlob.unreferenced_utc).with_for_update(skip_locked=True)
+
+        if limit is not None:
+            query = query.limit(limit)
+
+        return query.all()
+    
+    @DBBlueprint.transaction
+    def get_blob(self, sha256: str, extension: str) -> models.MediaBlob | None:
+        return self.db.session.query(models.MediaBlob).where(
+            models.MediaBlob.sha256 == sha256,
+            models.MediaBlob.extension == extension,
+        ).first()
+    
+    @DBBlueprint.transaction
+    def delete_blob(self, blob_id: int, flush: bool = True):
+        if (blob := self.db.session.get(models.MediaBlob, blob_id)) is None:
+            raise exceptions.ElementDoesNotExist(f"MediaBlob with id '{blob_id}', not found.")
+        
+        if blob.ref_count > 0:
+            raise exceptions.ElementIsReferenced(f"MediaBlob '{blob_id}' is still referenced by {blob.ref_count} file(s).")
+        
+        self.db.session.delete(blob)
+        if flush:
+            self.db.flush()
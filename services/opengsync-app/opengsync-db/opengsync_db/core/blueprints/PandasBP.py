@@ -1,9 +1,12 @@
+from datetime import datetime
+
 import pandas as pd
 
 import sqlalchemy as sa
 
 from ... import models
 from ... import categories
+from .. import units, pooling
 from ..DBBlueprint import DBBlueprint
 
 
@@ -191,6 +194,107 @@ class PandasBP(DBBlueprint):
 
         return df
 
+    @DBBlueprint.transaction
+    def get_library_indices(
+        self, library_ids: list[int] | None = None, pool_ids: list[int] | None = None,
+        lane_ids: list[int] | None = None, experiment_ids: list[int] | None = None,
+        seq_request_ids: list[int] | None = None,
+    ) -> pd.DataFrame:
+        """Flattened index table of all libraries selected directly or through their pool, lane, experiment or seq request.
+        One row per (library, pool, lane, index), libraries selected more than once are de-duplicated.
+        `lane_id`/`lane` are NULL for libraries that were not selected through a lane or experiment."""
+        def ids_param(name: str, ids: list[int]):
+            return sa.any_(sa.bindparam(name, [int(id) for id in ids], type_=sa.ARRAY(sa.Integer)))
+
+        selections = []
+        no_lane = sa.cast(sa.null(), sa.Integer).label("lane_id")
+
+        if library_ids:
+            selections.append(sa.select(
+                models.Library.id.label("library_id"), models.Library.pool_id.label("pool_id"), no_lane
+            ).where(models.Library.id == ids_param("library_ids", library_ids)))
+
+        if pool_ids:
+            selections.append(sa.select(
+                models.Library.id.label("library_id"), models.Library.pool_id.label("pool_id"), no_lane
+            ).where(models.Library.pool_id == ids_param("pool_ids", pool_ids)))
+
+        if seq_request_ids:
+            selections.append(sa.select(
+                models.Library.id.label("library_id"), models.Library.pool_id.label("pool_id"), no_lane
+            ).join(
+                models.Pool,
+                models.Pool.id == models.Library.pool_id
+            ).where(models.Pool.seq_request_id == ids_param("seq_request_ids", seq_request_ids)))
+
+        if lane_ids:
+            selections.append(sa.select(
+                models.Library.id.label("library_id"), models.Library.pool_id.label("pool_id"),
+                models.links.LanePoolLink.lane_id.label("lane_id"),
+            ).join(
+                models.links.LanePoolLink,
+                models.links.LanePoolLink.pool_id == models.Library.pool_id
+            ).where(models.links.LanePoolLink.lane_id == ids_param("lane_ids", lane_ids)))
+
+        if experiment_ids:
+            selections.append(sa.select(
+                models.Library.id.label("library_id"), models.Library.pool_id.label("pool_id"),
+                models.links.LanePoolLink.lane_id.label("lane_id"),
+            ).join(
+                models.links.LanePoolLink,
+                models.links.LanePoolLink.pool_id == models.Library.pool_id
+            ).join(
+                models.Lane,
+                models.Lane.id == models.links.LanePoolLink.lane_id
+            ).where(models.Lane.experiment_id == ids_param("experiment_ids", experiment_ids)))
+
+        columns = [
+            "library_id", "library_name", "pool_id", "pool", "lane_id", "lane",
+            "sequence_i7", "sequence_i5", "name_i7", "name_i5",
+            "kit_i7_id", "kit_i5_id", "orientation_id", "index_type_id",
+        ]
+        if not selections:
+            return pd.DataFrame(columns=columns)
+
+        # UNION removes libraries that are selected multiple times, e.g. directly and through their pool
+        selection = sa.union(*selections).subquery("selection")
+
+        query = sa.select(
+            models.Library.id.label("library_id"), models.Library.name.label("library_name"),
+            selection.c.pool_id.label("pool_id"), models.Pool.name.label("pool"),
+            selection.c.lane_id.label("lane_id"), models.Lane.number.label("lane"),
+            models.LibraryIndex.sequence_i7.label("sequence_i7"), models.LibraryIndex.sequence_i5.label("sequence_i5"),
+            models.LibraryIndex.name_i7.label("name_i7"), models.LibraryIndex.name_i5.label("name_i5"),
+            models.LibraryIndex.index_kit_i7_id.label("kit_i7_id"), models.LibraryIndex.index_kit_i5_id.label("kit_i5_id"),
+            models.LibraryIndex._orientation.label("orientation_id"),
+            sa.case(
+                (models.LibraryIndex.sequence_i5.is_(None), categories.IndexType.SINGLE_INDEX_I7.id),
+                else_=categories.IndexType.DUAL_INDEX.id
+            ).label("index_type_id"),
+        ).select_from(
+            selection
+        ).join(
+            models.Library,
+            models.Library.id == selection.c.library_id
+        ).join(
+            models.LibraryIndex,
+            models.LibraryIndex.library_id == models.Library.id
+        ).join(
+            models.Pool,
+            models.Pool.id == selection.c.pool_id,
+            isouter=True
+        ).join(
+            models.Lane,
+            models.Lane.id == selection.c.lane_id,
+            isouter=True
+        ).order_by(
+            models.Lane.number.nulls_first(), selection.c.pool_id, models.Library.id, models.LibraryIndex.id
+        )
+
+        df = pd.read_sql(query, self.db._engine)
+
+        return df[columns]
+
     @DBBlueprint.transaction
     def get_experiment_pools(self, experiment_id: int) -> pd.DataFrame:
         query = sa.select(
@@ -271,6 +375,69 @@ class PandasBP(DBBlueprint):
 
         return df
 
+    @DBBlueprint.transaction
+    def get_lane_pooling_table(
+        self, experiment_id: int, per_lane: bool = True,
+        target_molarity: float = 3.0, total_volume: float = 50.0,
+    ) -> pd.DataFrame:
+        """Laned pools of the experiment with their dilutions, loaded in one query, and the pooling calculation.
+        One row per (lane, pool) or, if not `per_lane`, per pool. The latest dilution is preselected (`dilution`,
+        `qubit_concentration`), `dilutions` lists (identifier, qubit, molarity, timestamp) starting with the original pool."""
+        query = sa.select(
+            models.Lane.id.label("lane_id"), models.Lane.number.label("lane"),
+            models.Pool.id.label("pool_id"), models.Pool.name.label("pool_name"),
+            models.Pool.num_m_reads_requested, models.Pool.qubit_concentration.label("original_qubit_concentration"),
+            models.Pool.avg_fragment_size, models.links.LanePoolLink.num_m_reads,
+            models.PoolDilution.identifier.label("dilution_identifier"),
+            models.PoolDilution.qubit_concentration.label("dilution_qubit_concentration"),
+            models.PoolDilution.timestamp_utc.label("dilution_timestamp_utc"),
+        ).where(
+            models.Lane.experiment_id == experiment_id
+        ).join(
+            models.links.LanePoolLink,
+            models.links.LanePoolLink.lane_id == models.Lane.id
+        ).join(
+            models.Pool,
+            models.Pool.id == models.links.LanePoolLink.pool_id
+        ).join(
+            models.PoolDilution,
+            models.PoolDilution.pool_id == models.Pool.id,
+            isouter=True
+        ).order_by(models.Lane.number, models.Pool.id, models.PoolDilution.timestamp_utc)
+
+        df = pd.read_sql(query, self.db._engine)
+
+        dilutions = df.dropna(subset=["dilution_identifier"]).drop_duplicates(["pool_id", "dilution_identifier"])
+        dilutions = dilutions.assign(
+            molarity=pooling.molarity(dilutions["dilution_qubit_concentration"], dilutions["avg_fragment_size"]),
+            timestamp_str=pd.to_datetime(dilutions["dilution_timestamp_utc"], utc=True).dt.strftime("%Y-%m-%d %H:%M"),
+        )
+        dilutions["entry"] = list(zip(
+            dilutions["dilution_identifier"], dilutions["dilution_qubit_concentration"],
+            dilutions["molarity"], dilutions["timestamp_str"]
+        ))
+        pool_dilutions = dilutions.groupby("pool_id")["entry"].agg(list)
+        latest = dilutions.groupby("pool_id")[["dilution_identifier", "dilution_qubit_concentration"]].last()
+
+        df = df.drop(
+            columns=["dilution_identifier", "dilution_qubit_concentration", "dilution_timestamp_utc"]
+        ).drop_duplicates(["lane_id", "pool_id"])
+        if not per_lane:
+            df = df.drop(columns=["lane_id", "lane"]).drop_duplicates(["pool_id"])
+        df = df.reset_index(drop=True)
+
+        df["dilution"] = df["pool_id"].map(latest["dilution_identifier"]).fillna("Orig.")
+        df["qubit_concentration"] = df["pool_id"].map(latest["dilution_qubit_concentration"]).fillna(df["original_qubit_concentration"])
+        original_molarity = pooling.molarity(df["original_qubit_concentration"], df["avg_fragment_size"])
+        df["dilutions"] = [
+            [("Orig.", qubit, molarity, "")] + pool_dilutions.get(pool_id, [])
+            for pool_id, qubit, molarity in zip(df["pool_id"], df["original_qubit_concentration"], original_molarity)
+        ]
+
+        df = pooling.pipetting_table(df, target_molarity=target_molarity, total_volume=total_volume, by="lane_id" if per_lane else None)
+        df["molarity_color"] = pooling.molarity_color(df["molarity"], models.Pool)
+        return df
+
     @DBBlueprint.transaction
     def get_pool_libraries(self, pool_id: int, per_index: bool = True) -> pd.DataFrame:
         columns = [
@@ -513,6 +680,62 @@ class PandasBP(DBBlueprint):
 
         return df
 
+    @DBBlueprint.transaction
+    def get_seq_run_metrics(
+        self, seq_run_ids: list[int] | None = None, metrics: list[str] | None = None,
+        instrument_names: list[str] | None = None, started_after: datetime | None = None, started_before: datetime | None = None,
+        lane: int | None = 0, read: int | None = 0, with_units: bool = True,
+    ) -> pd.DataFrame:
+        """Run × metric matrix, one row per run (and lane/read if `lane`/`read` is None, i.e. all breakdowns).
+        `lane`/`read` = 0 selects the run summary. With `with_units`, metric columns are `units.QuantityArray`s in base unit."""
+        query = sa.select(
+            models.SeqRun.id.label("seq_run_id"), models.SeqRun.experiment_name.label("experiment_name"),
+            models.SeqRun.instrument_name.label("instrument_name"),
+            models.SeqRunMetric.metric, models.SeqRunMetric.lane, models.SeqRunMetric.read,
+            models.SeqRunMetric.value, models.SeqRunMetric.unit,
+        ).join(
+            models.SeqRunMetric,
+            models.SeqRunMetric.seq_run_id == models.SeqRun.id
+        )
+
+        if seq_run_ids is not None:
+            query = query.where(models.SeqRun.id.in_(seq_run_ids))
+        if metrics is not None:
+            query = query.where(models.SeqRunMetric.metric.in_(metrics))
+        if instrument_names is not None:
+            query = query.where(models.SeqRun.instrument_name.in_(instrument_names))
+        if started_after is not None or started_before is not None:
+            started = models.SeqRun._timestamps["started"].astext.cast(sa.DateTime)
+            if started_after is not None:
+                query = query.where(started >= started_after)
+            if started_before is not None:
+                query = query.where(started < started_before)
+        if lane is not None:
+            query = query.where(models.SeqRunMetric.lane == lane)
+        if read is not None:
+            query = query.where(models.SeqRunMetric.read == read)
+
+        df = pd.read_sql(query, self.db._engine)
+
+        index = ["seq_run_id", "experiment_name", "instrument_name"]
+        if lane is None:
+            index.append("lane")
+        if read is None:
+            index.append("read")
+
+        if len(df) == 0:
+            return pd.DataFrame(columns=index)
+
+        metric_units = df.drop_duplicates("metric").set_index("metric")["unit"]
+        matrix = df.pivot(index=index, columns="metric", values="value").reset_index().sort_values(index, ignore_index=True)
+        matrix.columns.name = None
+
+        if with_units:
+            for metric, unit in metric_units.items():
+                matrix[metric] = units.QuantityArray(matrix[metric].to_numpy(), units.Unit.get(unit))
+
+        return matrix
+
     @DBBlueprint.transaction
     def get_index_kit_barcodes(self, index_kit_id: int, per_adapter: bool = False, per_index: bool = False) -> pd.DataFrame:
         if per_index and per_adapter:
@@ -526,7 +749,8 @@ class PandasBP(DBBlueprint):
             models.Barcode.index_kit_id == index_kit_id
         )
 
-        df = pd.read_sql(query, self.db._engine)
+        # through the session, so that barcodes written in the current transaction are included
+        df = pd.read_sql(query, self.db.session.connection())
         df["name"] = df["name"].astype(str)
         df["well"] = df["well"].astype(str)
         df["type"] = df["type_id"].map(categories.BarcodeType.get)  # type: ignore
@@ -9,6 +9,8 @@ from .. import exceptions
 
 
 class PlateBP(DBBlueprint):
+    model = models.Plate
+
     @DBBlueprint.transaction
     def create(
         self, name: str, num_cols: int, num_rows: int, owner_id: int, flush: bool = True
@@ -4,6 +4,7 @@ from typing import Optional, Sequence, Callable
 
 import sqlalchemy as sa
 from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy import orm
 from sqlalchemy.orm import Query
     
 from ...categories import PoolStatus, PoolStatusEnum, PoolTypeEnum, AccessType, AccessTypeEnum
@@ -13,6 +14,8 @@ from ..DBBlueprint import DBBlueprint
 
 
 class PoolBP(DBBlueprint):
+    model = models.Pool
+
     @classmethod
     def where(
         cls,
@@ -283,9 +286,7 @@ class PoolBP(DBBlueprint):
                 models.Pool.status_id.in_([s.id for s in status_in])
             )
 
-        query = query.order_by(
-            sa.func.similarity(models.Pool.name, name).desc()
-        )
+        query = PoolBP.fuzzy_search(query, name, models.Pool.name)
 
         if limit is not None:
             query = query.limit(limit)
@@ -360,39 +361,83 @@ class PoolBP(DBBlueprint):
             return AccessType.INSIDER
         if pool.owner_id == user.id:
             return AccessType.OWNER
+        return self.get_access_types([pool.id], user)[pool.id]
 
-        if pool.seq_request is not None:
-            has_access: bool = self.db.session.query(
-                sa.exists().where(
-                    (models.links.UserAffiliation.user_id == user.id) &
-                    (models.links.UserAffiliation.group_id == pool.seq_request.group_id)
-                )
-            ).scalar()
-            if has_access:
-                return AccessType.EDIT
-
-        return AccessType.NONE
+    @DBBlueprint.transaction
+    def get_access_types(self, pool_ids: Sequence[int], user: models.User) -> dict[int, AccessTypeEnum]:
+        """Access type of `user` per pool id, resolved with a single query and memoized for the session."""
+        return self._resolve_access_types(
+            pool_ids, user, owner_id=models.Pool.owner_id,
+            affiliated=sa.exists().where(
+                (models.links.UserAffiliation.user_id == user.id) &
+                (models.SeqRequest.id == models.Pool.seq_request_id) &
+                (models.links.UserAffiliation.group_id == models.SeqRequest.group_id)
+            )
+        )
 
     @DBBlueprint.transaction
     def clone(self, pool_id: int, status: PoolStatusEnum, seq_request_id: int | None = None) -> models.Pool:
-
-        if (pool := self.db.session.get(models.Pool, pool_id)) is None:
+        if (cloned_pool_id := self.clone_many([pool_id], status=status, seq_request_id=seq_request_id).get(pool_id)) is None:
             raise exceptions.ElementDoesNotExist(f"Pool with id {pool_id} does not exist")
 
-        cloned_pool = self.create(
-            name=pool.name,
-            owner_id=pool.owner_id,
-            seq_request_id=seq_request_id,
-            num_m_reads_requested=pool.num_m_reads_requested,
-            lab_prep_id=pool.lab_prep_id,
-            contact_email=pool.contact.email if pool.contact.email is not None else "unknown",
-            contact_name=pool.contact.name,
-            contact_phone=pool.contact.phone,
-            pool_type=pool.type,
-            original_pool_id=pool.original_pool_id if pool.original_pool_id is not None else pool.id,
-            status=status,
-        )
-        return cloned_pool
+        return self.db.session.get(models.Pool, cloned_pool_id)  # type: ignore[return-value]
+
+    @DBBlueprint.transaction
+    def clone_many(
+        self, pool_ids: Sequence[int] | sa.Select, status: PoolStatusEnum, seq_request_id: int | None = None
+    ) -> dict[int, int]:
+        """Clones the pools (without libraries) and a copy of their contacts with one `INSERT ... SELECT` each.
+        Returns original -> cloned pool ids."""
+        if seq_request_id is not None:
+            if self.db.session.get(models.SeqRequest, seq_request_id) is None:
+                raise exceptions.ElementDoesNotExist(f"SeqRequest with id {seq_request_id} does not exist")
+
+        rows = self.db.session.execute(
+            sa.select(
+                models.Pool.id, DBBlueprint.next_ids(models.Pool), DBBlueprint.next_ids(models.Contact)
+            ).where(models.Pool.id.in_(pool_ids))
+        ).tuples().all()
+
+        if len(rows) == 0:
+            return {}
+
+        mapping = DBBlueprint.id_mapping(rows, "old_id", "new_id", "contact_id")
+
+        self.db.session.execute(sa.insert(models.Contact).from_select(
+            ["id", "name", "email", "phone"],
+            sa.select(
+                mapping.c.contact_id, models.Contact.name,
+                sa.func.coalesce(models.Contact.email, "unknown"), models.Contact.phone,
+            ).select_from(models.Pool).join(
+                mapping, mapping.c.old_id == models.Pool.id
+            ).join(
+                models.Contact, models.Contact.id == models.Pool.contact_id
+            )
+        ))
+
+        # clones of the same original are numbered consecutively, after the existing ones
+        original_pool_id = sa.func.coalesce(models.Pool.original_pool_id, models.Pool.id)
+        clones = orm.aliased(models.Pool)
+        clone_number = sa.select(sa.func.count()).where(
+            clones.original_pool_id == original_pool_id
+        ).scalar_subquery() + sa.func.row_number().over(partition_by=original_pool_id, order_by=models.Pool.id)
+
+        self.db.session.execute(sa.insert(models.Pool).from_select(
+            [
+                "id", "name", "owner_id", "type_id", "seq_request_id", "num_m_reads_requested", "contact_id",
+                "lab_prep_id", "status_id", "timestamp_stored_utc", "clone_number", "original_pool_id",
+            ],
+            sa.select(
+                mapping.c.new_id, models.Pool.name, models.Pool.owner_id, models.Pool.type_id,
+                sa.literal(seq_request_id, sa.Integer), models.Pool.num_m_reads_requested, mapping.c.contact_id,
+                models.Pool.lab_prep_id, sa.literal(status.id),
+                sa.func.now() if status == PoolStatus.STORED else sa.null(),
+                clone_number, original_pool_id,
+            ).select_from(models.Pool).join(mapping, mapping.c.old_id == models.Pool.id)
+        ))
+
+        self.db.flush()
+        return {old_id: new_id for old_id, new_id, _ in rows}
 
     @DBBlueprint.transaction
     def merge(self, merged_pool_id: int, pool_ids: Sequence[int], flush: bool = True) -> models.Pool:
@@ -1,5 +1,5 @@
 import math
-from typing import Optional, Callable
+from typing import Optional, Callable, Sequence
 
 import sqlalchemy as sa
 from sqlalchemy.sql.base import ExecutableOption
@@ -12,6 +12,8 @@ from ..DBBlueprint import DBBlueprint
 
 
 class ProjectBP(DBBlueprint):
+    model = models.Project
+
     @classmethod
     def where(
         cls,
@@ -199,16 +201,11 @@ class ProjectBP(DBBlueprint):
         if identifier is None and title is None and identifier_title is None:
             raise ValueError("Either identifier or title must be provided")
         if identifier is not None:
-            query = query.order_by(sa.nulls_last(sa.func.similarity(models.Project.identifier, identifier).desc()))
+            query = ProjectBP.fuzzy_search(query, identifier, models.Project.identifier)
         elif title is not None:
-            query = query.order_by(sa.func.similarity(models.Project.title, title).desc())
+            query = ProjectBP.fuzzy_search(query, title, models.Project.title)
         elif identifier_title is not None:
-            query = query.order_by(
-                sa.nulls_last(sa.func.greatest(
-                    sa.func.similarity(models.Project.title, identifier_title),
-                    sa.func.similarity(models.Project.identifier, identifier_title)
-                ).desc())
-            )
+            query = ProjectBP.fuzzy_search(query, identifier_title, models.Project.title, models.Project.identifier)
         if limit is not None:
             query = query.limit(limit)
 
@@ -223,18 +220,18 @@ class ProjectBP(DBBlueprint):
             return AccessType.INSIDER
         if project.owner_id == user.id:
             return AccessType.OWNER
-        
-        has_access: bool = self.db.session.query(
-            sa.exists().where(
+        return self.get_access_types([project.id], user)[project.id]
+
+    @DBBlueprint.transaction
+    def get_access_types(self, project_ids: Sequence[int], user: models.User) -> dict[int, AccessTypeEnum]:
+        """Access type of `user` per project id, resolved with a single query and memoized for the session."""
+        return self._resolve_access_types(
+            project_ids, user, owner_id=models.Project.owner_id,
+            affiliated=sa.exists().where(
                 (models.links.UserAffiliation.user_id == user.id) &
-                (models.links.UserAffiliation.group_id == project.group_id)
+                (models.links.UserAffiliation.group_id == models.Project.group_id)
             )
-        ).scalar()
-
-        if has_access:
-            return AccessType.EDIT
-
-        return AccessType.NONE
+        )
 
     @DBBlueprint.transaction
     def __getitem__(self, id: int | str) -> models.Project:
@@ -1,8 +1,10 @@
 import math
-from typing import Optional, Callable
+from typing import Optional, Callable, Sequence
 
+import pandas as pd
 import sqlalchemy as sa
 from sqlalchemy.orm import Query
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY
 from sqlalchemy.sql.base import ExecutableOption
 
 from ... import models, PAGE_LIMIT
@@ -12,6 +14,8 @@ from ..DBBlueprint import DBBlueprint
 
 
 class SampleBP(DBBlueprint):
+    model = models.Sample
+
     @classmethod
     def where(
         cls,
@@ -204,9 +208,7 @@ class SampleBP(DBBlueprint):
             pool_id=pool_id, seq_request_id=seq_request_id, status=status, status_in=status_in
         )
 
-        query = query.order_by(
-            sa.func.similarity(models.Sample.name, word).desc()
-        )
+        query = SampleBP.fuzzy_search(query, word, models.Sample.name)
 
         if limit is not None:
             query = query.limit(limit)
@@ -261,29 +263,90 @@ class SampleBP(DBBlueprint):
         self.db.session.add(sample)
         return sample
 
+    @DBBlueprint.transaction
+    def set_attributes(self, attributes: pd.DataFrame) -> int:
+        """Applies attribute changes given as rows of `sample_id`, `name`, `type` (AttributeTypeEnum) and `value`,
+        a missing `value` deletes the attribute. Names of predefined types are replaced by their label, custom names
+        are normalized like in `set_attribute`. All samples are patched with one `UPDATE ... FROM (VALUES ...)`:
+        deleted keys are removed with `-` and new values merged with `||`. Returns the number of updated samples."""
+        if len(attributes) == 0:
+            return 0
+
+        df = attributes[["sample_id", "name", "type", "value"]].copy()
+        df["sample_id"] = df["sample_id"].astype(int)
+
+        if (invalid := ~df["type"].map(lambda t: isinstance(t, AttributeTypeEnum))).any():
+            raise TypeError(f"Invalid attribute types: {df.loc[invalid, 'type'].unique().tolist()}")
+
+        custom = df["type"] == AttributeType.CUSTOM
+        if df.loc[custom, "name"].isna().any():
+            raise ValueError("Attribute type is custom, name must be provided.")
+
+        df["type_id"] = df["type"].map(lambda t: t.id)
+        df["name"] = df["name"].where(~custom, df["name"].astype("string").str.lower().str.strip().str.replace(" ", "_"))
+        df.loc[~custom, "name"] = df.loc[~custom, "type"].map(lambda t: t.label)
+        if (too_long := df["name"].str.len() > models.SampleAttribute.MAX_NAME_LENGTH).any():
+            raise ValueError(f"Attribute names longer than {models.SampleAttribute.MAX_NAME_LENGTH} characters: {df.loc[too_long, 'name'].unique().tolist()}")
+
+        sample_ids = df["sample_id"].unique().tolist()
+        found = set(self.db.session.execute(sa.select(models.Sample.id).where(models.Sample.id.in_(sample_ids))).scalars())
+        if len(missing := [sample_id for sample_id in sample_ids if sample_id not in found]) > 0:
+            raise exceptions.ElementDoesNotExist(f"Samples with ids {missing} not found.")
+
+        df = df.drop_duplicates(["sample_id", "name"], keep="last")
+        df["value"] = df["value"].astype(object)  # numpy scalars are not JSON serializable
+        deleted = df["value"].isna()
+
+        patches = {
+            sample_id: {row.name: {"type_id": int(row.type_id), "value": row.value} for row in _df.itertuples()}
+            for sample_id, _df in df[~deleted].groupby("sample_id")
+        }
+        deletions = df[deleted].groupby("sample_id")["name"].agg(list).to_dict()
+
+        changes = sa.values(
+            sa.column("sample_id", sa.Integer), sa.column("patch", JSONB), sa.column("deletions", ARRAY(sa.Text)),
+            name="changes"
+        ).data([
+            (int(sample_id), patches.get(sample_id, {}), deletions.get(sample_id, []))
+            for sample_id in df["sample_id"].unique()
+        ])
+
+        # pending ORM changes would be expired by the synchronization below
+        self.db.flush()
+
+        attributes_column = sa.func.coalesce(models.Sample._attributes, sa.cast(sa.literal("{}"), JSONB))
+        result = self.db.session.execute(
+            sa.update(models.Sample).where(
+                models.Sample.id == changes.c.sample_id
+            ).values(
+                _attributes=attributes_column.op("-", return_type=JSONB)(changes.c.deletions).op("||", return_type=JSONB)(changes.c.patch)
+            ).execution_options(synchronize_session="fetch")
+        )
+        return result.rowcount
+
     @DBBlueprint.transaction
     def get_access_type(self, sample: models.Sample, user: models.User) -> AccessTypeEnum:
         if user.is_admin():
             return AccessType.ADMIN
         if user.is_insider():
             return AccessType.INSIDER
-        if user == sample.owner:
+        if sample.owner_id == user.id:
             return AccessType.OWNER
-        
-        affiliation_exists: bool = self.db.session.query(
-            sa.exists().where(
+        return self.get_access_types([sample.id], user)[sample.id]
+
+    @DBBlueprint.transaction
+    def get_access_types(self, sample_ids: Sequence[int], user: models.User) -> dict[int, AccessTypeEnum]:
+        """Access type of `user` per sample id, resolved with a single query and memoized for the session."""
+        return self._resolve_access_types(
+            sample_ids, user, owner_id=models.Sample.owner_id,
+            affiliated=sa.exists().where(
                 (models.links.UserAffiliation.user_id == user.id) &
                 (models.SeqRequest.group_id == models.links.UserAffiliation.group_id) &
                 (models.Library.seq_request_id == models.SeqRequest.id) &
-                (models.links.SampleLibraryLink.sample_id == sample.id) &
+                (models.links.SampleLibraryLink.sample_id == models.Sample.id) &
                 (models.links.SampleLibraryLink.library_id == models.Library.id)
             )
-        ).scalar()
-
-        if affiliation_exists:
-            return AccessType.EDIT
-
-        return AccessType.NONE
+        )
 
     @DBBlueprint.transaction
     def is_in_seq_request(
@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+
+import sqlalchemy as sa
+
+from ... import models
+from ...models.Base import Base
+from ..DBBlueprint import DBBlueprint
+from .LibraryBP import LibraryBP
+from .PoolBP import PoolBP
+from .SampleBP import SampleBP
+from .ProjectBP import ProjectBP
+from .SeqRequestBP import SeqRequestBP
+
+
+@dataclass
+class SearchResult:
+    type: str
+    id: int
+    name: str
+    similarity: float
+
+
+class SearchBP(DBBlueprint):
+    # type -> (model, name column, searched columns), in the order of the results
+    TYPES: dict[str, tuple[type[Base], sa.ColumnElement[str], list[sa.ColumnElement[str]]]] = {
+        "project": (models.Project, models.Project.title, [models.Project.identifier, models.Project.title]),
+        "seq_request": (models.SeqRequest, models.SeqRequest.name, [models.SeqRequest.name]),
+        "sample": (models.Sample, models.Sample.name, [models.Sample.name]),
+        "library": (models.Library, models.Library.name, [models.Library.name]),
+        "pool": (models.Pool, models.Pool.name, [models.Pool.name]),
+        "experiment": (models.Experiment, models.Experiment.name, [models.Experiment.name]),
+        "seq_run": (models.SeqRun, models.SeqRun.experiment_name, [models.SeqRun.experiment_name]),
+        "user": (models.User, models.User.full_name, [models.User.full_name, models.User.email]),
+    }
+    INSIDER_TYPES = ("experiment", "seq_run", "user")
+
+    @staticmethod
+    def _visible(type: str, query: sa.Select, user: models.User) -> sa.Select:
+        if user.is_insider():
+            return query
+        match type:
+            case "project":
+                return ProjectBP.where(query, user_id=user.id)  # type: ignore[arg-type, return-value]
+            case "seq_request":
+                return SeqRequestBP.where(query, user_id=user.id)  # type: ignore[arg-type, return-value]
+            case "sample":
+                return SampleBP.where(query, user_id=user.id)  # type: ignore[arg-type, return-value]
+            case "library":
+                return LibraryBP.where(query, user_id=user.id)  # type: ignore[arg-type, return-value]
+            case "pool":
+                return PoolBP.where(query, user_id=user.id)  # type: ignore[arg-type, return-value]
+        raise ValueError(f"Unknown search type '{type}'")
+
+    @DBBlueprint.transaction
+    def query(
+        self, word: str, user: models.User, limit_per_type: int = 5,
+        types: list[str] | None = None,
+    ) -> dict[str, list[SearchResult]]:
+        """Searches all entity `types` visible to `user` in one statement, a `UNION ALL` of one index-backed
+        `fuzzy_search` per type with at most `limit_per_type` results each, best matches first."""
+        if not (word := word.strip()):
+            return {}
+
+        if types is None:
+            types = list(SearchBP.TYPES.keys())
+        if not user.is_insider():
+            types = [t for t in types if t not in SearchBP.INSIDER_TYPES]
+
+        selects = []
+        for position, type in enumerate(types):
+            model, name, columns = SearchBP.TYPES[type]
+            query = sa.select(
+                sa.literal(position).label("position"),
+                sa.literal(type).label("type"),
+                sa.inspect(model).primary_key[0].label("id"),
+                name.label("name"),
+                SearchBP.word_similarity(word, *columns).label("similarity"),
+            )
+            query = SearchBP._visible(type, query, user)
+            selects.append(SearchBP.fuzzy_search(query, word, *columns).limit(limit_per_type))
+
+        if not selects:
+            return {}
+
+        union = sa.union_all(*selects).subquery()
+        rows = self.db.session.execute(
+            sa.select(union.c.type, union.c.id, union.c.name, union.c.similarity)
+            .order_by(union.c.position, union.c.similarity.desc())
+        ).all()
+
+        results: dict[str, list[SearchResult]] = {type: [] for type in types}
+        for type, id, name, similarity in rows:
+            results[type].append(SearchResult(type=type, id=id, name=name, similarity=similarity))
+        return results
@@ -1,6 +1,6 @@
 import math
 from datetime import datetime
-from typing import Optional, Literal, Callable
+from typing import Optional, Literal, Callable, Sequence
 
 import sqlalchemy as sa
 from sqlalchemy.orm import Query
@@ -20,6 +20,8 @@ from ..DBBlueprint import DBBlueprint
 
 
 class SeqRequestBP(DBBlueprint):
+    model = models.SeqRequest
+
     @classmethod
     def where(
         cls,
@@ -283,25 +285,19 @@ class SeqRequestBP(DBBlueprint):
         query = SeqRequestBP.where(query, status_in=status_in, show_drafts=show_drafts, user_id=user_id, group_id=group_id, status=status)
 
         if name is not None:
-            query = query.order_by(
-                sa.func.similarity(models.SeqRequest.name, name).desc()
-            )
+            query = SeqRequestBP.fuzzy_search(query, name, models.SeqRequest.name)
         elif requestor is not None:
             query = query.join(
                 models.User,
                 models.User.id == models.SeqRequest.requestor_id
             )
-            query = query.order_by(
-                sa.func.similarity(models.User.first_name + ' ' + models.User.last_name, requestor).desc()
-            )
+            query = SeqRequestBP.fuzzy_search(query, requestor, models.User.full_name)
         elif group is not None:
             query = query.join(
                 models.Group,
                 models.Group.id == models.SeqRequest.group_id
             )
-            query = query.order_by(
-                sa.func.similarity(models.Group.name, group).desc()
-            )
+            query = SeqRequestBP.fuzzy_search(query, group, models.Group.name)
         else:
             raise ValueError("Either 'name', 'requestor', or 'group' must be provided.")
 
@@ -346,63 +342,72 @@ class SeqRequestBP(DBBlueprint):
         return seq_request
 
     @DBBlueprint.transaction
-    def process(self, seq_request_id: int, status: SeqRequestStatusEnum) -> models.SeqRequest:
+    def process(self, seq_request_id: int, status: SeqRequestStatusEnum) -> tuple[models.SeqRequest, dict[str, int]]:
+        """Accepts, rejects or resets the request and moves its samples, libraries, pools and projects along with
+        one UPDATE per table. Returns the request and the number of updated rows per table."""
         if (seq_request := self.db.session.get(models.SeqRequest, seq_request_id)) is None:
             raise exceptions.ElementDoesNotExist(f"SeqRequest with id '{seq_request_id}', not found.")
 
-        seq_request.status = status
-
-        if seq_request.status in [SeqRequestStatus.DRAFT, SeqRequestStatus.REJECTED]:
-            seq_request.timestamp_submitted_utc = None
-            if seq_request.sample_submission_event_id is not None:
-                self.db.session.delete(seq_request.sample_submission_event)
-                seq_request.sample_submission_event = None
-        
         if status == SeqRequestStatus.ACCEPTED:
-            library_status = LibraryStatus.ACCEPTED
+            # pooled libraries skip ahead
+            library_status = sa.case(
+                (models.Library.pool_id.is_not(None), LibraryStatus.POOLED.id),
+                else_=LibraryStatus.ACCEPTED.id
+            )
             pool_status = PoolStatus.ACCEPTED
+            sample_status = SampleStatus.WAITING_DELIVERY
         elif status == SeqRequestStatus.DRAFT:
-            library_status = LibraryStatus.DRAFT
+            library_status = LibraryStatus.DRAFT.id
             pool_status = PoolStatus.DRAFT
+            sample_status = SampleStatus.DRAFT
         elif status == SeqRequestStatus.REJECTED:
-            library_status = LibraryStatus.REJECTED
+            library_status = LibraryStatus.REJECTED.id
             pool_status = PoolStatus.REJECTED
+            sample_status = SampleStatus.REJECTED
         else:
             raise TypeError(f"Cannot process request to '{status}'.")
 
-        for sample in seq_request.samples:
-            if sample.status is None:
-                continue  # Sample was not prepared in-house -> no specimen stored
-            if status == SeqRequestStatus.ACCEPTED:
-                sample.status = SampleStatus.WAITING_DELIVERY
-            elif status == SeqRequestStatus.DRAFT:
-                sample.status = SampleStatus.DRAFT
-            elif status == SeqRequestStatus.REJECTED:
-                sample.status = SampleStatus.REJECTED
-        
-        is_prepared = status == SeqRequestStatus.ACCEPTED
-        for library in seq_request.libraries:
-            library.status = library_status
-            if library_status != LibraryStatus.ACCEPTED:
-                continue
-            
-            if library.pool_id is not None:
-                library.status = LibraryStatus.POOLED
-
-            is_prepared = is_prepared and library.status.id >= LibraryStatus.POOLED.id
-        
-        if status == SeqRequestStatus.ACCEPTED:
-            seq_request.status = SeqRequestStatus.ACCEPTED
+        seq_request.status = status
 
-        for pool in seq_request.pools:
-            pool.status = pool_status
+        if seq_request.status in [SeqRequestStatus.DRAFT, SeqRequestStatus.REJECTED]:
+            seq_request.timestamp_submitted_utc = None
+            if seq_request.sample_submission_event_id is not None:
+                self.db.session.delete(seq_request.sample_submission_event)
+                seq_request.sample_submission_event = None
 
-        for project in self.db.projects.find(seq_request_id=seq_request_id)[0]:
-            project.status = ProjectStatus.PROCESSING
-            self.db.session.add(project)
+        library_ids = sa.select(models.Library.id).where(models.Library.seq_request_id == seq_request_id)
+        sample_ids = sa.select(models.links.SampleLibraryLink.sample_id).where(
+            models.links.SampleLibraryLink.library_id.in_(library_ids)
+        )
+        project_ids = sa.select(models.Sample.project_id).where(models.Sample.id.in_(sample_ids))
+
+        counts = dict(
+            samples=self.db.session.execute(
+                sa.update(models.Sample).where(
+                    models.Sample.id.in_(sample_ids),
+                    models.Sample.status_id.is_not(None),  # Sample was not prepared in-house -> no specimen stored
+                ).values(status_id=sample_status.id).execution_options(synchronize_session="fetch")
+            ).rowcount,
+            libraries=self.db.session.execute(
+                sa.update(models.Library).where(
+                    models.Library.seq_request_id == seq_request_id
+                ).values(status_id=library_status).execution_options(synchronize_session="fetch")
+            ).rowcount,
+            pools=self.db.session.execute(
+                sa.update(models.Pool).where(
+                    models.Pool.seq_request_id == seq_request_id
+                ).values(status_id=pool_status.id).execution_options(synchronize_session="fetch")
+            ).rowcount,
+            projects=self.db.session.execute(
+                sa.update(models.Project).where(
+                    models.Project.id.in_(project_ids)
+                ).values(status_id=ProjectStatus.PROCESSING.id).execution_options(synchronize_session="fetch")
+            ).rowcount,
+        )
 
         self.db.session.add(seq_request)
-        return seq_request
+        self.db.flush()
+        return seq_request, counts
 
     @DBBlueprint.transaction
     def get_access_type(self, seq_request: models.SeqRequest, user: models.User) -> AccessTypeEnum:
@@ -410,20 +415,20 @@ class SeqRequestBP(DBBlueprint):
             return AccessType.ADMIN
         if user.is_insider():
             return AccessType.INSIDER
-        if user == seq_request.requestor:
+        if seq_request.requestor_id == user.id:
             return AccessType.OWNER
+        return self.get_access_types([seq_request.id], user)[seq_request.id]
 
-        has_access: bool = self.db.session.query(
-            sa.exists().where(
+    @DBBlueprint.transaction
+    def get_access_types(self, seq_request_ids: Sequence[int], user: models.User) -> dict[int, AccessTypeEnum]:
+        """Access type of `user` per seq_request id, resolved with a single query and memoized for the session."""
+        return self._resolve_access_types(
+            seq_request_ids, user, owner_id=models.SeqRequest.requestor_id,
+            affiliated=sa.exists().where(
                 (models.links.UserAffiliation.user_id == user.id) &
-                (models.links.UserAffiliation.group_id == seq_request.group_id)
+                (models.links.UserAffiliation.group_id == models.SeqRequest.group_id)
             )
-        ).scalar()
-
-        if has_access:
-            return AccessType.EDIT
-
-        return AccessType.NONE
+        )
 
     @DBBlueprint.transaction
     def clone(self, seq_request_id: int, method: Literal["pooled", "indexed", "raw"]) -> models.SeqRequest:
@@ -458,21 +463,24 @@ class SeqRequestBP(DBBlueprint):
             billing_code=seq_request.billing_code,
         )
 
+        library_ids = sa.select(models.Library.id).where(models.Library.seq_request_id == seq_request_id)
+
         if method == "pooled":
-            pools: dict[int, models.Pool] = {}
-            for library in seq_request.libraries:
-                cloned_library = self.db.libraries.clone(library_id=library.id, seq_request_id=cloned_request.id, indexed=True, status=LibraryStatus.POOLED)
-                if library.pool_id is not None:
-                    if library.pool_id not in pools.keys():
-                        pools[library.pool_id] = self.db.pools.clone(library.pool_id, seq_request_id=cloned_request.id, status=PoolStatus.STORED)
-                    self.db.libraries.add_to_pool(library_id=cloned_library.id, pool_id=pools[library.pool_id].id)
+            pool_ids = self.db.pools.clone_many(
+                sa.select(models.Library.pool_id).where(
+                    models.Library.seq_request_id == seq_request_id,
+                    models.Library.pool_id.is_not(None)
+                ).distinct(),
+                seq_request_id=cloned_request.id, status=PoolStatus.STORED
+            )
+            self.db.libraries.clone_many(library_ids, seq_request_id=cloned_request.id, indexed=True, status=LibraryStatus.POOLED, pool_ids=pool_ids)
         elif method == "indexed":
-            for library in seq_request.libraries:
-                self.db.libraries.clone(library_id=library.id, seq_request_id=cloned_request.id, indexed=True, status=LibraryStatus.STORED)
+            self.db.libraries.clone_many(library_ids, seq_request_id=cloned_request.id, indexed=True, status=LibraryStatus.STORED)
         elif method == "raw":
-            for library in seq_request.libraries:
-                self.db.libraries.clone(library_id=library.id, seq_request_id=cloned_request.id, indexed=False, status=LibraryStatus.ACCEPTED)
+            self.db.libraries.clone_many(library_ids, seq_request_id=cloned_request.id, indexed=False, status=LibraryStatus.ACCEPTED)
 
+        # inserted without the ORM
+        self.db.session.expire(cloned_request, ["libraries", "pools", "samples"])
         self.db.session.add(cloned_request)
         return cloned_request
     
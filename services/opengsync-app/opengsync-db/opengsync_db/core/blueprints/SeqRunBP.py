@@ -1,8 +1,10 @@
 import math
 from typing import Optional, TYPE_CHECKING, Callable
 
+import pandas as pd
 import sqlalchemy as sa
 from sqlalchemy.orm import Query
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.sql.base import ExecutableOption
 
 if TYPE_CHECKING:
@@ -14,6 +16,8 @@ from ...categories import ReadTypeEnum, RunStatusEnum, ExperimentStatusEnum
 
 
 class SeqRunBP(DBBlueprint):
+    model = models.SeqRun
+
     @classmethod
     def where(
         cls,
@@ -143,12 +147,33 @@ class SeqRunBP(DBBlueprint):
     def update(self, seq_run: models.SeqRun):
         self.db.session.add(seq_run)
 
+    @DBBlueprint.transaction
+    def set_metrics(self, seq_run_id: int, metrics: pd.DataFrame, replace: bool = False) -> int:
+        """Upserts metrics from a DataFrame with columns `metric`, `lane`, `read`, `value` (base unit) and `unit`
+        in one statement. With `replace`, metrics of the run that are not in `metrics` are removed."""
+        if replace:
+            self.db.session.execute(sa.delete(models.SeqRunMetric).where(models.SeqRunMetric.seq_run_id == seq_run_id))
+
+        records = metrics.assign(seq_run_id=seq_run_id)[["seq_run_id", "metric", "lane", "read", "value", "unit"]].dropna(subset=["value"])
+        if len(records) > 0:
+            stmt = insert(models.SeqRunMetric).values(records.to_dict(orient="records"))
+            self.db.session.execute(stmt.on_conflict_do_update(
+                index_elements=["seq_run_id", "metric", "lane", "read"],
+                set_={"value": stmt.excluded.value, "unit": stmt.excluded.unit},
+            ))
+
+        # metrics were written without the ORM
+        if (seq_run := self.db.session.identity_map.get(self.db.session.identity_key(models.SeqRun, seq_run_id))) is not None:
+            self.db.session.expire(seq_run, ["metrics", "summary_metrics"])
+
+        # marks the session for commit, the statements above leave no dirty objects behind
+        self.db.flush()
+        return len(records)
+
     @DBBlueprint.transaction
     def query(self, word: str, limit: int | None = PAGE_LIMIT) -> list[models.SeqRun]:
         query = self.db.session.query(models.SeqRun)
-        query = query.order_by(
-            sa.func.similarity(models.SeqRun.experiment_name, word).desc()
-        )
+        query = SeqRunBP.fuzzy_search(query, word, models.SeqRun.experiment_name)
 
         if limit is not None:
             query = query.limit(limit)
@@ -10,6 +10,8 @@ from .. import exceptions
 
 
 class SequencerBP(DBBlueprint):
+    model = models.Sequencer
+
     @DBBlueprint.transaction
     def create(
         self, name: str,
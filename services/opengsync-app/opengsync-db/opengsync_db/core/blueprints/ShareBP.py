@@ -9,6 +9,8 @@ from .. import exceptions
 
 
 class ShareBP(DBBlueprint):
+    model = models.ShareToken
+
     @classmethod
     def where(
         cls,
@@ -0,0 +1,48 @@
+import math
+from typing import Optional
+
+import sqlalchemy as sa
+
+from ... import models, PAGE_LIMIT
+from ..DBBlueprint import DBBlueprint
+
+
+class SlowQueryBP(DBBlueprint):
+    model = models.SlowQuery
+
+    @DBBlueprint.transaction
+    def get(self, fingerprint: str) -> models.SlowQuery | None:
+        return self.db.session.get(models.SlowQuery, fingerprint)
+
+    @DBBlueprint.transaction
+    def find(
+        self, source: Optional[str] = None,
+        limit: int | None = PAGE_LIMIT, offset: int | None = None,
+        sort_by: Optional[str] = "total_ms", descending: bool = True,
+        count_pages: bool = False,
+    ) -> tuple[list[models.SlowQuery], int | None]:
+        query = self.db.session.query(models.SlowQuery)
+        if source is not None:
+            query = query.where(models.SlowQuery.last_source == source)
+
+        if sort_by is not None:
+            attr = getattr(models.SlowQuery, sort_by)
+            if descending:
+                attr = attr.desc()
+            query = query.order_by(attr)
+
+        n_pages = None if not count_pages else math.ceil(query.count() / limit) if limit is not None else None
+
+        slow_queries = query.limit(limit).offset(offset).all()
+        return slow_queries, n_pages
+
+    @DBBlueprint.transaction
+    def delete(self, fingerprint: str | None = None) -> int:
+        """Deletes the statistics of one fingerprint or, without `fingerprint`, all of them."""
+        stmt = sa.delete(models.SlowQuery)
+        if fingerprint is not None:
+            stmt = stmt.where(models.SlowQuery.fingerprint == fingerprint)
+        n = self.db.session.execute(stmt).rowcount  # type: ignore[attr-defined]
+        # marks the session for commit, the statement above leaves no dirty objects behind
+        self.db.flush()
+        return n
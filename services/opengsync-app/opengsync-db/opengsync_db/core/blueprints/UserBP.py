@@ -1,7 +1,6 @@
 import math
 from typing import Optional, Callable
 
-import sqlalchemy as sa
 from sqlalchemy.orm import Query
 from sqlalchemy.sql.base import ExecutableOption
 
@@ -15,6 +14,8 @@ from ...categories import UserRole, UserRoleEnum, AffiliationTypeEnum
 
 
 class UserBP(DBBlueprint):
+    model = models.User
+
     @classmethod
     def where(
         cls,
@@ -232,9 +233,7 @@ class UserBP(DBBlueprint):
                 models.User.role_id.in_([role.id for role in role_in])
             )
 
-        query = query.order_by(
-            sa.func.similarity(models.User.first_name + ' ' + models.User.last_name, word).desc()
-        )
+        query = UserBP.fuzzy_search(query, word, models.User.full_name)
 
         if limit is not None:
             query = query.limit(limit)
@@ -253,9 +252,7 @@ class UserBP(DBBlueprint):
                 models.User.role_id.in_([role.id for role in role_in])
             )
 
-        query = query.order_by(
-            sa.func.similarity(models.User.email, word).desc(),
-        )
+        query = UserBP.fuzzy_search(query, word, models.User.email)
 
         if limit is not None:
             query = query.limit(limit)
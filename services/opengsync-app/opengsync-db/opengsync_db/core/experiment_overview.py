@@ -0,0 +1,163 @@
+import sqlalchemy as sa
+
+from .status_events import MAX_IDS_PER_NOTIFY
+
+# NOTIFY channel of experiments whose overview became stale, payload: {"table": "experiment_overview", "ids": [<experiment id>, ...]}
+OVERVIEW_CHANNEL = "experiment_overview_stale"
+
+MARK_STALE_FUNCTION_DDL = f"""
+CREATE OR REPLACE FUNCTION mark_experiment_overviews_stale(experiment_ids integer[]) RETURNS void AS $$
+DECLARE
+    marked integer[];
+    chunk integer[];
+BEGIN
+    -- always marked and notified, so that a recomputation that read the data before this change is repeated
+    WITH upserted AS (
+        INSERT INTO experiment_overview (experiment_id, stale)
+        SELECT experiment.id, true FROM experiment WHERE experiment.id = ANY(experiment_ids)
+        ON CONFLICT (experiment_id) DO UPDATE SET stale = true
+        RETURNING experiment_id
+    )
+    SELECT array_agg(experiment_id ORDER BY experiment_id) INTO marked FROM upserted;
+
+    FOR chunk IN
+        SELECT array_agg(parts.id ORDER BY parts.id) FROM (
+            SELECT id, (row_number() OVER (ORDER BY id) - 1) / {MAX_IDS_PER_NOTIFY} AS part FROM unnest(marked) AS id
+        ) AS parts
+        GROUP BY parts.part
+    LOOP
+        PERFORM pg_notify('{OVERVIEW_CHANNEL}', json_build_object('table', 'experiment_overview', 'ids', chunk)::text);
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# lane and lane_pool_link rows reference their experiment directly
+ROWS_CHANGED_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION experiment_overview_rows_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM mark_experiment_overviews_stale(ARRAY(SELECT experiment_id FROM new_rows));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM mark_experiment_overviews_stale(ARRAY(SELECT experiment_id FROM old_rows));
+    ELSE
+        PERFORM mark_experiment_overviews_stale(ARRAY(
+            SELECT experiment_id FROM new_rows UNION SELECT experiment_id FROM old_rows
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# pools are updated often (e.g. statuses), only updates of the columns shown in the overview mark it stale
+POOLS_CHANGED_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION experiment_overview_pools_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM mark_experiment_overviews_stale(ARRAY(SELECT experiment_id FROM new_rows));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM mark_experiment_overviews_stale(ARRAY(SELECT experiment_id FROM old_rows));
+    ELSE
+        PERFORM mark_experiment_overviews_stale(ARRAY(
+            SELECT unnest(ARRAY[new_rows.experiment_id, old_rows.experiment_id])
+            FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+            WHERE (new_rows.experiment_id, new_rows.name, new_rows.num_m_reads_requested)
+                IS DISTINCT FROM (old_rows.experiment_id, old_rows.name, old_rows.num_m_reads_requested)
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# libraries belong to an experiment through their pool and are updated often (e.g. statuses),
+# only updates of the columns shown in the overview mark it stale
+LIBRARIES_CHANGED_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION experiment_overview_libraries_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM mark_experiment_overviews_stale(ARRAY(
+            SELECT pool.experiment_id FROM new_rows JOIN pool ON pool.id = new_rows.pool_id
+        ));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM mark_experiment_overviews_stale(ARRAY(
+            SELECT pool.experiment_id FROM old_rows JOIN pool ON pool.id = old_rows.pool_id
+        ));
+    ELSE
+        PERFORM mark_experiment_overviews_stale(ARRAY(
+            SELECT pool.experiment_id
+            FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+            JOIN pool ON pool.id IN (new_rows.pool_id, old_rows.pool_id)
+            WHERE (new_rows.pool_id, new_rows.type_id, new_rows.seq_request_id)
+                IS DISTINCT FROM (old_rows.pool_id, old_rows.type_id, old_rows.seq_request_id)
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# requests are shown by name through their libraries, which mark the overview stale when they are added or removed,
+# i.e. only renames of the request itself matter
+SEQ_REQUESTS_CHANGED_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION experiment_overview_seq_requests_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM mark_experiment_overviews_stale(ARRAY(
+        SELECT DISTINCT pool.experiment_id
+        FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+        JOIN library ON library.seq_request_id = new_rows.id
+        JOIN pool ON pool.id = library.pool_id
+        WHERE new_rows.name IS DISTINCT FROM old_rows.name
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# table -> trigger function
+OVERVIEW_TABLES = {
+    "lane": "experiment_overview_rows_changed",
+    "lane_pool_link": "experiment_overview_rows_changed",
+    "pool": "experiment_overview_pools_changed",
+    "library": "experiment_overview_libraries_changed",
+    "seq_request": "experiment_overview_seq_requests_changed",
+}
+
+_TRANSITION_TABLES = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+# table -> events with a trigger, all of them if not listed
+_OVERVIEW_TABLE_EVENTS = {
+    "seq_request": ("UPDATE",),
+}
+
+
+def overview_trigger_events(table: str) -> tuple[str, ...]:
+    return _OVERVIEW_TABLE_EVENTS.get(table, tuple(_TRANSITION_TABLES))
+
+
+def overview_trigger_ddl(table: str, event: str) -> str:
+    # transition tables are only allowed in triggers of a single event
+    return f"""
+    CREATE OR REPLACE TRIGGER {table}_overview_{event.lower()}
+    AFTER {event} ON {table}
+    REFERENCING {_TRANSITION_TABLES[event]}
+    FOR EACH STATEMENT EXECUTE FUNCTION {OVERVIEW_TABLES[table]}()
+    """
+
+
+def install_overview_triggers(connection: sa.Connection) -> None:
+    """Creates the triggers that mark the `experiment_overview` of experiments whose lanes, pools or libraries
+    changed, or whose requests were renamed, as stale and send their ids to `OVERVIEW_CHANNEL` when the transaction commits."""
+    connection.execute(sa.text(MARK_STALE_FUNCTION_DDL))
+    connection.execute(sa.text(ROWS_CHANGED_FUNCTION_DDL))
+    connection.execute(sa.text(POOLS_CHANGED_FUNCTION_DDL))
+    connection.execute(sa.text(LIBRARIES_CHANGED_FUNCTION_DDL))
+    connection.execute(sa.text(SEQ_REQUESTS_CHANGED_FUNCTION_DDL))
+    for table in OVERVIEW_TABLES:
+        for event in overview_trigger_events(table):
+            connection.execute(sa.text(overview_trigger_ddl(table, event)))
@@ -21,4 +21,40 @@ from .. import models
 #                 .subquery()
 #             )
 #             # Delete orphan samples
-#             session.query(models.Sample).filter(models.Sample.id.in_(orphan_sample_ids_subq)).delete(synchronize_session=False)
\ No newline at end of file
+#             session.query(models.Sample).filter(models.Sample.id.in_(orphan_sample_ids_subq)).delete(synchronize_session=False)
+
+def _adjust_blob_ref_count(connection: sa.Connection, blob_id: int, delta: int) -> None:
+    blob = models.MediaBlob.__table__
+    ref_count = blob.c.ref_count + delta
+    connection.execute(
+        blob.update().where(blob.c.id == blob_id).values(
+            ref_count=ref_count,
+            unreferenced_utc=sa.case((ref_count <= 0, sa.func.now()), else_=None),
+        )
+    )
+
+
+# MediaBlob.ref_count is maintained here so that cascaded deletes (e.g. of a SeqRequest) release their blobs too.
+@event.listens_for(models.MediaFile, "after_insert")
+def media_file_acquire_blob(mapper, connection, target: models.MediaFile):
+    if target.blob_id is not None:
+        _adjust_blob_ref_count(connection, target.blob_id, +1)
+
+
+@event.listens_for(models.MediaFile, "after_delete")
+def media_file_release_blob(mapper, connection, target: models.MediaFile):
+    if target.blob_id is not None:
+        _adjust_blob_ref_count(connection, target.blob_id, -1)
+
+
+@event.listens_for(models.MediaFile, "after_update")
+def media_file_replace_blob(mapper, connection, target: models.MediaFile):
+    history = sa.inspect(target).attrs.blob_id.history
+    if not history.has_changes():
+        return
+    for blob_id in history.deleted:
+        if blob_id is not None:
+            _adjust_blob_ref_count(connection, blob_id, -1)
+    for blob_id in history.added:
+        if blob_id is not None:
+            _adjust_blob_ref_count(connection, blob_id, +1)
@@ -0,0 +1,56 @@
+from typing import Any, TypeVar
+
+import numpy as np
+import pandas as pd
+
+T = TypeVar("T", float, np.ndarray, pd.Series)
+
+
+def molarity(qubit_concentration: T, avg_fragment_size: Any) -> T:
+    """Molarity [nM] of dsDNA from its concentration [ng/µL] and average fragment size [bp].
+    https://knowledge.illumina.com/library-preparation/dna-library-prep/library-preparation-dna-library-prep-reference_material-list/000001240"""
+    return qubit_concentration / (avg_fragment_size * 660) * 1_000_000
+
+
+def molarity_color(molarity: pd.Series | np.ndarray, thresholds: Any) -> np.ndarray:
+    """Color class per molarity, `thresholds` is a model with `warning_min_molarity`, `warning_max_molarity`,
+    `error_min_molarity` and `error_max_molarity` (e.g. `models.Pool`, `models.Lane`)."""
+    m = np.asarray(molarity, dtype=np.float64)
+    return np.select(
+        [
+            (m < thresholds.error_min_molarity) | (thresholds.error_max_molarity < m),
+            (m < thresholds.warning_min_molarity) | (thresholds.warning_max_molarity < m),
+        ],
+        ["cemm-red", "cemm-yellow"],
+        default="cemm-green",
+    )
+
+
+def shares(num_m_reads: pd.Series, by: pd.Series | list[pd.Series] | None = None) -> pd.Series:
+    """Fraction of the reads within each group of `by` (or of all reads)."""
+    if by is None:
+        return num_m_reads / num_m_reads.sum()
+    return num_m_reads / num_m_reads.groupby(by).transform("sum")
+
+
+def pipet_volume(target_molarity: Any, molarity: T, share: Any, total_volume: Any) -> T:
+    """Volume [µL] of a pool that makes up `share` of a `total_volume` mix at `target_molarity`."""
+    return target_molarity / molarity * share * total_volume
+
+
+def library_volume(total_volume: Any, target_molarity: Any, molarity: T) -> T:
+    """Volume [µL] of library needed for `total_volume` at `target_molarity`, the rest is filled with EB."""
+    return total_volume * target_molarity / molarity
+
+
+def pipetting_table(
+    df: pd.DataFrame, target_molarity: float | pd.Series, total_volume: float | pd.Series,
+    by: str | list[str] | None = None,
+) -> pd.DataFrame:
+    """Adds `molarity`, `share` and `pipet` columns to a frame with `num_m_reads`, `qubit_concentration`
+    and `avg_fragment_size` columns. Shares are computed within the groups of `by` (e.g. `lane_id`)."""
+    df = df.copy()
+    df["molarity"] = molarity(df["qubit_concentration"].astype(float), df["avg_fragment_size"].astype(float))
+    df["share"] = shares(df["num_m_reads"].astype(float), [df[col] for col in ([by] if isinstance(by, str) else by)] if by else None)
+    df["pipet"] = pipet_volume(target_molarity, df["molarity"], df["share"], total_volume)
+    return df
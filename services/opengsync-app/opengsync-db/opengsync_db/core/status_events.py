@@ -0,0 +1,55 @@
+import json
+
+import sqlalchemy as sa
+
+# NOTIFY channel of status changes, payload: {"table": <table name>, "ids": [<id>, ...]}
+STATUS_CHANNEL = "status_changed"
+
+# tables whose status changes other statuses depend on (see scheduler.tasks.status_updater)
+STATUS_TABLES = ("seq_run", "experiment", "library", "project")
+
+# NOTIFY payloads are limited to 8000 bytes
+MAX_IDS_PER_NOTIFY = 500
+
+STATUS_FUNCTION_DDL = f"""
+CREATE OR REPLACE FUNCTION notify_status_changed() RETURNS trigger AS $$
+DECLARE
+    chunk integer[];
+BEGIN
+    FOR chunk IN
+        SELECT array_agg(changed.id ORDER BY changed.id) FROM (
+            SELECT new_rows.id, (row_number() OVER (ORDER BY new_rows.id) - 1) / {MAX_IDS_PER_NOTIFY} AS part
+            FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+            WHERE new_rows.status_id IS DISTINCT FROM old_rows.status_id
+        ) AS changed
+        GROUP BY changed.part
+    LOOP
+        PERFORM pg_notify('{STATUS_CHANNEL}', json_build_object('table', TG_TABLE_NAME, 'ids', chunk)::text);
+    END LOOP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def status_trigger_ddl(table: str) -> str:
+    # statement level with transition tables, so that set-based updates send one notification per 500 rows
+    return f"""
+    CREATE OR REPLACE TRIGGER {table}_status_changed
+    AFTER UPDATE ON {table}
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_status_changed()
+    """
+
+
+def install_status_triggers(connection: sa.Connection) -> None:
+    """Creates `notify_status_changed()` and its triggers, which send the ids of rows whose `status_id` changed
+    to `STATUS_CHANNEL` when the transaction commits."""
+    connection.execute(sa.text(STATUS_FUNCTION_DDL))
+    for table in STATUS_TABLES:
+        connection.execute(sa.text(status_trigger_ddl(table)))
+
+
+def parse_status_notification(payload: str) -> tuple[str, list[int]]:
+    data = json.loads(payload)
+    return data["table"], [int(_id) for _id in data["ids"]]
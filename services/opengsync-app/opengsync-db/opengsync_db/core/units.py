@@ -1,5 +1,10 @@
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
-from typing import ClassVar
+from typing import ClassVar, Any, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import ExtensionArray, ExtensionDtype, register_extension_dtype, take
 
 Number = int | float
 
@@ -10,6 +15,7 @@ class Dimension:
     symbol: str | None
 
     _order: list["Unit"] = field(default_factory=list)
+    _factors: list[float] = field(default_factory=list)
 
     _units: ClassVar[dict[str, "Unit"]] = dict()
     _registry: ClassVar[dict[str, "Dimension"]] = dict()
@@ -45,33 +51,46 @@ class Unit:
         dim._units[name] = self
         dim._order.append(self)
         dim._order.sort(key=lambda u: u.factor_to_base)
+        dim._factors[:] = [u.factor_to_base for u in dim._order]
+
+    # lets numpy/pandas defer `array * unit` to __rmul__ instead of multiplying element-wise
+    __array_ufunc__ = None
+    __pandas_priority__ = 5000
 
     @classmethod
     def all(cls, dimension: Dimension) -> list["Unit"]:
         return dimension._order
 
-    def __rmul__(self, value: Number) -> "Quantity":
-        return Quantity(float(value), self)
+    def __rmul__(self, value: "Number | Sequence[Number] | np.ndarray | pd.Series") -> "Quantity | QuantityArray | pd.Series":
+        if isinstance(value, pd.Series):
+            return pd.Series(QuantityArray(value.to_numpy(dtype=np.float64, na_value=np.nan), self), index=value.index, name=value.name)
+        if np.ndim(value) > 0:
+            return QuantityArray(value, self)
+        return Quantity(float(value), self)  # type: ignore[arg-type]
     
     def ensure_same_dimension(self, other: "Unit") -> None:
         if self.dimension != other.dimension:
             raise ValueError(f"Dimension mismatch: {self.dimension.name} vs {other.dimension.name}")
         
     def next(self) -> "Unit | None":
-        units = Unit.all(self.dimension)
-        idx = 0
-        for idx, unit in enumerate(units):
-            if unit.factor_to_base == self.factor_to_base:
-                break
-        return units[idx + 1] if idx + 1 < len(units) else None
+        """Next larger unit of the dimension (units with the same factor, e.g. g_read/b_read, are skipped)."""
+        idx = bisect_right(self.dimension._factors, self.factor_to_base)
+        return self.dimension._order[idx] if idx < len(self.dimension._order) else None
     
     def prev(self) -> "Unit | None":
-        units = Unit.all(self.dimension)
-        idx = 0
-        for idx, unit in enumerate(units):
-            if unit.factor_to_base == self.factor_to_base:
-                break
-        return units[idx - 1] if idx - 1 >= 0 else None
+        """Next smaller unit of the dimension."""
+        idx = bisect_left(self.dimension._factors, self.factor_to_base) - 1
+        return self.dimension._order[idx] if idx >= 0 else None
+
+    @staticmethod
+    def get(name: str) -> "Unit":
+        if (unit := Dimension._units.get(name)) is None:
+            raise ValueError(f"Unknown unit: {name}")
+        return unit
+
+    def __reduce__(self):
+        # unpickles to the registered unit instead of a copy
+        return (Unit.get, (self.name,))
 
     def __repr__(self) -> str:
         return f"Unit(dimension={self.dimension.name}, unit={self.name}, base_unit={self.base_unit.symbol}, factor={self.factor_to_base}, suffix={self.multiplier_suffix})"
@@ -95,17 +114,28 @@ class Quantity:
         return Quantity(self.value * self.unit.factor_to_base, self.unit.base_unit)
 
     def __add__(self, other: "Quantity") -> "Quantity":
+        if isinstance(other, QuantityArray):
+            return other.to(self.unit) + self  # type: ignore[return-value]
         self.unit.ensure_same_dimension(other.unit)
         other_in_self = other.to(self.unit)
         return Quantity(self.value + other_in_self.value, self.unit)
 
     def __sub__(self, other: "Quantity") -> "Quantity":
+        if isinstance(other, QuantityArray):
+            return -(other.to(self.unit) - self)  # type: ignore[return-value]
         self.unit.ensure_same_dimension(other.unit)
         other_in_self = other.to(self.unit)
         return Quantity(self.value - other_in_self.value, self.unit)
 
-    def __mul__(self, k: Number) -> "Quantity":
-        return Quantity(self.value * float(k), self.unit)
+    # lets numpy defer `array * quantity` to __rmul__
+    __array_ufunc__ = None
+
+    def __mul__(self, k: "Number | np.ndarray") -> "Quantity | QuantityArray":  # type: ignore[override]
+        if np.ndim(k) > 0:
+            return QuantityArray(np.asarray(k, dtype=np.float64) * self.value, self.unit)
+        return Quantity(self.value * float(k), self.unit)  # type: ignore[arg-type]
+
+    __rmul__ = __mul__
 
     def __truediv__(self, k: Number) -> "Quantity":
         return Quantity(self.value / float(k), self.unit)
@@ -131,13 +161,14 @@ class Quantity:
         return self.to_base().unit
     
     def compact(self, threshold: int = 3) -> "Quantity":
-        if self.value > 10**threshold:
+        value = abs(self.value)
+        if value > 10**threshold:
             if (n := self.unit.next()) is not None:
-                return self.to(n).compact()
+                return self.to(n).compact(threshold)
             
-        elif self.value < 1.0 / (10 ** threshold):
+        elif 0 < value < 1.0 / (10 ** threshold):
             if (p := self.unit.prev()) is not None:
-                return self.to(p).compact()
+                return self.to(p).compact(threshold)
         return self
     
     @property
@@ -156,16 +187,298 @@ class Quantity:
         return data["value"] * Dimension._registry[data["dimension"]]._units[data["unit"]]
     
 
-def from_dict(data: dict) -> Quantity:
-    """Create a Quantity from a dictionary."""
-    if "value" not in data or "unit" not in data or "dimension" not in data:
+@register_extension_dtype
+class QuantityDtype(ExtensionDtype):
+    """pandas dtype of a column of quantities with a common unit, e.g. `quantity[m_read]`."""
+    type = Quantity
+    na_value = np.nan
+    _metadata = ("unit_name",)
+
+    def __init__(self, unit: Unit | str | None = None):
+        if isinstance(unit, str):
+            unit = Unit.get(unit)
+        self.unit: Unit = unit if unit is not None else count
+
+    @property
+    def unit_name(self) -> str:
+        return self.unit.name
+
+    @property
+    def name(self) -> str:  # type: ignore[override]
+        return f"quantity[{self.unit.name}]"
+
+    @property
+    def _is_numeric(self) -> bool:
+        return True
+
+    @classmethod
+    def construct_array_type(cls) -> "type[QuantityArray]":
+        return QuantityArray
+
+    @classmethod
+    def construct_from_string(cls, string: str) -> "QuantityDtype":
+        if not isinstance(string, str):
+            raise TypeError(f"'construct_from_string' expects a string, got {type(string)}")
+        if string.startswith("quantity[") and string.endswith("]"):
+            try:
+                return cls(string[len("quantity["):-1])
+            except ValueError:
+                pass
+        raise TypeError(f"Cannot construct a 'QuantityDtype' from '{string}'")
+
+    def __reduce__(self):
+        return (QuantityDtype, (self.unit.name,))
+
+    def _get_common_dtype(self, dtypes: list) -> "QuantityDtype | None":
+        # concatenating quantities of the same dimension converts them to the first unit
+        if all(isinstance(dtype, QuantityDtype) and dtype.unit.dimension.name == self.unit.dimension.name for dtype in dtypes):
+            return self
+        return None
+
+
+class QuantityArray(ExtensionArray):
+    """Quantities of one unit backed by a float64 NumPy array (NaN = missing).
+    Conversions and arithmetic operate on the whole array, and as the pandas extension array of
+    `QuantityDtype` it can be used as a DataFrame column: `pd.Series(values * units.m_read)`."""
+
+    # lets numpy defer `array * quantity_array` to __rmul__
+    __array_ufunc__ = None
+
+    def __init__(self, values: "Sequence[Number] | np.ndarray | pd.Series", unit: Unit, copy: bool = False):
+        values = np.array(values, dtype=np.float64, copy=True) if copy else np.asarray(values, dtype=np.float64)
+        if values.ndim != 1:
+            raise ValueError(f"QuantityArray must be 1-dimensional, got {values.ndim} dimensions")
+        self.values: np.ndarray = values
+        self.unit = unit
+
+    # ---- conversion ----
+
+    def to(self, other: Unit) -> "QuantityArray":
+        self.unit.ensure_same_dimension(other)
+        if other is self.unit:
+            return self
+        return QuantityArray(self.values * (self.unit.factor_to_base / other.factor_to_base), other)
+
+    def to_base(self) -> "QuantityArray":
+        return self.to(self.unit.base_unit)
+
+    @property
+    def base_values(self) -> np.ndarray:
+        return self.values * self.unit.factor_to_base
+
+    @property
+    def base_unit(self) -> Unit:
+        return self.unit.base_unit
+
+    @property
+    def is_base_unit(self) -> bool:
+        return self.unit.name == self.unit.base_unit.name
+
+    def compact(self, threshold: int = 3) -> "QuantityArray":
+        """Converts to the unit in which the largest absolute value is compact, see `Quantity.compact`."""
+        finite = np.abs(self.values[np.isfinite(self.values)])
+        if len(finite) == 0 or (largest := float(finite.max())) == 0:
+            return self
+        return self.to(Quantity(largest, self.unit).compact(threshold).unit)
+
+    def to_dict(self) -> dict[str, list[float | None] | str]:
+        return {
+            "values": [None if np.isnan(v) else float(v) for v in self.base_values],
+            "unit": self.base_unit.name,
+            "dimension": self.unit.dimension.name,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantityArray":
+        values = np.array([np.nan if v is None else v for v in data["values"]], dtype=np.float64)
+        return cls(values, Dimension._registry[data["dimension"]]._units[data["unit"]])
+
+    # ---- arithmetic ----
+
+    def __other_values(self, other: Any) -> np.ndarray | float:
+        """`other` in the unit of this array, plain numbers are taken as already being in this unit."""
+        if isinstance(other, (Quantity, QuantityArray)):
+            return other.to(self.unit).values if isinstance(other, QuantityArray) else other.to(self.unit).value
+        if other is None or (np.ndim(other) == 0 and pd.isna(other)):
+            return np.nan
+        return np.asarray(other, dtype=np.float64) if np.ndim(other) > 0 else float(other)
+
+    def __add__(self, other: "Quantity | QuantityArray") -> "QuantityArray":
+        if not isinstance(other, (Quantity, QuantityArray)):
+            return NotImplemented
+        return QuantityArray(self.values + self.__other_values(other), self.unit)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: "Quantity | QuantityArray") -> "QuantityArray":
+        if not isinstance(other, (Quantity, QuantityArray)):
+            return NotImplemented
+        return QuantityArray(self.values - self.__other_values(other), self.unit)
+
+    def __rsub__(self, other: "Quantity | QuantityArray") -> "QuantityArray":
+        if not isinstance(other, (Quantity, QuantityArray)):
+            return NotImplemented
+        return QuantityArray(self.__other_values(other) - self.values, self.unit)
+
+    def __mul__(self, k: "Number | np.ndarray") -> "QuantityArray":
+        if isinstance(k, (Quantity, QuantityArray, pd.Series, pd.Index, pd.DataFrame)):
+            return NotImplemented
+        return QuantityArray(self.values * np.asarray(k, dtype=np.float64), self.unit)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, k: "Number | np.ndarray") -> "QuantityArray":
+        if isinstance(k, (Quantity, QuantityArray, pd.Series, pd.Index, pd.DataFrame)):
+            return NotImplemented
+        return QuantityArray(self.values / np.asarray(k, dtype=np.float64), self.unit)
+
+    def __neg__(self) -> "QuantityArray":
+        return QuantityArray(-self.values, self.unit)
+
+    def __abs__(self) -> "QuantityArray":
+        return QuantityArray(np.abs(self.values), self.unit)
+
+    def __compare(self, other: Any, op) -> np.ndarray:
+        if isinstance(other, (pd.Series, pd.Index, pd.DataFrame)):
+            return NotImplemented
+        if isinstance(other, (Quantity, QuantityArray)) and other.unit.dimension.name != self.unit.dimension.name:
+            return np.full(len(self), op is np.not_equal)
+        return op(self.values, self.__other_values(other))
+
+    def __eq__(self, other: Any) -> np.ndarray:  # type: ignore[override]
+        return self.__compare(other, np.equal)
+
+    def __ne__(self, other: Any) -> np.ndarray:  # type: ignore[override]
+        return self.__compare(other, np.not_equal)
+
+    def __lt__(self, other: Any) -> np.ndarray:
+        return self.__compare(other, np.less)
+
+    def __le__(self, other: Any) -> np.ndarray:
+        return self.__compare(other, np.less_equal)
+
+    def __gt__(self, other: Any) -> np.ndarray:
+        return self.__compare(other, np.greater)
+
+    def __ge__(self, other: Any) -> np.ndarray:
+        return self.__compare(other, np.greater_equal)
+
+    # ---- pandas ExtensionArray interface ----
+
+    @property
+    def dtype(self) -> QuantityDtype:
+        return QuantityDtype(self.unit)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self):
+        for value in self.values:
+            yield np.nan if np.isnan(value) else Quantity(float(value), self.unit)
+
+    def __getitem__(self, item):
+        if pd.api.types.is_integer(item):
+            value = self.values[item]
+            return np.nan if np.isnan(value) else Quantity(float(value), self.unit)
+        if not isinstance(item, (slice, tuple)) and pd.api.types.is_list_like(item):
+            item = pd.api.indexers.check_array_indexer(self, item)
+        return QuantityArray(self.values[item], self.unit)
+
+    def __setitem__(self, key, value) -> None:
+        if not isinstance(key, (slice, tuple)) and pd.api.types.is_list_like(key):
+            key = pd.api.indexers.check_array_indexer(self, key)
+        if pd.api.types.is_list_like(value) and not isinstance(value, QuantityArray):
+            value = QuantityArray._from_sequence(value, dtype=self.dtype)
+        self.values[key] = self.__other_values(value)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return np.array(self.values, dtype=dtype, copy=True) if copy else np.asarray(self.values, dtype=dtype)
+
+    def __repr__(self) -> str:
+        return f"QuantityArray(values={self.values!r}, unit={self.unit.name})"
+
+    def isna(self) -> np.ndarray:
+        return np.isnan(self.values)
+
+    def copy(self) -> "QuantityArray":
+        return QuantityArray(self.values, self.unit, copy=True)
+
+    def take(self, indices, allow_fill: bool = False, fill_value=None) -> "QuantityArray":
+        if allow_fill:
+            fill_value = self.__other_values(fill_value)
+        return QuantityArray(take(self.values, indices, allow_fill=allow_fill, fill_value=fill_value), self.unit)
+
+    def _values_for_factorize(self) -> tuple[np.ndarray, float]:
+        return self.values, np.nan
+
+    @classmethod
+    def _from_factorized(cls, values: np.ndarray, original: "QuantityArray") -> "QuantityArray":
+        return cls(values, original.unit)
+
+    @classmethod
+    def _from_sequence(cls, scalars, *, dtype=None, copy: bool = False) -> "QuantityArray":
+        if isinstance(dtype, str):
+            dtype = QuantityDtype.construct_from_string(dtype)
+        unit = dtype.unit if isinstance(dtype, QuantityDtype) else None
+
+        if isinstance(scalars, QuantityArray):
+            return scalars.to(unit).copy() if unit is not None else scalars.copy()
+
+        if unit is not None and isinstance(scalars, np.ndarray) and scalars.dtype.kind in "iuf":
+            return cls(scalars, unit, copy=copy)
+
+        scalars = list(scalars)
+        if unit is None:
+            if (first := next((s for s in scalars if isinstance(s, Quantity)), None)) is None:
+                raise ValueError("Cannot infer the unit of a QuantityArray without quantities or a QuantityDtype")
+            unit = first.unit
+
+        values = np.empty(len(scalars), dtype=np.float64)
+        for i, scalar in enumerate(scalars):
+            if isinstance(scalar, Quantity):
+                values[i] = scalar.to(unit).value
+            else:
+                values[i] = np.nan if scalar is None or pd.isna(scalar) else float(scalar)
+        return cls(values, unit)
+
+    @classmethod
+    def _concat_same_type(cls, to_concat: "Sequence[QuantityArray]") -> "QuantityArray":
+        unit = to_concat[0].unit
+        return cls(np.concatenate([array.to(unit).values for array in to_concat]), unit)
+
+    def _reduce(self, name: str, *, skipna: bool = True, keepdims: bool = False, **kwargs):
+        if name not in ("sum", "min", "max", "mean", "median", "std"):
+            raise TypeError(f"'{name}' is not supported for {self.dtype.name}")
+        func = getattr(np, f"nan{name}" if skipna else name)
+        result = func(self.values, ddof=kwargs.get("ddof", 1)) if name == "std" else func(self.values)
+        if keepdims:
+            return QuantityArray([result], self.unit)
+        return np.nan if np.isnan(result) else Quantity(float(result), self.unit)
+
+    def _formatter(self, boxed: bool = False):
+        return lambda q: "NaN" if not isinstance(q, Quantity) else q.value_to_str()
+    
+
+def from_dict(data: dict) -> Quantity | QuantityArray:
+    """Create a Quantity (or QuantityArray, if `values` is given) from a dictionary."""
+    if "unit" not in data or "dimension" not in data:
+        raise ValueError("Invalid data for Quantity")
+    
+    if "values" in data:
+        return QuantityArray.from_dict(data)
+    
+    if "value" not in data:
         raise ValueError("Invalid data for Quantity")
     
     return Quantity.from_dict(data)
 
 
-def to_dict(quantity: Quantity) -> dict[str, float | int | str | None]:
-    """Convert a Quantity to a dictionary."""
+def to_dict(quantity: Quantity | QuantityArray) -> dict:
+    """Convert a Quantity or QuantityArray to a dictionary."""
     return quantity.to_dict()
     
 
@@ -0,0 +1,26 @@
+from typing import Optional, Any
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+
+from .Base import Base
+
+
+class ExperimentOverview(Base):
+    """Request -> library -> pool -> lane flow graph and lane summaries of an experiment. Marked `stale` by triggers
+    when its lanes, pools or libraries change (see `core.experiment_overview`) and recomputed in the background."""
+    __tablename__ = "experiment_overview"
+    experiment_id: Mapped[int] = mapped_column(sa.ForeignKey("experiment.id", ondelete="CASCADE"), primary_key=True)
+
+    # {"nodes": [{"node", "name"}, ...], "links": [{"source", "target", "value"}, ...]}
+    graph: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True, default=None)
+    # [{"lane", "num_pools", "num_libraries", "num_m_reads_requested", "num_m_reads", "molarity", "share"}, ...]
+    lanes: Mapped[Optional[list[dict[str, Any]]]] = mapped_column(JSONB, nullable=True, default=None)
+
+    stale: Mapped[bool] = mapped_column(sa.Boolean, nullable=False, default=True)
+    computed_utc: Mapped[Optional[datetime]] = mapped_column(sa.DateTime(timezone=True), nullable=True, default=None)
+
+    def __repr__(self) -> str:
+        return f"ExperimentOverview(experiment_id={self.experiment_id}, stale={self.stale})"
@@ -4,6 +4,7 @@ import sqlalchemy as sa
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .Base import Base
+from ..core import pooling
 from . import links
 
 
@@ -64,13 +65,13 @@ class Lane(Base):
     def original_molarity(self) -> float | None:
         if self.original_qubit_concentration is None or self.avg_fragment_size is None:
             return None
-        return self.original_qubit_concentration / (self.avg_fragment_size * 660) * 1_000_000
+        return pooling.molarity(self.original_qubit_concentration, self.avg_fragment_size)
     
     @property
     def sequencing_molarity(self) -> float | None:
         if self.sequencing_qubit_concentration is None or self.avg_fragment_size is None:
             return None
-        return self.sequencing_qubit_concentration / (self.avg_fragment_size * 660) * 1_000_000
+        return pooling.molarity(self.sequencing_qubit_concentration, self.avg_fragment_size)
     
     @property
     def qubit_concentration(self) -> float | None:
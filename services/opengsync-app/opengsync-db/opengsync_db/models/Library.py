@@ -11,6 +11,7 @@ from sqlalchemy.ext.mutable import MutableDict
 
 from . import links
 from .Base import Base
+from ..core import pooling
 from .SeqRequest import SeqRequest
 from ..categories import (
     LibraryType, LibraryTypeEnum, LibraryStatus, LibraryStatusEnum, GenomeRef,
@@ -249,7 +250,7 @@ class Library(Base):
     def molarity(self) -> float | None:
         if self.avg_fragment_size is None or self.qubit_concentration is None:
             return None
-        return self.qubit_concentration / (self.avg_fragment_size * 660) * 1_000_000
+        return pooling.molarity(self.qubit_concentration, self.avg_fragment_size)
     
     @property
     def molarity_str(self) -> str:
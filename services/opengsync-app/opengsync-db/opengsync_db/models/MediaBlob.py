@@ -0,0 +1,42 @@
+import os
+from typing import Optional
+from datetime import datetime
+from datetime import timezone
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .Base import Base
+
+
+class MediaBlob(Base):
+    """Content-addressed file in the media folder, shared by all MediaFiles with the same content."""
+    __tablename__ = "media_blob"
+    id: Mapped[int] = mapped_column(sa.Integer, default=None, primary_key=True)
+    sha256: Mapped[str] = mapped_column(sa.CHAR(64), nullable=False)
+    extension: Mapped[str] = mapped_column(sa.String(16), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(sa.BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    timestamp_utc: Mapped[datetime] = mapped_column(sa.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    unreferenced_utc: Mapped[Optional[datetime]] = mapped_column(sa.DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        sa.UniqueConstraint("sha256", "extension", name="uq_media_blob_sha256_extension"),
+        sa.Index("ix_media_blob_unreferenced_utc", "unreferenced_utc", postgresql_where=sa.text("unreferenced_utc IS NOT NULL")),
+    )
+
+    BLOB_DIR = "blobs"
+
+    @staticmethod
+    def blob_path(sha256: str, extension: str) -> str:
+        return os.path.join(MediaBlob.BLOB_DIR, sha256[:2], f"{sha256}{extension}")
+
+    @property
+    def path(self) -> str:
+        return MediaBlob.blob_path(self.sha256, self.extension)
+
+    def __repr__(self) -> str:
+        return f"MediaBlob(id={self.id}, sha256={self.sha256}, extension={self.extension}, ref_count={self.ref_count})"
+
+    def __str__(self) -> str:
+        return self.__repr__()
@@ -12,6 +12,7 @@ from .. import localize
 from .Base import Base
 from ..categories import MediaFileType, MediaFileTypeEnum
 from .User import User
+from .MediaBlob import MediaBlob
 
 if TYPE_CHECKING:
     from .Comment import Comment
@@ -35,12 +36,17 @@ class MediaFile(Base):
     experiment_id: Mapped[Optional[int]] = mapped_column(sa.ForeignKey("experiment.id"), nullable=True)
     lab_prep_id: Mapped[Optional[int]] = mapped_column(sa.ForeignKey("lab_prep.id"), nullable=True)
 
+    blob_id: Mapped[Optional[int]] = mapped_column(sa.ForeignKey("media_blob.id"), nullable=True, index=True)
+    blob: Mapped[Optional["MediaBlob"]] = relationship("MediaBlob", lazy="joined")
+
     @property
     def type(self) -> MediaFileTypeEnum:
         return MediaFileType.get(self.type_id)
     
     @property
     def path(self) -> str:
+        if self.blob is not None:
+            return self.blob.path
         return os.path.join(self.type.dir, f"{self.uuid}{self.extension}")
 
     @property
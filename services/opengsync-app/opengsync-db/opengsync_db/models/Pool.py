@@ -7,6 +7,7 @@ from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .Base import Base
+from ..core import pooling
 from . import links
 from ..categories import PoolStatus, PoolStatusEnum, PoolType, PoolTypeEnum
 from .Experiment import Experiment
@@ -117,7 +118,7 @@ class Pool(Base):
         if self.avg_fragment_size is None or self.qubit_concentration is None:
             return None
         
-        return self.qubit_concentration / (self.avg_fragment_size * 660) * 1_000_000
+        return pooling.molarity(self.qubit_concentration, self.avg_fragment_size)
     
     @property
     def molarity_color_class(self) -> str:
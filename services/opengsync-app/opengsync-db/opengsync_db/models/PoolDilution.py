@@ -8,6 +8,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from opengsync_db import models
 
 from .Base import Base
+from ..core import pooling
 
 if TYPE_CHECKING:
     from .Pool import Pool
@@ -34,7 +35,7 @@ class PoolDilution(Base):
         if pool.avg_fragment_size is None:
             return None
         
-        return self.qubit_concentration / (pool.avg_fragment_size * 660) * 1_000_000
+        return pooling.molarity(self.qubit_concentration, pool.avg_fragment_size)
     
     def molarity_str(self, pool: models.Pool) -> str:
         if (molarity := self.molarity(pool)) is None:
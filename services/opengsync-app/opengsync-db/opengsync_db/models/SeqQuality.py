@@ -34,4 +34,12 @@ class SeqQuality(Base):
     library: Mapped[Optional["Library"]] = relationship("Library", back_populates="read_qualities", lazy="select")
 
     experiment_id: Mapped[int] = mapped_column(sa.ForeignKey("experiment.id"), nullable=False)
-    experiment: Mapped["Experiment"] = relationship("Experiment", back_populates="read_qualities", lazy="select")
\ No newline at end of file
+    experiment: Mapped["Experiment"] = relationship("Experiment", back_populates="read_qualities", lazy="select")
+
+    __table_args__ = (
+        # undetermined reads have no library, one row per experiment and lane
+        sa.UniqueConstraint(
+            "library_id", "experiment_id", "lane",
+            name="uq_seqquality_library_experiment_lane", postgresql_nulls_not_distinct=True
+        ),
+    )
\ No newline at end of file
@@ -9,6 +9,7 @@ from sqlalchemy.ext.mutable import MutableDict
 from ..categories import RunStatus, RunStatusEnum, ReadType, ReadTypeEnum
 from ..core import units
 from .Base import Base
+from .SeqRunMetric import SeqRunMetric
 
 if TYPE_CHECKING:
     from .Experiment import Experiment
@@ -37,7 +38,14 @@ class SeqRun(Base):
     i1_cycles: Mapped[Optional[int]] = mapped_column(sa.Integer, nullable=True)
     i2_cycles: Mapped[Optional[int]] = mapped_column(sa.Integer, nullable=True)
 
-    _quantities: Mapped[Optional[dict[str, dict[str, Any]]]] = mapped_column(MutableDict.as_mutable(JSONB), nullable=True, default=None, name="quantities")
+    metrics: Mapped[list["SeqRunMetric"]] = relationship(
+        "SeqRunMetric", back_populates="seq_run", lazy="select", cascade="all, delete-orphan", passive_deletes=True,
+    )
+    summary_metrics: Mapped[list["SeqRunMetric"]] = relationship(
+        "SeqRunMetric", lazy="select", viewonly=True,
+        primaryjoin="and_(SeqRun.id == SeqRunMetric.seq_run_id, SeqRunMetric.lane == 0, SeqRunMetric.read == 0)",
+        order_by="SeqRunMetric.metric",
+    )
 
     experiment: Mapped[Optional["Experiment"]] = relationship("Experiment", lazy="joined", primaryjoin="SeqRun.experiment_name == Experiment.name", foreign_keys=experiment_name, cascade="save-update")
 
@@ -61,21 +69,31 @@ class SeqRun(Base):
 
     @property
     def quantities(self) -> dict[str, units.Quantity]:
-        if self._quantities is None:
-            return {}
-        return {key: units.from_dict(q) for key, q in self._quantities.items()}
+        return {metric.metric: metric.quantity for metric in self.summary_metrics}
+
+    @property
+    def quantities_dict(self) -> dict[str, dict[str, Any]]:
+        """Run summary in the format of the former `quantities` JSONB column."""
+        return {key: quantity.to_dict() for key, quantity in self.quantities.items()}
 
     def get_quantity(self, key: str) -> units.Quantity | None:
-        if self._quantities is None or (data := self._quantities.get(key)) is None:
-            return None
-        return units.from_dict(data)
+        for metric in self.summary_metrics:
+            if metric.metric == key:
+                return metric.quantity
+        return None
             
-    def set_quantity(self, key: str, value: units.Quantity) -> None:
+    def set_quantity(self, key: str, value: units.Quantity, lane: int = 0, read: int = 0) -> None:
         if not isinstance(value, units.Quantity):
             raise ValueError("Value must be a Quantity object")
-        if self._quantities is None:
-            self._quantities = {}
-        self._quantities[key] = value.to_dict()
+        for metric in self.metrics:
+            if metric.metric == key and metric.lane == lane and metric.read == read:
+                metric.quantity = value
+                return
+        metric = SeqRunMetric(metric=key, lane=lane, read=read)
+        metric.quantity = value
+        self.metrics.append(metric)
+        if (session := sa.orm.object_session(self)) is not None and sa.inspect(self).persistent:
+            session.expire(self, ["summary_metrics"])
 
     @property
     def timestamps(self) -> dict[str, datetime]:
@@ -0,0 +1,45 @@
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..core import units
+from .Base import Base
+
+if TYPE_CHECKING:
+    from .SeqRun import SeqRun
+
+
+class SeqRunMetric(Base):
+    """InterOp metric of a sequencing run, stored in the base unit of its dimension.
+    `lane`/`read` = 0 is the aggregate over all lanes/reads, i.e. the run summary."""
+    __tablename__ = "seq_run_metric"
+    seq_run_id: Mapped[int] = mapped_column(sa.ForeignKey("seq_run.id", ondelete="CASCADE"), primary_key=True)
+    metric: Mapped[str] = mapped_column(sa.String(64), primary_key=True)
+    lane: Mapped[int] = mapped_column(sa.SmallInteger, primary_key=True, default=0)
+    read: Mapped[int] = mapped_column(sa.SmallInteger, primary_key=True, default=0)
+
+    value: Mapped[float] = mapped_column(sa.Float, nullable=False)
+    unit: Mapped[str] = mapped_column(sa.String(16), nullable=False)
+
+    seq_run: Mapped["SeqRun"] = relationship("SeqRun", back_populates="metrics", lazy="select")
+
+    __table_args__ = (
+        sa.Index("ix_seq_run_metric_metric_lane_read", "metric", "lane", "read"),
+    )
+
+    @property
+    def quantity(self) -> units.Quantity:
+        return self.value * units.Unit.get(self.unit)  # type: ignore[return-value]
+
+    @quantity.setter
+    def quantity(self, value: units.Quantity) -> None:
+        base = value.to_base()
+        self.value = float(base.value)
+        self.unit = base.unit.name
+
+    def __str__(self) -> str:
+        return f"SeqRunMetric(seq_run_id={self.seq_run_id}, metric={self.metric}, lane={self.lane}, read={self.read}, value={self.value}, unit={self.unit})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
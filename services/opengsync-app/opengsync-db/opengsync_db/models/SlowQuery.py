@@ -0,0 +1,40 @@
+from typing import Optional, ClassVar, Any
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+
+from .Base import Base
+
+
+class SlowQuery(Base):
+    """Statements slower than the threshold of `core.SlowQueryLog`, aggregated by normalized statement."""
+    __tablename__ = "slow_query"
+    fingerprint: Mapped[str] = mapped_column(sa.CHAR(32), primary_key=True)
+    statement: Mapped[str] = mapped_column(sa.Text, nullable=False)
+
+    calls: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, default=0)
+    total_ms: Mapped[float] = mapped_column(sa.Float, nullable=False, default=0.0)
+    max_ms: Mapped[float] = mapped_column(sa.Float, nullable=False, default=0.0)
+    first_seen_utc: Mapped[datetime] = mapped_column(sa.DateTime(timezone=True), nullable=False)
+    last_seen_utc: Mapped[datetime] = mapped_column(sa.DateTime(timezone=True), nullable=False)
+
+    # latest occurrence
+    last_statement: Mapped[str] = mapped_column(sa.Text, nullable=False)
+    last_parameters: Mapped[Optional[Any]] = mapped_column(JSONB, nullable=True)
+    last_source: Mapped[Optional[str]] = mapped_column(sa.String(256), nullable=True)
+    last_ms: Mapped[float] = mapped_column(sa.Float, nullable=False)
+
+    plan: Mapped[Optional[str]] = mapped_column(sa.Text, nullable=True)
+    plan_source: Mapped[Optional[str]] = mapped_column(sa.String(256), nullable=True)
+    plan_utc: Mapped[Optional[datetime]] = mapped_column(sa.DateTime(timezone=True), nullable=True)
+
+    sortable_fields: ClassVar[list[str]] = ["calls", "total_ms", "max_ms", "last_seen_utc"]
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def __repr__(self) -> str:
+        return f"SlowQuery(fingerprint={self.fingerprint}, calls={self.calls}, mean_ms={self.mean_ms:.1f})"
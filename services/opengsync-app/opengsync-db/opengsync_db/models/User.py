@@ -201,6 +201,15 @@ class User(Base, UserMixin):
             return None
         return id, email, hash
 
+    @hybrid_property
+    def full_name(self) -> str:  # type: ignore[override]
+        return self.first_name + " " + self.last_name
+    
+    @full_name.expression
+    def full_name(cls) -> sa.ColumnElement[str]:
+        # literal separator, so that lower(full_name) matches the expression of trgm_lims_user_full_name_idx
+        return cls.first_name + sa.literal_column("' '") + cls.last_name
+
     @property
     def role(self) -> UserRoleEnum:
         return UserRole.get(self.role_id)
@@ -4,6 +4,7 @@ from .Sample import SampleAttribute  # noqa: F401
 from .Pool import Pool  # noqa: F401
 from .User import User  # noqa: F401
 from .Experiment import Experiment  # noqa: F401
+from .ExperimentOverview import ExperimentOverview  # noqa: F401
 from .Library import Library    # noqa: F401
 from .IndexKit import IndexKit  # noqa: F401
 from .SeqRequest import SeqRequest  # noqa: F401
@@ -12,10 +13,13 @@ from .Sequencer import Sequencer    # noqa: F401
 from .Adapter import Adapter    # noqa: F401
 from .Feature import Feature    # noqa: F401
 from .FeatureKit import FeatureKit  # noqa: F401
+from .MediaBlob import MediaBlob  # noqa: F401
 from .MediaFile import MediaFile  # noqa: F401
 from .SeqQuality import SeqQuality  # noqa: F401
 from .Comment import Comment  # noqa: F401
 from .SeqRun import SeqRun  # noqa: F401
+from .SeqRunMetric import SeqRunMetric  # noqa: F401
+from .SlowQuery import SlowQuery  # noqa: F401
 from .Lane import Lane  # noqa: F401
 from .PoolDilution import PoolDilution  # noqa: F401
 from .Plate import Plate  # noqa: F401
@@ -17,8 +17,10 @@ from loguru import logger
 from opengsync_db import DBHandler
 
 from .core.LogBuffer import log_buffer
-from .tools import RedisMSFFileCache
+from .tools import RedisMSFFileCache, UniverSnapshotCache
 from .core.FlashCache import FlashCache
+from .core.Metrics import Metrics
+from .core.Profiler import RouteProfiler
 from .core.FileHandler import FileHandler
 from .tools import MailHandler
 
@@ -50,6 +52,9 @@ msf_cache = RedisMSFFileCache()
 session_cache = redis.Redis(host="redis-cache", port=int(os.environ["REDIS_PORT"]), db=3)
 flash_cache = FlashCache()
 file_handler = FileHandler()
+univer_cache = UniverSnapshotCache()
+metrics = Metrics()
+profiler = RouteProfiler()
 
 limiter = Limiter(
     lambda: request.headers.get("X-Real-IP", request.remote_addr, type=str),  # type: ignore
@@ -1,4 +1,5 @@
 import os
+import time
 import yaml
 from uuid import uuid4
 from pathlib import Path
@@ -11,7 +12,7 @@ from flask import (
     request,
     url_for,
 )
-from jinja2 import StrictUndefined
+from jinja2 import StrictUndefined, FileSystemBytecodeCache, TemplateError
 from flask_session import Session
 from flask_session.base import ServerSideSession
 
@@ -32,12 +33,17 @@ from .. import (
     mail_handler,
     db,
     file_handler,
+    univer_cache,
     limiter,
+    metrics,
+    profiler,
 )
 from ..tools import spread_sheet_components as ssc
+from .SessionInterface import UserSessionInterface
 from ..tools.utils import WeekTimeWindow
 from .. import routes
 from .. import tools
+from .UploadRequest import UploadRequest
 
 
 class App(Flask):
@@ -59,6 +65,17 @@ class App(Flask):
     def __init__(self, config_path: str):
         opengsync_config = yaml.safe_load(open(config_path))
         super().__init__(__name__, static_folder=opengsync_config["static_folder"], template_folder=opengsync_config["template_folder"])
+        self.request_class = UploadRequest
+
+        # must be configured before jinja_env is first accessed
+        templates_config = opengsync_config.get("templates", {})
+        self.config["TEMPLATES_AUTO_RELOAD"] = templates_config.get("auto_reload")
+        jinja_options = dict(self.jinja_options, cache_size=-1)
+        if templates_config.get("bytecode_cache", True):
+            bytecode_folder = Path(opengsync_config["app_data_folder"]) / "jinja_cache"
+            os.makedirs(bytecode_folder, exist_ok=True)
+            jinja_options["bytecode_cache"] = FileSystemBytecodeCache(str(bytecode_folder))
+        self.jinja_options = jinja_options
 
         if DEBUG:
             self.jinja_env.undefined = StrictUndefined
@@ -91,8 +108,10 @@ class App(Flask):
             media_folder=self.media_folder,
             uploads_folder=self.uploads_folder,
             app_data_folder=self.app_data_folder,
-            share_root=self.share_root
+            share_root=self.share_root,
+            max_upload_size_mbytes=opengsync_config.get("max_upload_size_mbytes"),
         )
+        univer_cache.init_app(self.app_data_folder / "univer")
 
         self.debug = DEBUG
         self.timezone = TIMEZONE
@@ -106,6 +125,11 @@ class App(Flask):
         route_cache.init_app(self, config={"CACHE_TYPE": "redis", "CACHE_REDIS_URL": f"redis://redis-cache:{REDIS_PORT}/0"})
         msf_cache.connect("redis-cache", REDIS_PORT, 1)
         flash_cache.connect("redis-cache", REDIS_PORT, 2)
+        metrics.instrument_cache(self.extensions["cache"][route_cache], "route_cache")
+        metrics.instrument_redis(msf_cache.r, "msf_cache")  # type: ignore[arg-type]
+        metrics.instrument_redis(flash_cache.r, "flash_cache")
+        metrics.instrument_redis(session_cache, "session")
+        profiler.connect("redis-cache", REDIS_PORT, 5)
 
         for file_type in categories.MediaFileType.as_list():
             if file_type.dir is None:
@@ -125,6 +149,7 @@ class App(Flask):
         self.config["SESSION_REDIS"] = session_cache
 
         Session(self)
+        self.session_interface = UserSessionInterface.from_app(self, client=session_cache)
 
         htmx.init_app(self)
         bcrypt.init_app(self)
@@ -144,7 +169,10 @@ class App(Flask):
             host=os.environ["POSTGRES_HOST"],
             port=os.environ["POSTGRES_PORT"],
             db=os.environ["POSTGRES_DB"],
+            word_similarity_threshold=opengsync_config["db"].get("search_similarity_threshold"),
         )
+        metrics.instrument_engine(db._engine)
+        profiler.init_app(self.app_data_folder / "profiles", db._engine)
 
         if (windows := opengsync_config.get("sample_submission_windows")):
             self.sample_submission_windows = tools.utils.parse_time_windows(windows)
@@ -158,6 +186,11 @@ class App(Flask):
             logger.warning("No email domain white list configured. All domains are allowed.")
 
         db.lab_protocol_start_number = int(opengsync_config["db"]["lab_protocol_start_number"])
+        if (slow_query_threshold_ms := opengsync_config["db"].get("slow_query_threshold_ms")) is not None:
+            db.enable_slow_query_log(
+                threshold_ms=float(slow_query_threshold_ms),
+                explain_sample_rate=float(opengsync_config["db"].get("slow_query_explain_sample_rate", 0.1)),
+            )
 
         @login_manager.user_loader
         def load_user(user_id: int) -> models.User | None:
@@ -259,6 +292,8 @@ class App(Flask):
         self.register_blueprint(routes.htmx.groups_htmx)
         self.register_blueprint(routes.htmx.kits_htmx)
         self.register_blueprint(routes.htmx.share_tokens_htmx)
+        self.register_blueprint(routes.htmx.profiling_htmx)
+        self.register_blueprint(routes.htmx.search_htmx)
 
         self.register_blueprint(routes.plotting.plots_api)
         self.register_blueprint(routes.files.file_share_bp)
@@ -303,9 +338,27 @@ class App(Flask):
         self.register_blueprint(routes.pages.groups_page_bp)
         self.register_blueprint(routes.pages.share_tokens_page_bp)
         self.register_blueprint(routes.pages.browser_page_bp)
+        self.register_blueprint(routes.pages.profiling_page_bp)
+
+        if templates_config.get("warm_up", True):
+            self.warm_up_templates()
 
         log_buffer.flush()
 
+    def warm_up_templates(self) -> int:
+        """Loads every template once, so that requests never wait for a compile. Templates are read from the
+        bytecode cache when their source is unchanged, the first worker after a deploy compiles and stores them."""
+        start = time.perf_counter()
+        n = 0
+        for template_name in self.jinja_env.list_templates(extensions=["html", "xml", "j2", "jinja2"]):
+            try:
+                self.jinja_env.get_template(template_name)
+                n += 1
+            except TemplateError as e:
+                logger.error(f"Could not compile template '{template_name}': {e}")
+        logger.info(f"Loaded {n} templates in {time.perf_counter() - start:.2f}s")
+        return n
+
     def no_context_render_template(self, template_name: str, **context: dict) -> str:
         return self.jinja_env.get_template(template_name).render(**context)
 
@@ -313,25 +366,5 @@ class App(Flask):
         flashes = session.pop("_flashes") if "_flashes" in session else []
         return flashes
 
-    def delete_user_sessions(self, user_id: int) -> str:
-        lua_script = """
-        local keys_to_delete = {}
-        local session_keys = redis.call('KEYS', 'session:*')
-
-        for i, key in ipairs(session_keys) do
-            local session_data = redis.call('GET', key)
-            if session_data then
-                if string.find(session_data, '_user_id') and string.find(session_data, tostring(ARGV[1])) then
-                    table.insert(keys_to_delete, key)
-                end
-            end
-        end
-
-        if #keys_to_delete > 0 then
-            redis.call('DEL', unpack(keys_to_delete))
-        end
-
-        return #keys_to_delete
-        """
-        deleted_count = session_cache.eval(lua_script, 0, str(user_id))
-        return deleted_count  # type: ignore
+    def delete_user_sessions(self, user_id: int) -> int:
+        return self.session_interface.delete_user_sessions(user_id)  # type: ignore[attr-defined]
@@ -1,4 +1,19 @@
+import os
+import shutil
+import hashlib
 from pathlib import Path
+from dataclasses import dataclass
+
+from werkzeug.datastructures import FileStorage
+
+from .UploadRequest import UploadStream
+
+
+@dataclass
+class UploadInfo:
+    path: Path
+    size_bytes: int
+    sha256: str | None
 
 
 class FileHandler:
@@ -7,18 +22,23 @@ class FileHandler:
         self.__uploads_folder: Path | None = None
         self.__app_data_folder: Path | None = None
         self.__share_root: Path | None = None
+        self.max_upload_size_bytes: int = 32 * 1024 * 1024
 
     def init_app(
         self,
         media_folder: str | Path,
         uploads_folder: str | Path,
         app_data_folder: str | Path,
-        share_root: str | Path
+        share_root: str | Path,
+        max_upload_size_mbytes: int | None = None,
     ):
         self.__media_folder = media_folder if isinstance(media_folder, Path) else Path(media_folder)
         self.__uploads_folder = uploads_folder if isinstance(uploads_folder, Path) else Path(uploads_folder)
         self.__app_data_folder = app_data_folder if isinstance(app_data_folder, Path) else Path(app_data_folder)
         self.__share_root = share_root if isinstance(share_root, Path) else Path(share_root)
+        if max_upload_size_mbytes is not None:
+            self.max_upload_size_bytes = max_upload_size_mbytes * 1024 * 1024
+        self.staging_folder.mkdir(parents=True, exist_ok=True)
 
     @property
     def media_folder(self) -> Path:
@@ -43,4 +63,66 @@ class FileHandler:
         if not self.__share_root:
             raise ValueError("Share root is not initialized")
         return self.__share_root
-        
\ No newline at end of file
+
+    @property
+    def staging_folder(self) -> Path:
+        """Uploads are streamed here, it is on the same volume as the media folder so that commits are a rename."""
+        return self.media_folder / ".staging"
+
+    @staticmethod
+    def upload_size(file: FileStorage) -> int:
+        """Size of an uploaded file without reading it into memory."""
+        if isinstance(file.stream, UploadStream):
+            return file.stream.size_bytes
+        
+        pos = file.stream.tell()
+        size = file.stream.seek(0, os.SEEK_END)
+        file.stream.seek(pos)
+        return size
+
+    @staticmethod
+    def upload_sha256(file: FileStorage) -> str:
+        """sha256 of an uploaded file, computed while streaming for UploadStream."""
+        if isinstance(file.stream, UploadStream):
+            return file.stream.sha256
+        
+        pos = file.stream.tell()
+        file.stream.seek(0)
+        _hash = hashlib.sha256()
+        while chunk := file.stream.read(1024 * 1024):
+            _hash.update(chunk)
+        file.stream.seek(pos)
+        return _hash.hexdigest()
+
+    def commit_upload(self, file: FileStorage, path: str | Path) -> UploadInfo:
+        """Moves a streamed upload to its final location in the media folder."""
+        path = Path(path)
+        stream = file.stream
+        if not isinstance(stream, UploadStream):
+            file.save(path)
+            return UploadInfo(path=path, size_bytes=os.path.getsize(path), sha256=None)
+
+        if stream.too_large:
+            raise ValueError(f"Upload exceeds the maximum size of {stream.max_size_bytes} bytes")
+        
+        stream.flush()
+        if stream.committed:
+            shutil.copyfile(stream.path, path)
+        else:
+            os.replace(stream.path, path)
+            os.chmod(path, 0o644)
+            stream.path = path
+            stream.committed = True
+
+        return UploadInfo(path=path, size_bytes=stream.size_bytes, sha256=stream.sha256)
+
+    def commit_blob(self, file: FileStorage, blob_path: str | Path) -> Path:
+        """Stores an upload as content-addressed blob (MediaFile.path of a file created with sha256).
+        If the blob already exists, the upload is a duplicate and is discarded with the request."""
+        path = self.media_folder / blob_path
+        if path.exists():
+            return path
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.commit_upload(file, path)
+        return path
@@ -1,66 +1,130 @@
+import json
+
 import redis
 
 
 class FlashCache:
+    """Flash messages per session, stored as a Redis list of JSON encoded (category, message) pairs.
+    Every operation is a single round trip and atomic (MULTI/EXEC pipeline or Lua script)."""
+
+    CATEGORY_ALIASES = {"message": "info", "danger": "error"}
+    FORMAT_KEY = "flash_cache:format"
+    FORMAT = "list"
+
+    # removes and returns the messages of the given categories (ARGV), keeps the others with their TTL
+    __consume_script = """
+    local items = redis.call('LRANGE', KEYS[1], 0, -1)
+    if #items == 0 then
+        return {}
+    end
+    local categories = {}
+    for _, cat in ipairs(ARGV) do
+        categories[cat] = true
+    end
+    local keep, taken = {}, {}
+    for _, item in ipairs(items) do
+        if categories[cjson.decode(item)[1]] then
+            table.insert(taken, item)
+        else
+            table.insert(keep, item)
+        end
+    end
+    if #taken > 0 then
+        local ttl = redis.call('PTTL', KEYS[1])
+        redis.call('DEL', KEYS[1])
+        if #keep > 0 then
+            redis.call('RPUSH', KEYS[1], unpack(keep))
+            if ttl > 0 then
+                redis.call('PEXPIRE', KEYS[1], ttl)
+            end
+        end
+    end
+    return taken
+    """
+
     def __init__(self):
         self.r: redis.StrictRedis
+        self.ttl_seconds: int = 3600
 
-    def connect(self, host: str, port: int, db: int):
+    def connect(self, host: str, port: int, db: int, ttl_seconds: int | None = None):
         self.r = redis.StrictRedis(host=host, port=port, db=db)
-        self.r.flushdb()
+        if ttl_seconds is not None:
+            self.ttl_seconds = ttl_seconds
+        self.__consume = self.r.register_script(FlashCache.__consume_script)
+        self.__drop_legacy_keys()
 
-    def get(self, sid: str, category: str | list[str] | None = None) -> list[tuple[str, str]]:
+    def __drop_legacy_keys(self) -> None:
+        """Deletes the per session hashes of the previous format once (they were stored under the bare sid
+        without TTL and flushed on every startup), the first process to claim the format key does the cleanup."""
+        if not self.r.set(FlashCache.FORMAT_KEY, FlashCache.FORMAT, nx=True):
+            return
+
+        legacy = []
+        for key in self.r.scan_iter(count=1000):
+            if not key.startswith(b"flashes:") and key != FlashCache.FORMAT_KEY.encode():
+                legacy.append(key)
+            if len(legacy) >= 1000:
+                self.r.unlink(*legacy)
+                legacy = []
+        if legacy:
+            self.r.unlink(*legacy)
+
+    @staticmethod
+    def key(sid: str) -> str:
+        return f"flashes:{sid}"
+
+    @staticmethod
+    def __categories(category: str | list[str]) -> list[str]:
         if isinstance(category, str):
             category = [category]
+        return list({FlashCache.CATEGORY_ALIASES.get(cat, cat) for cat in category})
 
-        flashes = []
-        if category is None:
-            all_flashes: dict[bytes, bytes] = self.r.hgetall(sid)  # type: ignore
-            for cat, messages in all_flashes.items():
-                cat = cat.decode()
-                if messages:
-                    flashes.extend((cat, msg) for msg in messages.decode().split(','))
-        else:
-            for cat in category:
-                messages: bytes | None = self.r.hget(sid, cat)  # type: ignore
-                if messages:
-                    flashes.extend((cat, msg) for msg in messages.decode().split(','))
+    @staticmethod
+    def __decode(items: list[bytes]) -> list[tuple[str, str]]:
+        return [tuple(json.loads(item)) for item in items]  # type: ignore[misc]
 
+    def get(self, sid: str, category: str | list[str] | None = None) -> list[tuple[str, str]]:
+        flashes = FlashCache.__decode(self.r.lrange(FlashCache.key(sid), 0, -1))  # type: ignore[arg-type]
+        if category is not None:
+            categories = FlashCache.__categories(category)
+            flashes = [(cat, msg) for cat, msg in flashes if cat in categories]
         return flashes
-    
+
     def add(self, sid: str, flashes: list[tuple[str, str]]):
-        flashes = self.get(sid) + flashes
+        """Appends the messages and refreshes the TTL."""
+        if not flashes:
+            return
+
+        key = FlashCache.key(sid)
+        items = [json.dumps([FlashCache.CATEGORY_ALIASES.get(cat, cat), msg]) for cat, msg in flashes]
 
-        self.r.delete(sid)
-        
-        self.r.hset(sid, mapping={
-            "info": ",".join(msg for cat, msg in flashes if cat in ["info", "message"]),
-            "success": ",".join(msg for cat, msg in flashes if cat == "success"),
-            "warning": ",".join(msg for cat, msg in flashes if cat == "warning"),
-            "error": ",".join(msg for cat, msg in flashes if cat in ["error", "danger"])
-        })
+        with self.r.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, *items)
+            pipe.expire(key, self.ttl_seconds)
+            pipe.execute()
 
     def consume(self, sid: str | None, category: str | list[str] | None = None) -> list[tuple[str, str]]:
         if sid is None:
             return []
-        flashes = self.get(sid, category)
 
-        if category is not None:
-            if isinstance(category, str):
-                category = [category]
-            for cat in category:
-                self.r.hdel(sid, cat)
+        if category is None:
+            return [(cat, msg) for cat, msgs in self.consume_all(sid).items() for msg in msgs]
+
+        return FlashCache.__decode(self.__consume(keys=[FlashCache.key(sid)], args=FlashCache.__categories(category)))
 
-        return flashes
-    
     def consume_all(self, sid: str | None) -> dict[str, list[str]]:
         if sid is None:
             return {}
-        flashes = self.get(sid)
-        self.r.delete(sid)
+
+        key = FlashCache.key(sid)
+        with self.r.pipeline(transaction=True) as pipe:
+            pipe.lrange(key, 0, -1)
+            pipe.delete(key)
+            items, _ = pipe.execute()
+
         categorized_flashes = {}
-        for cat, msg in flashes:
+        for cat, msg in FlashCache.__decode(items):
             if cat not in categorized_flashes:
                 categorized_flashes[cat] = []
             categorized_flashes[cat].append(msg)
-        return categorized_flashes
\ No newline at end of file
+        return categorized_flashes
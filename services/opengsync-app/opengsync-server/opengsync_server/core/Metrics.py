@@ -0,0 +1,160 @@
+import os
+import time
+from typing import Any
+
+import redis
+import sqlalchemy as sa
+from flask import Response
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest, multiprocess
+)
+
+
+class Metrics:
+    """Prometheus metrics of the web server. When `PROMETHEUS_MULTIPROC_DIR` is set (gunicorn, see `gunicorn.conf.py`),
+    every worker process writes its samples to that directory and they are aggregated when scraped."""
+
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self):
+        self.request_duration = Histogram(
+            "opengsync_request_duration_seconds", "Request latency per route",
+            ["route", "method"], buckets=Metrics.LATENCY_BUCKETS
+        )
+        self.requests = Counter(
+            "opengsync_requests_total", "Requests per route and status code",
+            ["route", "method", "status"]
+        )
+        self.db_statement_duration = Histogram(
+            "opengsync_db_statement_duration_seconds", "SQL statement execution time",
+            ["statement"], buckets=Metrics.LATENCY_BUCKETS
+        )
+        self.db_pool_checked_out = Gauge(
+            "opengsync_db_pool_checked_out", "Connections checked out from the pool",
+            multiprocess_mode="livesum"
+        )
+        self.db_pool_connections = Gauge(
+            "opengsync_db_pool_connections", "Open DB connections",
+            multiprocess_mode="livesum"
+        )
+        self.cache_requests = Counter(
+            "opengsync_cache_requests_total", "Cache lookups by result",
+            ["cache", "result"]
+        )
+        self.cache_evictions = Counter(
+            "opengsync_cache_evictions_total", "Cache entries removed by delete or clear",
+            ["cache", "reason"]
+        )
+        self.redis_duration = Histogram(
+            "opengsync_redis_command_duration_seconds", "Redis round-trip time per command",
+            ["client", "command"], buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+        )
+
+    @staticmethod
+    def status_code(rv: Any) -> int:
+        if isinstance(rv, Response):
+            return rv.status_code
+        if isinstance(rv, tuple) and len(rv) > 1 and isinstance(rv[1], int):
+            return rv[1]
+        return 200
+
+    def observe_request(self, route: str, method: str, status: int, seconds: float) -> None:
+        self.request_duration.labels(route, method).observe(seconds)
+        self.requests.labels(route, method, str(status)).inc()
+
+    def instrument_engine(self, engine: sa.Engine) -> None:
+        """Statement timings by statement type and pool usage of a SQLAlchemy engine."""
+        @sa.event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+        @sa.event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            start = conn.info["metrics_query_start"].pop()
+            keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+            self.db_statement_duration.labels(keyword).observe(time.perf_counter() - start)
+
+        @sa.event.listens_for(engine, "handle_error")
+        def handle_error(context):
+            if context.connection is not None and (starts := context.connection.info.get("metrics_query_start")):
+                starts.pop()
+
+        @sa.event.listens_for(engine.pool, "connect")
+        def connect(dbapi_connection, connection_record):
+            self.db_pool_connections.inc()
+
+        @sa.event.listens_for(engine.pool, "close")
+        def close(dbapi_connection, connection_record):
+            self.db_pool_connections.dec()
+
+        @sa.event.listens_for(engine.pool, "checkout")
+        def checkout(dbapi_connection, connection_record, connection_proxy):
+            self.db_pool_checked_out.inc()
+
+        @sa.event.listens_for(engine.pool, "checkin")
+        def checkin(dbapi_connection, connection_record):
+            self.db_pool_checked_out.dec()
+
+    def instrument_redis(self, client: redis.Redis, name: str) -> None:
+        """Times every command (and pipeline execution) sent by `client`, scripts included."""
+        execute_command = client.execute_command
+        pipeline = client.pipeline
+
+        def timed_execute_command(*args, **options):
+            start = time.perf_counter()
+            try:
+                return execute_command(*args, **options)
+            finally:
+                self.redis_duration.labels(name, str(args[0]).upper()).observe(time.perf_counter() - start)
+
+        def timed_pipeline(*args, **kwargs):
+            pipe = pipeline(*args, **kwargs)
+            execute = pipe.execute
+
+            def timed_execute(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return execute(*args, **kwargs)
+                finally:
+                    self.redis_duration.labels(name, "PIPELINE").observe(time.perf_counter() - start)
+
+            pipe.execute = timed_execute
+            return pipe
+
+        client.execute_command = timed_execute_command  # type: ignore[method-assign]
+        client.pipeline = timed_pipeline  # type: ignore[method-assign]
+
+    def instrument_cache(self, backend: Any, name: str) -> None:
+        """Counts hits, misses and evictions of a flask-caching backend (`app.extensions["cache"][cache]`)."""
+        get, delete, delete_many, clear = backend.get, backend.delete, backend.delete_many, backend.clear
+
+        def counted_get(key):
+            rv = get(key)
+            self.cache_requests.labels(name, "miss" if rv is None else "hit").inc()
+            return rv
+
+        def counted_delete(key):
+            self.cache_evictions.labels(name, "delete").inc()
+            return delete(key)
+
+        def counted_delete_many(*keys):
+            self.cache_evictions.labels(name, "delete").inc(len(keys))
+            return delete_many(*keys)
+
+        def counted_clear():
+            self.cache_evictions.labels(name, "clear").inc()
+            return clear()
+
+        backend.get = counted_get
+        backend.delete = counted_delete
+        backend.delete_many = counted_delete_many
+        backend.clear = counted_clear
+
+    def exposition(self) -> tuple[bytes, str]:
+        """Metrics in the Prometheus text format, aggregated over all worker processes in multiprocess mode."""
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,241 @@
+import os
+import sys
+import json
+import time
+import random
+import fnmatch
+import threading
+from uuid import uuid4
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import Counter
+from dataclasses import dataclass, asdict
+
+import redis
+import sqlalchemy as sa
+
+
+@dataclass
+class ProfilingSettings:
+    route: str | None = None        # url rule or glob, e.g. "/htmx/seq_requests/*"
+    user_id: int | None = None
+    sample_rate: float = 1.0
+    interval_ms: float = 5.0
+    enabled_by: int | None = None
+
+
+class RouteProfiler:
+    """Samples the call stack of matching requests and records their SQL statements. Settings are shared
+    between worker processes via Redis and re-read at most every `REFRESH_SECONDS`, so the disabled path is
+    a timestamp comparison. Profiles are written to `<app_data>/profiles` as `<id>.json` (metadata, SQL timeline,
+    top functions) and `<id>.folded` (collapsed stacks, readable by flamegraph.pl / speedscope)."""
+
+    SETTINGS_KEY = "profiling:settings"
+    REMAINING_KEY = "profiling:remaining"
+    REFRESH_SECONDS = 5.0
+    MAX_PROFILES = 200
+    MAX_STATEMENT_LENGTH = 1000
+
+    def __init__(self):
+        self.r: redis.StrictRedis | None = None
+        self.folder: Path | None = None
+        self._settings: ProfilingSettings | None = None
+        self._refreshed = 0.0
+        self._timeline: ContextVar[list[dict] | None] = ContextVar("profiling_timeline", default=None)
+
+    def connect(self, host: str, port: int, db: int):
+        self.r = redis.StrictRedis(host=host, port=port, db=db)
+
+    def init_app(self, folder: Path, engine: sa.Engine):
+        self.folder = folder
+        os.makedirs(self.folder, exist_ok=True)
+
+        @sa.event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if self._timeline.get() is not None:
+                conn.info.setdefault("profiling_query_start", []).append(time.perf_counter())
+
+        @sa.event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if (timeline := self._timeline.get()) is None or not (starts := conn.info.get("profiling_query_start")):
+                return
+            start = starts.pop()
+            timeline.append({
+                "start": start,
+                "duration_ms": (time.perf_counter() - start) * 1000,
+                "statement": statement[:RouteProfiler.MAX_STATEMENT_LENGTH],
+                "rows": cursor.rowcount,
+            })
+
+    @property
+    def settings(self) -> ProfilingSettings | None:
+        if self.r is None or time.monotonic() - self._refreshed < RouteProfiler.REFRESH_SECONDS:
+            return self._settings
+        self._refreshed = time.monotonic()
+        if (raw := self.r.get(RouteProfiler.SETTINGS_KEY)) is None:
+            self._settings = None
+        else:
+            self._settings = ProfilingSettings(**json.loads(raw))  # type: ignore[arg-type]
+        return self._settings
+
+    def enable(self, settings: ProfilingSettings, max_profiles: int, ttl_seconds: int = 3600):
+        if self.r is None:
+            raise RuntimeError("You need to call connect() before using the profiler.")
+        with self.r.pipeline(transaction=True) as pipe:
+            pipe.set(RouteProfiler.SETTINGS_KEY, json.dumps(asdict(settings)), ex=ttl_seconds)
+            pipe.set(RouteProfiler.REMAINING_KEY, max_profiles, ex=ttl_seconds)
+            pipe.execute()
+        self._refreshed = 0.0
+
+    def disable(self):
+        if self.r is None:
+            raise RuntimeError("You need to call connect() before using the profiler.")
+        self.r.delete(RouteProfiler.SETTINGS_KEY, RouteProfiler.REMAINING_KEY)
+        self._settings = None
+        self._refreshed = 0.0
+
+    @property
+    def remaining(self) -> int:
+        if self.r is None or (remaining := self.r.get(RouteProfiler.REMAINING_KEY)) is None:
+            return 0
+        return int(remaining)  # type: ignore[arg-type]
+
+    def should_profile(self, route: str, user_id: int | None) -> bool:
+        if (settings := self.settings) is None:
+            return False
+        if settings.route is not None and not fnmatch.fnmatchcase(route, settings.route):
+            return False
+        if settings.user_id is not None and settings.user_id != user_id:
+            return False
+        if random.random() >= settings.sample_rate:
+            return False
+
+        # budget shared by all workers, profiling stops when it is used up
+        if self.r.decr(RouteProfiler.REMAINING_KEY) < 0:  # type: ignore[union-attr, operator]
+            self.disable()
+            return False
+        return True
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", os.path.basename(code.co_filename))
+        return f"{module}:{code.co_name}"
+
+    @contextmanager
+    def profile(self, route: str, method: str, url: str, user_id: int | None):
+        settings = self.settings or ProfilingSettings()
+        thread_id = threading.get_ident()
+        stacks: Counter[str] = Counter()
+        stop = threading.Event()
+
+        def sample():
+            interval = settings.interval_ms / 1000
+            while not stop.wait(interval):
+                if (frame := sys._current_frames().get(thread_id)) is None:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(RouteProfiler._frame_label(frame))
+                    frame = frame.f_back
+                stacks[";".join(reversed(labels))] += 1
+
+        timeline: list[dict] = []
+        token = self._timeline.set(timeline)
+        sampler = threading.Thread(target=sample, name="route-profiler", daemon=True)
+        started = datetime.now()
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            stop.set()
+            sampler.join()
+            self._timeline.reset(token)
+            self._save(
+                meta=dict(
+                    route=route, method=method, url=url, user_id=user_id, started=started.isoformat(),
+                    duration_ms=duration * 1000, interval_ms=settings.interval_ms, samples=sum(stacks.values()),
+                    sql_count=len(timeline), sql_ms=sum(q["duration_ms"] for q in timeline),
+                ),
+                sql=[dict(q, start=(q["start"] - start) * 1000) for q in timeline],
+                stacks=stacks,
+            )
+
+    @staticmethod
+    def top_functions(stacks: Counter[str], limit: int = 30) -> list[dict]:
+        """Self and total sample counts per function."""
+        self_samples: Counter[str] = Counter()
+        total_samples: Counter[str] = Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(";")
+            self_samples[frames[-1]] += count
+            for frame in set(frames):
+                total_samples[frame] += count
+        return [
+            dict(function=function, self=self_samples[function], total=total)
+            for function, total in sorted(total_samples.items(), key=lambda item: (-self_samples[item[0]], -item[1]))[:limit]
+        ]
+
+    def _save(self, meta: dict, sql: list[dict], stacks: Counter[str]):
+        if self.folder is None:
+            return
+        profile_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid4().hex[:8]}"
+        with open(self.folder / f"{profile_id}.folded", "w") as f:
+            f.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        with open(self.folder / f"{profile_id}.json", "w") as f:
+            json.dump(dict(id=profile_id, meta=meta, sql=sql, top=RouteProfiler.top_functions(stacks)), f)
+
+        for path in sorted(self.folder.glob("*.json"))[:-RouteProfiler.MAX_PROFILES]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".folded").unlink(missing_ok=True)
+
+    def __path(self, profile_id: str, suffix: str) -> Path | None:
+        if self.folder is None or Path(profile_id).name != profile_id:
+            return None
+        if not (path := self.folder / f"{profile_id}{suffix}").exists():
+            return None
+        return path
+
+    def list_profiles(self, limit: int = 100) -> list[dict]:
+        if self.folder is None:
+            return []
+        profiles = []
+        for path in sorted(self.folder.glob("*.json"), reverse=True)[:limit]:
+            with open(path) as f:
+                profiles.append(dict(id=path.stem, **json.load(f)["meta"]))
+        return profiles
+
+    def get(self, profile_id: str) -> dict | None:
+        if (path := self.__path(profile_id, ".json")) is None:
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def stacks_path(self, profile_id: str) -> Path | None:
+        return self.__path(profile_id, ".folded")
+
+    def flame_graph(self, profile_id: str, min_fraction: float = 0.005) -> dict | None:
+        """Collapsed stacks as a tree of `{"name", "value", "children"}`, frames below `min_fraction` are dropped."""
+        if (path := self.stacks_path(profile_id)) is None:
+            return None
+        root: dict = dict(name="all", value=0, children={})
+        with open(path) as f:
+            for line in f:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                root["value"] += int(count)
+                node = root
+                for frame in stack.split(";"):
+                    node = node["children"].setdefault(frame, dict(name=frame, value=0, children={}))
+                    node["value"] += int(count)
+
+        threshold = root["value"] * min_fraction
+
+        def prune(node: dict) -> dict:
+            children = [prune(child) for child in node["children"].values() if child["value"] >= threshold]
+            return dict(name=node["name"], value=node["value"], children=sorted(children, key=lambda c: -c["value"]))
+
+        return prune(root)
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from flask import Flask, Request
+from flask_session.redis import RedisSessionInterface
+from flask_session.base import ServerSideSession
+from flask_session.defaults import Defaults
+
+
+class UserSessionInterface(RedisSessionInterface):
+    """Redis session store that keeps a set of session ids per user (`<prefix>user:<user_id>`),
+    so that all sessions of a user can be revoked without scanning the keyspace."""
+
+    # deletes all sessions listed in the user's set and the set itself
+    __revoke_script = """
+    local sids = redis.call('SMEMBERS', KEYS[1])
+    local deleted = 0
+    for _, sid in ipairs(sids) do
+        deleted = deleted + redis.call('DEL', ARGV[1] .. sid)
+    end
+    redis.call('DEL', KEYS[1])
+    return deleted
+    """
+
+    def __init__(self, app: Flask, *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.__revoke = self.client.register_script(UserSessionInterface.__revoke_script)
+
+    def user_key(self, user_id: int | str) -> str:
+        return f"{self.key_prefix}user:{user_id}"
+
+    def open_session(self, app: Flask, request: Request) -> ServerSideSession:
+        session = super().open_session(app, request)
+        # user the session is currently indexed under, to move the sid when the user logs in/out
+        session.indexed_user_id = dict.get(session, "_user_id")  # type: ignore[attr-defined]
+        return session
+
+    def _upsert_session(self, session_lifetime: timedelta, session: ServerSideSession, store_id: str) -> None:
+        ttl = int(session_lifetime.total_seconds())
+        indexed_user_id = getattr(session, "indexed_user_id", None)
+        user_id = dict.get(session, "_user_id")
+
+        with self.client.pipeline(transaction=True) as pipe:
+            pipe.set(name=store_id, value=self.serializer.encode(session), ex=ttl)
+            if indexed_user_id is not None and indexed_user_id != user_id:
+                pipe.srem(self.user_key(indexed_user_id), session.sid)
+            if user_id is not None:
+                pipe.sadd(self.user_key(user_id), session.sid)
+                # the index lives as long as the most recently active session of the user
+                pipe.expire(self.user_key(user_id), ttl)
+            pipe.execute()
+
+        if user_id is not None and indexed_user_id != user_id:
+            self.prune_user_sessions(user_id)
+        session.indexed_user_id = user_id  # type: ignore[attr-defined]
+
+    def prune_user_sessions(self, user_id: int | str) -> int:
+        """Removes ids of expired sessions from the user's set, O(sessions of the user)."""
+        key = self.user_key(user_id)
+        sids = [sid.decode() if isinstance(sid, bytes) else sid for sid in self.client.smembers(key)]  # type: ignore[union-attr]
+        if not sids:
+            return 0
+
+        with self.client.pipeline(transaction=False) as pipe:
+            for sid in sids:
+                pipe.exists(self._get_store_id(sid))
+            exists = pipe.execute()
+
+        if (expired := [sid for sid, e in zip(sids, exists) if not e]):
+            self.client.srem(key, *expired)
+        return len(expired)
+
+    def delete_user_sessions(self, user_id: int | str) -> int:
+        return self.__revoke(keys=[self.user_key(user_id)], args=[self.key_prefix])  # type: ignore[return-value]
+
+    @classmethod
+    def from_app(cls, app: Flask, client) -> "UserSessionInterface":
+        config = app.config
+        return cls(
+            app,
+            client=client,
+            key_prefix=config.get("SESSION_KEY_PREFIX", Defaults.SESSION_KEY_PREFIX),
+            use_signer=config.get("SESSION_USE_SIGNER", Defaults.SESSION_USE_SIGNER),
+            permanent=config.get("SESSION_PERMANENT", Defaults.SESSION_PERMANENT),
+            sid_length=config.get("SESSION_ID_LENGTH", Defaults.SESSION_ID_LENGTH),
+            serialization_format=config.get("SESSION_SERIALIZATION_FORMAT", Defaults.SESSION_SERIALIZATION_FORMAT),
+        )
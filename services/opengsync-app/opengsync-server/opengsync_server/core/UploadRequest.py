@@ -0,0 +1,55 @@
+import io
+import os
+import hashlib
+import tempfile
+from pathlib import Path
+
+from flask import Request
+
+
+class UploadStream(io.BufferedRandom):
+    """Temporary file that receives an uploaded file while the multipart body is parsed.
+    Size and sha256 are computed while the chunks are written, bytes above `max_size_bytes` are dropped."""
+    def __init__(self, directory: Path, max_size_bytes: int):
+        fd, path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        super().__init__(io.FileIO(fd, "w+b"))
+        self.path = Path(path)
+        self.max_size_bytes = max_size_bytes
+        self.size_bytes = 0
+        self.committed = False
+        self.__hash = hashlib.sha256()
+
+    @property
+    def too_large(self) -> bool:
+        return self.size_bytes > self.max_size_bytes
+
+    @property
+    def sha256(self) -> str:
+        return self.__hash.hexdigest()
+
+    def write(self, buffer) -> int:  # type: ignore[override]
+        n = len(buffer)
+        self.size_bytes += n
+        if self.too_large:
+            return n
+        self.__hash.update(buffer)
+        return super().write(buffer)
+
+    def close(self) -> None:
+        super().close()
+        if not self.committed:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+class UploadRequest(Request):
+    """Streams uploaded files to a staging folder on the media volume instead of memory/tmp,
+    so that they can be moved into the media folder without copying."""
+    def _get_file_stream(
+        self, total_content_length: int | None, content_type: str | None,
+        filename: str | None = None, content_length: int | None = None,
+    ):
+        from .. import file_handler
+        return UploadStream(file_handler.staging_folder, file_handler.max_upload_size_bytes)
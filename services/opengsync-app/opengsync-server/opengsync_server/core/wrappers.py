@@ -1,4 +1,5 @@
 import os
+import time
 from typing import Callable, Literal, Any, Sequence
 from functools import wraps
 import traceback
@@ -8,7 +9,7 @@ from flask_htmx import make_response
 from flask_login import login_required as login_required_f, current_user
 from flask_limiter.errors import RateLimitExceeded
 
-from opengsync_db import DBHandler
+from opengsync_db import DBHandler, query_source
 from opengsync_db.categories import HTTPResponse
 from opengsync_db import exceptions as db_exceptions
 
@@ -61,7 +62,7 @@ def _route_decorator(
     limit_override: bool = False,
 ) -> Callable[[Callable[..., Any]], Response]:
     """Base decorator for all route types."""
-    from .. import route_cache, flash_cache, limiter
+    from .. import route_cache, flash_cache, limiter, metrics, profiler
 
     def decorator(fnc: Callable[..., Any]) -> Response:
         routes, current_user_required = rt.infer_route(fnc, base=route)
@@ -112,8 +113,7 @@ def _route_decorator(
                 **(cache_kwargs or {})
             )(fnc)
 
-        @wraps(fnc)
-        def wrapper(*args, **kwargs):
+        def handler(*args, **kwargs):
             if debug:
                 log_buffer.start(str(request.url_rule))
             else:
@@ -155,6 +155,11 @@ def _route_decorator(
                     except ValueError as e:
                         raise serv_exceptions.BadRequestException("Invalid query parameters") from e
                     kwargs |= _args
+                if profiler.settings is not None:
+                    user_id = current_user.id if current_user.is_authenticated else None
+                    if profiler.should_profile(str(request.url_rule), user_id):
+                        with profiler.profile(str(request.url_rule), request.method, request.full_path, user_id):
+                            return _fnc(*args, **kwargs)
                 return _fnc(*args, **kwargs)
             except serv_exceptions.InternalServerErrorException as e:
                 rollback = db.needs_commit if db is not None else False
@@ -188,6 +193,18 @@ def _route_decorator(
 
                 log_buffer.flush()
 
+        @wraps(fnc)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            status = 500
+            try:
+                with query_source(str(request.url_rule)):
+                    rv = handler(*args, **kwargs)
+                status = metrics.status_code(rv)
+                return rv
+            finally:
+                metrics.observe_request(str(request.url_rule), request.method, status, time.perf_counter() - start)
+
         if debug:
             logger.debug(routes)
 
@@ -59,13 +59,13 @@ class ProcessRequestForm(HTMXFlaskForm):
         response_type = RequestResponse.get(self.response_type.data)
 
         if response_type == RequestResponse.ACCEPTED:
-            seq_request = db.seq_requests.process(seq_request.id, SeqRequestStatus.ACCEPTED)
+            seq_request, _ = db.seq_requests.process(seq_request.id, SeqRequestStatus.ACCEPTED)
             flash("Request accepted!", "success")
         elif response_type == RequestResponse.REJECTED:
-            seq_request = db.seq_requests.process(seq_request.id, SeqRequestStatus.REJECTED)
+            seq_request, _ = db.seq_requests.process(seq_request.id, SeqRequestStatus.REJECTED)
             flash("Request rejected!", "info")
         elif response_type == RequestResponse.PENDING_REVISION:
-            seq_request = db.seq_requests.process(seq_request.id, SeqRequestStatus.DRAFT)
+            seq_request, _ = db.seq_requests.process(seq_request.id, SeqRequestStatus.DRAFT)
             flash("Request pending revision!", "info")
         else:
             raise exceptions.InternalServerErrorException()
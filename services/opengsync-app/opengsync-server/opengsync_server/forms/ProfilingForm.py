@@ -0,0 +1,61 @@
+from typing import Optional, Any
+
+from flask import Response, url_for, flash
+from flask_htmx import make_response
+from wtforms import StringField, IntegerField, FloatField
+from wtforms.validators import DataRequired, NumberRange, Optional as OptionalValidator
+
+from opengsync_db import models
+from .. import db, profiler
+from ..core.Profiler import ProfilingSettings
+from .HTMXFlaskForm import HTMXFlaskForm
+
+
+class ProfilingForm(HTMXFlaskForm):
+    _template_path = "forms/profiling.html"
+    _form_label = "profiling_form"
+
+    route = StringField("Route", validators=[OptionalValidator()], description="URL rule or glob pattern, e.g. '/htmx/seq_requests/*'. Empty for all routes.")
+    user_id = IntegerField("User ID", validators=[OptionalValidator()], description="Only profile requests of this user.")
+    sample_rate = FloatField("Sample Rate", default=1.0, validators=[DataRequired(), NumberRange(min=0.001, max=1.0)], description="Fraction of matching requests to profile.")
+    max_profiles = IntegerField("Max Profiles", default=10, validators=[DataRequired(), NumberRange(min=1, max=200)])
+    ttl_minutes = IntegerField("Expires After", default=60, validators=[DataRequired(), NumberRange(min=1, max=24 * 60)], description="Minutes")
+    interval_ms = FloatField("Sampling Interval", default=5.0, validators=[DataRequired(), NumberRange(min=1.0, max=100.0)], description="ms")
+
+    def __init__(self, formdata: Optional[dict[str, Any]] = None):
+        super().__init__(formdata=formdata)
+
+    def prepare(self) -> None:
+        if (settings := profiler.settings) is not None:
+            self.route.data = settings.route
+            self.user_id.data = settings.user_id
+            self.sample_rate.data = settings.sample_rate
+            self.interval_ms.data = settings.interval_ms
+
+    def validate(self) -> bool:
+        if not super().validate():
+            return False
+        
+        if self.user_id.data is not None and db.users.get(self.user_id.data) is None:
+            self.user_id.errors = ("User not found.",)
+            return False
+        
+        return True
+
+    def process_request(self, user: models.User) -> Response:
+        if not self.validate():
+            return self.make_response()
+        
+        profiler.enable(
+            ProfilingSettings(
+                route=self.route.data.strip() if self.route.data and self.route.data.strip() else None,
+                user_id=self.user_id.data,
+                sample_rate=self.sample_rate.data,  # type: ignore
+                interval_ms=self.interval_ms.data,  # type: ignore
+                enabled_by=user.id,
+            ),
+            max_profiles=self.max_profiles.data,  # type: ignore
+            ttl_seconds=self.ttl_minutes.data * 60,  # type: ignore
+        )
+        flash("Profiling enabled.", "success")
+        return make_response(redirect=url_for("profiling_page.profiles"))
@@ -69,19 +69,16 @@ class SampleAttributeTableForm(HTMXFlaskForm):
             self.spreadsheet.add_general_error("Duplicate column names",)
             return False
             
-        for idx, row in df.iterrows():
-            if (sample := db.samples.get(row["sample_id"])) is None:
-                self.spreadsheet.add_error(idx, "sample_id", InvalidCellValue(f"Sample with ID {row['id']} does not exist"))
-                continue
-            
-            if sample.project_id != self.project.id:
-                self.spreadsheet.add_error(idx, "sample_id", InvalidCellValue(f"Sample with ID {row['id']} does not belong to this project"))
-                continue
-            
-            if sample.name != row["sample_name"]:
-                self.spreadsheet.add_error(idx, "sample_name", InvalidCellValue(f"Sample name does not match sample with ID {row['id']}"))
-                continue
-            
+        project_samples = pd.Series({sample.id: sample.name for sample in self.project.samples}, dtype="string")
+
+        for idx in df.index[~df["sample_id"].isin(project_samples.index)]:
+            self.spreadsheet.add_error(idx, "sample_id", InvalidCellValue(f"Sample with ID {df.at[idx, 'sample_id']} does not belong to this project"))
+
+        known = df["sample_id"].isin(project_samples.index)
+        mismatch = df.loc[known, "sample_id"].map(project_samples) != df.loc[known, "sample_name"]
+        for idx in mismatch.index[mismatch]:
+            self.spreadsheet.add_error(idx, "sample_name", InvalidCellValue(f"Sample name does not match sample with ID {df.at[idx, 'sample_id']}"))
+
         if len(self.spreadsheet._errors) > 0:
             return False
         
@@ -93,17 +90,9 @@ class SampleAttributeTableForm(HTMXFlaskForm):
         if not self.validate():
             return self.make_response()
 
-        for idx, row in self.df.iterrows():
-            sample_id = row["sample_id"]
-            for attribute_name in self.df.columns:
-                if attribute_name in ["sample_id", "sample_name"]:
-                    continue
-                attribute_type = AttributeType.get_attribute_by_label(attribute_name)
-                if pd.isna(val := row[attribute_name]):
-                    if (_ := db.samples.get_attribute(sample_id=row["sample_id"], name=attribute_name)) is not None:
-                        db.samples.delete_attribute(sample_id=sample_id, name=attribute_name)
-                else:
-                    db.samples.set_attribute(sample_id=sample_id, name=attribute_name, value=val, type=attribute_type)
+        attributes = self.df.drop(columns=["sample_name"]).melt(id_vars="sample_id", var_name="name", value_name="value")
+        attributes["type"] = attributes["name"].map(AttributeType.get_attribute_by_label)
+        db.samples.set_attributes(attributes)
 
         flash("Sample attributes updated", "success")
         return make_response(redirect=url_for("projects_page.project", project_id=self.project.id, tab="project-attributes-tab"))
@@ -5,8 +5,10 @@ import json
 
 from flask import url_for
 from wtforms import StringField
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql.base import ExecutableOption
 
-from opengsync_db import models
+from opengsync_db import models, exceptions as db_exceptions
 from opengsync_db.categories import (
     SampleStatusEnum, LibraryStatusEnum, PoolStatusEnum, SampleStatus, LibraryStatus, PoolStatus,
     LibraryTypeEnum
@@ -156,6 +158,10 @@ class SelectSamplesForm(MultiStepForm):
         self.__library_table: pd.DataFrame | None = None
         self.__pool_table: pd.DataFrame | None = None
         self.__lane_table: pd.DataFrame | None = None
+        self.__samples: dict[int, models.Sample] | None = None
+        self.__libraries: dict[int, models.Library] | None = None
+        self.__pools: dict[int, models.Pool] | None = None
+        self.__lanes: dict[int, models.Lane] | None = None
         
     def validate(self) -> bool:
         validated = super().validate()
@@ -250,11 +256,18 @@ class SelectSamplesForm(MultiStepForm):
             pool_data["avg_fragment_size"] = []
             lane_data["avg_fragment_size"] = []
 
+        try:
+            self.__samples = db.samples.get_many(self.sample_ids)
+            self.__libraries = db.libraries.get_many(self.library_ids)
+            self.__pools = db.pools.get_many(self.pool_ids)
+            self.__lanes = db.lanes.get_many(self.lane_ids, options=joinedload(models.Lane.experiment))
+        except db_exceptions.ElementDoesNotExist as e:
+            logger.error(e)
+            self.error_dummy.errors = [str(e)]
+            return False
+
         for sample_id in self.sample_ids:
-            if (sample := db.samples.get(sample_id)) is None:
-                logger.error(f"Sample {sample_id} not found")
-                raise ValueError(f"Sample {sample_id} not found")
-            
+            sample = self.__samples[sample_id]
             sample_data["id"].append(sample.id)
             sample_data["name"].append(sample.name)
             sample_data["status_id"].append(sample.status_id)
@@ -264,10 +277,7 @@ class SelectSamplesForm(MultiStepForm):
                 sample_data["avg_fragment_size"].append(sample.avg_fragment_size)
 
         for library_id in self.library_ids:
-            if (library := db.libraries.get(library_id)) is None:
-                logger.error(f"Library {library_id} not found")
-                raise ValueError(f"Library {library_id} not found")
-
+            library = self.__libraries[library_id]
             library_data["id"].append(library.id)
             library_data["name"].append(library.name)
             library_data["status_id"].append(library.status_id)
@@ -277,10 +287,7 @@ class SelectSamplesForm(MultiStepForm):
                 library_data["avg_fragment_size"].append(library.avg_fragment_size)
 
         for pool_id in self.pool_ids:
-            if (pool := db.pools.get(pool_id)) is None:
-                logger.error(f"Pool {pool_id} not found")
-                raise ValueError(f"Pool {pool_id} not found")
-
+            pool = self.__pools[pool_id]
             pool_data["id"].append(pool.id)
             pool_data["name"].append(pool.name)
             pool_data["status_id"].append(pool.status_id)
@@ -290,10 +297,7 @@ class SelectSamplesForm(MultiStepForm):
                 pool_data["avg_fragment_size"].append(pool.avg_fragment_size)
 
         for lane_id in self.lane_ids:
-            if (lane := db.lanes.get(lane_id)) is None:
-                logger.error(f"Lane {lane_id} not found")
-                raise ValueError(f"Lane {lane_id} not found")
-
+            lane = self.__lanes[lane_id]
             lane_data["id"].append(lane.id)
             lane_data["name"].append(f"{lane.experiment.name}-L{lane.number}")
             lane_data["status_id"].append(None)
@@ -337,42 +341,30 @@ class SelectSamplesForm(MultiStepForm):
             raise exceptions.InternalServerErrorException("Form not validated, call .validate() first..")
         return self.__lane_table
     
-    def get_libraries(self) -> list[models.Library]:
-        libraries = []
-        for _, row in self.library_table.iterrows():
-            if (library := db.libraries.get(int(row["id"]))) is None:
-                logger.error(f"Library {library} not found in database")
-                raise Exception("Library not found in database")
-            libraries.append(library)
-
-        return libraries
+    def get_libraries(self, options: ExecutableOption | None = None) -> list[models.Library]:
+        """Libraries in the order of `library_table`, fetched with a single query."""
+        ids = self.library_table["id"].astype(int).tolist()
+        if self.__libraries is None or options is not None:
+            self.__libraries = db.libraries.get_many(ids, options=options)
+        return [self.__libraries[library_id] for library_id in ids]
     
-    def get_samples(self) -> list[models.Sample]:
-        samples = []
-        for _, row in self.sample_table.iterrows():
-            if (sample := db.samples.get(int(row["id"]))) is None:
-                logger.error(f"Sample {sample} not found in database")
-                raise Exception("Sample not found in database")
-            samples.append(sample)
-
-        return samples
+    def get_samples(self, options: ExecutableOption | None = None) -> list[models.Sample]:
+        """Samples in the order of `sample_table`, fetched with a single query."""
+        ids = self.sample_table["id"].astype(int).tolist()
+        if self.__samples is None or options is not None:
+            self.__samples = db.samples.get_many(ids, options=options)
+        return [self.__samples[sample_id] for sample_id in ids]
     
-    def get_pools(self) -> list[models.Pool]:
-        pools = []
-        for _, row in self.pool_table.iterrows():
-            if (pool := db.pools.get(int(row["id"]))) is None:
-                logger.error(f"Pool {pool} not found in database")
-                raise Exception("Pool not found in database")
-            pools.append(pool)
-
-        return pools
+    def get_pools(self, options: ExecutableOption | None = None) -> list[models.Pool]:
+        """Pools in the order of `pool_table`, fetched with a single query."""
+        ids = self.pool_table["id"].astype(int).tolist()
+        if self.__pools is None or options is not None:
+            self.__pools = db.pools.get_many(ids, options=options)
+        return [self.__pools[pool_id] for pool_id in ids]
     
-    def get_lanes(self) -> list[models.Lane]:
-        lanes = []
-        for _, row in self.lane_table.iterrows():
-            if (lane := db.lanes.get(int(row["id"]))) is None:
-                logger.error(f"Lane {lane} not found in database")
-                raise Exception("Lane not found in database")
-            lanes.append(lane)
-
-        return lanes
\ No newline at end of file
+    def get_lanes(self, options: ExecutableOption | None = None) -> list[models.Lane]:
+        """Lanes in the order of `lane_table`, fetched with a single query."""
+        ids = self.lane_table["id"].astype(int).tolist()
+        if self.__lanes is None or options is not None:
+            self.__lanes = db.lanes.get_many(ids, options=options)
+        return [self.__lanes[lane_id] for lane_id in ids]
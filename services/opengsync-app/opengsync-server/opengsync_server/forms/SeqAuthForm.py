@@ -10,8 +10,7 @@ from flask_wtf.file import FileAllowed
 from opengsync_db.categories import MediaFileType
 from opengsync_db import models
 
-from .. import logger, db
-from ..core.RunTime import runtime
+from .. import logger, db, file_handler
 from .HTMXFlaskForm import HTMXFlaskForm
 
 
@@ -36,8 +35,7 @@ class SeqAuthForm(HTMXFlaskForm):
         
         MAX_MBYTES = 5
         max_bytes = MAX_MBYTES * 1024 * 1024
-        self.size_bytes = len(self.file.data.read())
-        self.file.data.seek(0)
+        self.size_bytes = file_handler.upload_size(self.file.data)
 
         if self.size_bytes > max_bytes:
             self.file.errors = (f"File size exceeds {MAX_MBYTES} MB",)
@@ -57,10 +55,10 @@ class SeqAuthForm(HTMXFlaskForm):
             extension=extension,
             uploader_id=user.id,
             size_bytes=self.size_bytes,
+            sha256=file_handler.upload_sha256(self.file.data),
             seq_request_id=self.seq_request.id,
         )
-        filepath = os.path.join(runtime.app.media_folder, db_file.path)
-        self.file.data.save(filepath)
+        filepath = file_handler.commit_blob(self.file.data, db_file.path)
 
         flash("Authorization form uploaded!", "success")
         logger.debug(f"Uploaded sequencing authorization form for sequencing request '{self.seq_request.name}': {filepath}")
@@ -7,7 +7,7 @@ import pandas as pd
 from flask_wtf import FlaskForm
 from wtforms import FileField
 
-from .. import logger
+from .. import logger, file_handler
 from ..tools.spread_sheet_components import SpreadSheetColumn, SpreadSheetException
 
 
@@ -63,8 +63,7 @@ class SpreadsheetFile(FlaskForm):
             self.file.errors = ["File is required."]
             return False
         max_bytes = SpreadsheetFile.MAX_SIZE_MBYTES * 1024 * 1024
-        size_bytes = len(self.file.data.read())
-        self.file.data.seek(0)
+        size_bytes = file_handler.upload_size(self.file.data)
 
         self.file.errors: list[str] = []  # type: ignore
 
@@ -86,6 +85,8 @@ class SpreadsheetFile(FlaskForm):
             self.file.errors = list(self.file.errors)
             return False
         
+        # parsed from the staged upload (no in-memory copy), the univer preview reads the stored blob once more
+        # in the background because the read-only workbook cannot be shared with the snapshot worker
         if ext == "xlsx":
             self.__df: pd.DataFrame = pd.read_excel(self.file.data, sheet_name=self.sheet_name)  # type: ignore
             if isinstance(self.__df, dict):
@@ -1,5 +1,4 @@
 import os
-from uuid_extensions import uuid7str
 from typing import Optional
 
 from flask import Response, flash, url_for
@@ -9,9 +8,8 @@ from wtforms import SelectField
 from opengsync_db import models
 from opengsync_db.categories import MediaFileType
 
-from ...core.RunTime import runtime
 from .FileInputForm import FileInputForm
-from ... import db, logger
+from ... import db, logger, univer_cache, file_handler
 
 
 class ExperimentAttachmentForm(FileInputForm):
@@ -40,20 +38,18 @@ class ExperimentAttachmentForm(FileInputForm):
 
         filename, extension = os.path.splitext(self.file.data.filename)
 
-        _uuid = uuid7str()
-        filepath = os.path.join(runtime.app.media_folder, file_type.dir, f"{_uuid}{extension}")
-        self.file.data.save(filepath)
-        size_bytes = os.stat(filepath).st_size
-
         db_file = db.media_files.create(
             name=filename,
             type=file_type,
             extension=extension,
             uploader_id=user.id,
-            size_bytes=size_bytes,
-            uuid=_uuid,
+            size_bytes=file_handler.upload_size(self.file.data),
+            sha256=file_handler.upload_sha256(self.file.data),
             experiment_id=self.experiment.id
         )
+        filepath = file_handler.commit_blob(self.file.data, db_file.path)
+        if db_file.extension == ".xlsx":
+            univer_cache.submit(filepath, db_file.uuid)
 
         if self.comment.data and self.comment.data.strip() != "":
             _ = db.comments.create(
@@ -7,6 +7,7 @@ from flask import Response
 
 from opengsync_db import models
 from opengsync_db.categories import MediaFileType
+from ... import file_handler
 from ..HTMXFlaskForm import HTMXFlaskForm
 
 
@@ -35,8 +36,7 @@ class FileInputForm(HTMXFlaskForm):
             return False
         
         max_bytes = self.max_size_mbytes * 1024 * 1024
-        size_bytes = len(self.file.data.read())
-        self.file.data.seek(0)
+        size_bytes = file_handler.upload_size(self.file.data)
 
         if size_bytes > max_bytes:
             self.file.errors = (f"File size exceeds {self.max_size_mbytes} MB",)
@@ -9,6 +9,8 @@ from wtforms.validators import DataRequired, Length, Optional as OptionalValidat
 from opengsync_db import models
 from opengsync_db.categories import IndexType
 from ... import logger, db  # noqa
+from ...core.RunTime import runtime
+from ...tools import utils
 from ..HTMXFlaskForm import HTMXFlaskForm
 
 
@@ -93,10 +95,12 @@ class IndexKitForm(HTMXFlaskForm):
             logger.error("Index kit is not set.")
             raise ValueError("Index kit is not set.")
         
+        previous_type = self.index_kit.type
         self.index_kit.name = self.name.data  # type: ignore
         self.index_kit.identifier = self.identifier.data  # type: ignore
         self.index_kit.type_id = self.index_type_id.data  # type: ignore
         db.index_kits.update(self.index_kit)
+        utils.update_index_kits(db, runtime.app.app_data_folder, types=list({previous_type, self.index_kit.type}))
         flash("Index kit updated successfully.", "success")
         return make_response(redirect=url_for("kits_page.index_kit", index_kit_id=self.index_kit.id))
         
@@ -107,6 +111,7 @@ class IndexKitForm(HTMXFlaskForm):
             type=IndexType.get(self.index_type_id.data),
             supported_protocols=[]
         )
+        utils.update_index_kits(db, runtime.app.app_data_folder, types=[index_kit.type])
         flash("Index kit created successfully.", "success")
         return make_response(redirect=url_for("kits_page.index_kit", index_kit_id=index_kit.id))
     
@@ -1,6 +1,5 @@
 import os
 import pandas as pd
-from uuid_extensions import uuid7str
 
 from flask import Response, flash, url_for
 from flask_wtf.file import FileField, FileAllowed
@@ -12,9 +11,8 @@ from flask_wtf import FlaskForm
 from opengsync_db import models
 from opengsync_db.categories import MediaFileType, PoolStatus
 
-from .... import db, logger  # noqa
+from .... import db, logger, file_handler  # noqa
 from ....core import exceptions
-from ....core.RunTime import runtime
 from ...MultiStepForm import MultiStepForm
 
 
@@ -63,11 +61,6 @@ class CompleteBAForm(MultiStepForm):
         metadata = metadata.copy()
         filename, extension = os.path.splitext(report.data.filename)
         
-        file_uuid = uuid7str()
-        new_path = os.path.join(runtime.app.media_folder, MediaFileType.BIOANALYZER_REPORT.dir, f"{file_uuid}{extension}")
-        report.data.save(new_path)
-        size_bytes = os.stat(new_path).st_size
-
         if (lab_prep_id := metadata.get("lab_prep_id")) is not None:
             if db.lab_preps.get(lab_prep_id) is None:
                 logger.error(f"{uuid}: lab_prep_id {lab_prep_id} not found")
@@ -76,17 +69,18 @@ class CompleteBAForm(MultiStepForm):
         ba_file = db.media_files.create(
             name=filename,
             extension=extension,
-            size_bytes=size_bytes,
+            size_bytes=file_handler.upload_size(report.data),
+            sha256=file_handler.upload_sha256(report.data),
             type=MediaFileType.BIOANALYZER_REPORT,
             uploader_id=user.id,
-            uuid=file_uuid,
             lab_prep_id=lab_prep_id
         )
+        file_handler.commit_blob(report.data, ba_file.path)
 
         metadata["ba_report"] = {
             "filename": filename,
             "extension": extension,
-            "uuid": file_uuid,
+            "uuid": ba_file.uuid,
         }
 
         for sub_form in sample_fields:
@@ -14,7 +14,7 @@ from flask_wtf import FlaskForm
 
 from opengsync_db import models
 
-from .... import db, logger  # noqa
+from .... import db, logger, file_handler  # noqa
 from ....core import exceptions
 from ...MultiStepForm import MultiStepForm
 from .ParseBAExcelFile import ParseBAExcelFile
@@ -74,8 +74,7 @@ class UploadBAForm(MultiStepForm):
                 return False
             
             max_bytes = self.max_size_mbytes * 1024 * 1024
-            size_bytes = len(self.pdf.data.read())
-            self.pdf.data.seek(0)
+            size_bytes = file_handler.upload_size(self.pdf.data)
 
             if size_bytes > max_bytes:
                 self.pdf.errors = (f"File size exceeds {self.max_size_mbytes} MB",)
@@ -4,7 +4,7 @@ from flask_htmx import make_response
 from wtforms import FloatField, FieldList, FormField, IntegerField
 from wtforms.validators import DataRequired, Optional as OptionalValidator
 
-from opengsync_db import models
+from opengsync_db import models, pooling
 
 from .... import db
 from ...HTMXFlaskForm import HTMXFlaskForm
@@ -35,10 +35,8 @@ class DilutePoolsForm(HTMXFlaskForm):
         self.df = db.pd.get_experiment_pools(experiment.id)
         
     def prepare(self):
-        self.df["molarity"] = self.df["qubit_concentration"] / (self.df["avg_fragment_size"] * 660) * 1_000_000
-        self.df["molarity_color"] = "cemm-green"
-        self.df.loc[(self.df["molarity"] < models.Pool.warning_min_molarity) | (models.Pool.warning_max_molarity < self.df["molarity"]), "molarity_color"] = "cemm-yellow"
-        self.df.loc[(self.df["molarity"] < models.Pool.error_min_molarity) | (models.Pool.error_max_molarity < self.df["molarity"]), "molarity_color"] = "cemm-red"
+        self.df["molarity"] = pooling.molarity(self.df["qubit_concentration"], self.df["avg_fragment_size"])
+        self.df["molarity_color"] = pooling.molarity_color(self.df["molarity"], models.Pool)
 
         for i in range(self.df.shape[0]):
             if i > len(self.input_fields) - 1:
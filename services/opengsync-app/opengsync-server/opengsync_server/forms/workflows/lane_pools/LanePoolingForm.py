@@ -9,7 +9,7 @@ from flask_wtf import FlaskForm
 from wtforms import StringField, FloatField, FieldList, FormField, IntegerField
 from wtforms.validators import Optional as OptionalValidator, DataRequired
 
-from opengsync_db import models
+from opengsync_db import models, pooling
 from opengsync_db.categories import MediaFileType
 
 from .... import db, logger
@@ -52,50 +52,27 @@ class LanePoolingForm(HTMXFlaskForm):
         self._context["enumerate"] = enumerate
 
     def prepare(self):
-        df = db.pd.get_experiment_laned_pools(experiment_id=self.experiment.id)
-        df["dilutions"] = None
-        df["sub_form_idx"] = None
+        df = db.pd.get_lane_pooling_table(
+            self.experiment.id, per_lane=True,
+            target_molarity=DEFAULT_TARGET_NM, total_volume=DEFAULT_TOTAL_VOLUME_TARGET
+        )
+        df["sub_form_idx"] = range(len(df))
 
-        counter = 0
-        for i, ((lane, lane_id), _df) in enumerate(df.groupby(["lane", "lane_id"])):
+        for i, lane in enumerate(df["lane"].unique()):
             if i > len(self.lane_sub_forms) - 1:
                 self.lane_sub_forms.append_entry()
-            
-            lane_sub_form: LaneSubForm = self.lane_sub_forms[i]  # type: ignore
-            lane_sub_form.lane.data = lane
-
-            for idx, row in _df.iterrows():
-                if counter > len(self.sample_sub_forms) - 1:
-                    self.sample_sub_forms.append_entry()
-
-                sample_sub_form = self.sample_sub_forms[counter]
-                sample_sub_form.pool_id.data = row["pool_id"]
-                sample_sub_form.lane.data = lane
-                sample_sub_form.m_reads.data = row["num_m_reads"]
-                df.at[idx, "sub_form_idx"] = counter
-
-                if (pool := db.pools.get(row["pool_id"])) is None:
-                    logger.error(f"lane_pools_workflow: Pool with id {row['pool_id']} does not exist")
-                    raise ValueError(f"Pool with id {row['pool_id']} does not exist")
-                
-                df.at[idx, "dilutions"] = [("Orig.", pool.qubit_concentration, pool.molarity, "")]
-                sample_sub_form.dilution.data = "Orig."
-                
-                for dilution in pool.dilutions:
-                    sample_sub_form.dilution.data = dilution.identifier
-                    df.at[idx, "dilutions"].append((dilution.identifier, dilution.qubit_concentration, dilution.molarity(pool), dilution.timestamp_str()))
-                    df.at[idx, "qubit_concentration"] = dilution.qubit_concentration
-
-                counter += 1
-        
-        # https://knowledge.illumina.com/library-preparation/dna-library-prep/library-preparation-dna-library-prep-reference_material-list/000001240
-        df["molarity"] = df["qubit_concentration"] / (df["avg_fragment_size"] * 660) * 1_000_000
+            self.lane_sub_forms[i].lane.data = lane  # type: ignore
 
-        df["share"] = None
-        for _, _df in df.groupby("lane"):
-            df.loc[_df.index, "share"] = _df["num_m_reads"] / _df["num_m_reads"].sum()
+        for i, row in enumerate(df[["pool_id", "lane", "num_m_reads", "dilution"]].itertuples(index=False)):
+            if i > len(self.sample_sub_forms) - 1:
+                self.sample_sub_forms.append_entry()
+
+            sample_sub_form = self.sample_sub_forms[i]
+            sample_sub_form.pool_id.data = row.pool_id
+            sample_sub_form.lane.data = row.lane
+            sample_sub_form.m_reads.data = row.num_m_reads
+            sample_sub_form.dilution.data = row.dilution
 
-        df["pipet"] = DEFAULT_TARGET_NM / df["molarity"] * df["share"] * DEFAULT_TOTAL_VOLUME_TARGET
         self._context["df"] = df
     
     def process_request(self, user: models.User) -> Response:
@@ -162,12 +139,7 @@ class LanePoolingForm(HTMXFlaskForm):
             data["dilution"].append(link.dilution.identifier if link.dilution is not None else "Orig.")
         
         df = pd.DataFrame(data)
-        df["share"] = None
-        for lane, _df in df.groupby(["lane", "lane_id"]):
-            df.loc[_df.index, "share"] = _df["num_m_reads"].values / _df["num_m_reads"].sum()
-
-        df["molarity"] = df["qubit_concentration"] / (df["avg_fragment_size"] * 660) * 1_000_000
-        df["pipet"] = df["target_concentration"] / df["molarity"] * df["share"] * df["target_total_volume"]
+        df = pooling.pipetting_table(df, target_molarity=df["target_concentration"], total_volume=df["target_total_volume"], by="lane_id")
 
         filename = f"lane_pooling_{self.experiment.id}"
         extension = ".tsv"
@@ -9,7 +9,7 @@ from flask_wtf import FlaskForm
 from wtforms import StringField, FloatField, FieldList, FormField, IntegerField
 from wtforms.validators import Optional as OptionalValidator, DataRequired
 
-from opengsync_db import models
+from opengsync_db import models, pooling
 from opengsync_db.categories import MediaFileType
 
 from .... import db, logger
@@ -46,43 +46,19 @@ class UnifiedLanePoolingForm(HTMXFlaskForm):
         self._context["enumerate"] = enumerate
 
     def prepare(self):
-        df = db.pd.get_experiment_laned_pools(self.experiment.id)
-        df["original_qubit_concentration"] = df["qubit_concentration"]
-        df["dilutions"] = None
-
-        df = df.drop(columns=["lane"]).drop_duplicates(subset=["pool_id"]).reset_index(drop=True)
+        df = db.pd.get_lane_pooling_table(
+            self.experiment.id, per_lane=False,
+            target_molarity=DEFAULT_TARGET_NM, total_volume=DEFAULT_TOTAL_VOLUME_TARGET
+        )
 
-        for i, (idx, row) in enumerate(df.iterrows()):
+        for i, row in enumerate(df[["pool_id", "num_m_reads", "dilution"]].itertuples(index=False)):
             if i > len(self.sample_sub_forms) - 1:
                 self.sample_sub_forms.append_entry()
 
             sample_sub_form = self.sample_sub_forms[i]
-            sample_sub_form.pool_id.data = row["pool_id"]
-            sample_sub_form.m_reads.data = row["num_m_reads"] * self.experiment.num_lanes
-
-            if (pool := db.pools.get(row["pool_id"])) is None:
-                logger.error(f"lane_pools_workflow: Pool with id {row['pool_id']} does not exist")
-                raise ValueError(f"Pool with id {row['pool_id']} does not exist")
-            
-            df.at[idx, "dilutions"] = [("Orig.", pool.qubit_concentration, pool.molarity, "")]
-            
-            for dilution in pool.dilutions:
-                sample_sub_form.dilution.data = dilution.identifier
-                df.at[idx, "dilutions"].append((dilution.identifier, dilution.qubit_concentration, dilution.molarity(pool), dilution.timestamp_str()))
-                df.at[idx, "qubit_concentration"] = dilution.qubit_concentration
-        
-        # https://knowledge.illumina.com/library-preparation/dna-library-prep/library-preparation-dna-library-prep-reference_material-list/000001240
-        df["molarity"] = df["qubit_concentration"] / (df["avg_fragment_size"] * 660) * 1_000_000
-
-        df["share"] = df["num_m_reads"] / df["num_m_reads"].sum()
-
-        df["molarity_color"] = "cemm-green"
-        df.loc[df["molarity"] < models.Pool.warning_min_molarity, "molarity_color"] = "cemm-yellow"
-        df.loc[df["molarity"] > models.Pool.warning_max_molarity, "molarity_color"] = "cemm-yellow"
-        df.loc[df["molarity"] < models.Pool.error_min_molarity, "molarity_color"] = "cemm-red"
-        df.loc[df["molarity"] > models.Pool.error_max_molarity, "molarity_color"] = "cemm-red"
-
-        df["pipet"] = DEFAULT_TARGET_NM / df["molarity"] * df["share"] * DEFAULT_TOTAL_VOLUME_TARGET
+            sample_sub_form.pool_id.data = row.pool_id
+            sample_sub_form.m_reads.data = row.num_m_reads * self.experiment.num_lanes
+            sample_sub_form.dilution.data = row.dilution
 
         self._context["df"] = df
     
@@ -140,9 +116,7 @@ class UnifiedLanePoolingForm(HTMXFlaskForm):
                 data["dilution"].append(link.dilution.identifier if link.dilution else "Orig.")
 
         df = pd.DataFrame(data)
-        df["share"] = df["num_m_reads"] / df["num_m_reads"].sum()
-        df["molarity"] = df["qubit_concentration"] / (df["avg_fragment_size"] * 660) * 1_000_000
-        df["pipet"] = df["target_concentration"] / df["molarity"] * df["share"] * df["target_total_volume"]
+        df = pooling.pipetting_table(df, target_molarity=df["target_concentration"], total_volume=df["target_total_volume"])
             
         filename = f"lane_pooling_{self.experiment.id}"
         extension = ".tsv"
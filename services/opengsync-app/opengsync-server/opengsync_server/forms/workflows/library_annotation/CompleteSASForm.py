@@ -188,9 +188,6 @@ class CompleteSASForm(MultiStepForm):
                 group_id=self.seq_request.group_id
             )
 
-        predefined_attrs = [f"_attr_{attr.label}" for attr in AttributeType.as_list()]
-        custom_sample_attributes = [attr for attr in self.sample_table.columns if attr.startswith("_attr_") and attr not in predefined_attrs]
-
         for idx, library_row in self.sample_table.iterrows():
             if pd.notna(library_row["sample_id"]):
                 if (sample := db.samples.get(library_row["sample_id"])) is None:
@@ -205,27 +202,18 @@ class CompleteSASForm(MultiStepForm):
                 )
                 self.sample_table.at[idx, "sample_id"] = sample.id
 
-            for attr in AttributeType.as_list():
-                attr_label = f"_attr_{attr.label}"
-                if attr_label in library_row.keys() and pd.notna(library_row[attr_label]):
-                    sample = db.samples.set_attribute(
-                        sample_id=sample.id,
-                        type=attr,
-                        value=str(library_row[attr_label]),
-                        name=None
-                    )
-
-            for attr_label in custom_sample_attributes:
-                if attr_label in library_row.keys() and pd.notna(library_row[attr_label]):
-                    sample = db.samples.set_attribute(
-                        sample_id=sample.id,
-                        type=AttributeType.CUSTOM,
-                        value=str(library_row[attr_label]),
-                        name=attr_label.removeprefix("_attr_")
-                    )
-
         self.sample_table["sample_id"] = self.sample_table["sample_id"].astype(int)
 
+        # _attr_<label> columns, predefined types by label, all others custom
+        if len(attr_columns := [col for col in self.sample_table.columns if col.startswith("_attr_")]) > 0:
+            attributes = self.sample_table[["sample_id"] + attr_columns].melt(
+                id_vars="sample_id", var_name="name", value_name="value"
+            ).dropna(subset=["value"])
+            attributes["name"] = attributes["name"].str.removeprefix("_attr_")
+            attributes["type"] = attributes["name"].map(AttributeType.get_attribute_by_label)
+            attributes["value"] = attributes["value"].astype(str)
+            db.samples.set_attributes(attributes)
+
         if self.seq_request.submission_type == SubmissionType.POOLED_LIBRARIES:
             if self.pool_table is None:
                 logger.error(f"{self.uuid}: Pool table not found.")
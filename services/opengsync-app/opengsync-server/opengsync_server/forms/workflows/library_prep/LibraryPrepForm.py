@@ -1,4 +1,3 @@
-import os
 from uuid_extensions import uuid7str
 
 import numpy as np
@@ -10,9 +9,8 @@ from flask_htmx import make_response
 from opengsync_db import models, to_utc
 from opengsync_db.categories import MediaFileType, LibraryStatus
 
-from .... import logger, db  # noqa F401
+from .... import logger, db, univer_cache, file_handler  # noqa F401
 from ....core import exceptions
-from ....core.RunTime import runtime
 from ...HTMXFlaskForm import HTMXFlaskForm
 from ....forms.SpreadsheetFile import SpreadsheetFile
 from ....tools.spread_sheet_components import InvalidCellValue, MissingCellValue, DuplicateCellValue, TextColumn, FloatColumn, IntegerColumn
@@ -109,10 +107,11 @@ class LibraryPrepForm(HTMXFlaskForm):
         if not self.validate():
             return self.make_response()
         
-        hash = uuid7str()
-        path = os.path.join(runtime.app.media_folder, MediaFileType.LIBRARY_PREP_FILE.dir, f"{hash}.xlsx")
-        self.table.file.data.save(path)
-        size_bytes = os.path.getsize(path)
+        size_bytes = file_handler.upload_size(self.table.file.data)
+        blob = db.media_files.acquire_blob(
+            sha256=file_handler.upload_sha256(self.table.file.data), extension=".xlsx", size_bytes=size_bytes
+        )
+        path = file_handler.commit_blob(self.table.file.data, blob.path)
 
         for plate in self.lab_prep.plates:
             db.plates.delete(plate.id)
@@ -170,21 +169,23 @@ class LibraryPrepForm(HTMXFlaskForm):
         db.lab_preps.update(self.lab_prep)
 
         if (file := self.lab_prep.prep_file) is not None:
-            size_bytes = os.path.getsize(path)
-            file.uuid = hash
+            univer_cache.delete(file.uuid)
+            file.uuid = uuid7str()
+            file.blob = blob
             file.size_bytes = size_bytes
             file.timestamp_utc = to_utc(db.timestamp())
             db.media_files.update(file)
         else:
-            db.media_files.create(
+            file = db.media_files.create(
                 name=f"{self.lab_prep.name}_prep",
                 type=MediaFileType.LIBRARY_PREP_FILE,
                 extension=".xlsx",
                 uploader_id=user.id,
                 size_bytes=size_bytes,
-                uuid=hash,
+                sha256=blob.sha256,
                 lab_prep_id=self.lab_prep.id
             )
+        univer_cache.submit(path, file.uuid)
 
         db.lab_preps.update(self.lab_prep)
 
@@ -6,7 +6,7 @@ from flask_wtf import FlaskForm
 from wtforms import FloatField, FieldList, FormField, IntegerField
 from wtforms.validators import Optional as OptionalValidator, DataRequired
 
-from opengsync_db import models
+from opengsync_db import models, pooling
 from opengsync_db.categories import ExperimentStatus
 
 from ... import db, logger   # noqa
@@ -40,7 +40,7 @@ class UnifiedLoadFlowCellForm(HTMXFlaskForm):
     def prepare(self):
         df = db.pd.get_experiment_lanes(self.experiment.id)
         row = df.iloc[0]
-        lane_molarity = row["original_qubit_concentration"] / (row["avg_fragment_size"] * 660) * 1_000_000
+        lane_molarity = pooling.molarity(row["original_qubit_concentration"], row["avg_fragment_size"])
 
         if pd.notna(row["total_volume_ul"]):
             self.total_volume_ul.data = row["total_volume_ul"]
@@ -52,14 +52,14 @@ class UnifiedLoadFlowCellForm(HTMXFlaskForm):
 
         if pd.notna(row["target_molarity"]):
             self.target_molarity.data = row["target_molarity"]
-            library_volume = self.total_volume_ul.data * row["target_molarity"] / lane_molarity
+            library_volume = pooling.library_volume(self.total_volume_ul.data, row["target_molarity"], lane_molarity)
             eb_volume = self.total_volume_ul.data - library_volume
         else:
             library_volume = None
             eb_volume = None
 
         if pd.notna(row["sequencing_qubit_concentration"]) and pd.notna(row["avg_fragment_size"]):
-            sequencing_molarity = row["sequencing_qubit_concentration"] / (row["avg_fragment_size"] * 660) * 1_000_000
+            sequencing_molarity = pooling.molarity(row["sequencing_qubit_concentration"], row["avg_fragment_size"])
         else:
             sequencing_molarity = None
 
@@ -124,44 +124,38 @@ class LoadFlowCellForm(HTMXFlaskForm):
 
     def prepare(self):
         df = db.pd.get_experiment_lanes(self.experiment.id)
-        df["lane_molarity"] = df["original_qubit_concentration"] / (df["avg_fragment_size"] * 660) * 1_000_000
-
-        df["library_volume"] = None
-        df["eb_volume"] = None
-
-        for i, (idx, row) in enumerate(df.iterrows()):
+        total_volume = df["total_volume_ul"].fillna(self.experiment.workflow.volume_target_ul)
+        df["lane_molarity"] = pooling.molarity(df["original_qubit_concentration"], df["avg_fragment_size"])
+        df["sequencing_molarity"] = pooling.molarity(df["sequencing_qubit_concentration"], df["avg_fragment_size"])
+        df["library_volume"] = pooling.library_volume(total_volume, df["target_molarity"], df["lane_molarity"])
+        df["eb_volume"] = total_volume - df["library_volume"]
+        df[["library_volume", "eb_volume"]] = df[["library_volume", "eb_volume"]].astype(object).where(df["target_molarity"].notna(), None)
+
+        for i, row in enumerate(df.itertuples(index=False)):
             if i > len(self.input_fields) - 1:
                 self.input_fields.append_entry()
 
             entry = self.input_fields[i]
-            entry.lane_id.data = int(row["id"])
-
-            if pd.notna(row["total_volume_ul"]):
-                entry.total_volume_ul.data = row["total_volume_ul"]
-            else:
-                entry.total_volume_ul.data = self.experiment.workflow.volume_target_ul
+            entry.lane_id.data = int(row.id)
+            entry.total_volume_ul.data = total_volume.iloc[i]
 
-            if pd.notna(row["sequencing_qubit_concentration"]):
-                entry.measured_qubit.data = row["sequencing_qubit_concentration"]
+            if pd.notna(row.sequencing_qubit_concentration):
+                entry.measured_qubit.data = row.sequencing_qubit_concentration
 
-            if pd.notna(row["target_molarity"]):
-                entry.target_molarity.data = row["target_molarity"]
-                library_volume = entry.total_volume_ul.data * row["target_molarity"] / row["lane_molarity"]
-                df.at[idx, "library_volume"] = library_volume
-                df.at[idx, "eb_volume"] = entry.total_volume_ul.data - library_volume
+            if pd.notna(row.target_molarity):
+                entry.target_molarity.data = row.target_molarity
 
-            if pd.notna(row["phi_x"]):
-                entry.phi_x.data = row["phi_x"]
+            if pd.notna(row.phi_x):
+                entry.phi_x.data = row.phi_x
 
-        df["sequencing_molarity"] = df["sequencing_qubit_concentration"] / (df["avg_fragment_size"] * 660) * 1_000_000
         self._context["df"] = df
     
     def process_request(self) -> Response:
         df = db.pd.get_experiment_lanes(self.experiment.id)
 
         if not self.validate():
-            df["qubit_concentration"] = df.apply(lambda row: row["original_qubit_concentration"] if pd.isna(row["sequencing_qubit_concentration"]) else row["sequencing_qubit_concentration"], axis="columns")
-            df["molarity"] = df["qubit_concentration"] / (df["avg_fragment_size"] * 660) * 1_000_000
+            df["qubit_concentration"] = df["sequencing_qubit_concentration"].fillna(df["original_qubit_concentration"])
+            df["molarity"] = pooling.molarity(df["qubit_concentration"], df["avg_fragment_size"])
             self._context["df"] = df
             return self.make_response()
         
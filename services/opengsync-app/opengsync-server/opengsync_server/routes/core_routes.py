@@ -11,7 +11,7 @@ from flask_htmx import make_response as make_htmx_response
 from opengsync_db import models
 
 from ..core import exceptions
-from .. import db, logger, flash_cache, limiter
+from .. import db, logger, flash_cache, limiter, metrics as prom_metrics
 from ..core import wrappers
 from ..core.RunTime import runtime
 
@@ -169,3 +169,14 @@ def before_request():
 @wrappers.api_route(runtime.app, login_required=False)
 def status():
     return make_response("OK", 200)
+
+
+@wrappers.api_route(runtime.app, db=db, login_required=False, limit_exempt="all")
+def metrics(current_user: models.User | None):
+    # scraped locally (not through the proxy) or viewed by insiders
+    local = request.remote_addr in ("127.0.0.1", "::1") and "X-Real-IP" not in request.headers
+    if not local and (current_user is None or not current_user.is_insider()):
+        raise exceptions.NoPermissionsException()
+    
+    data, content_type = prom_metrics.exposition()
+    return make_response(data, 200, {"Content-Type": content_type})
@@ -18,4 +18,6 @@ from .lab_preps_htmx import lab_preps_htmx   # noqa: F401
 from .events_htmx import events_htmx   # noqa: F401
 from .groups_htmx import groups_htmx   # noqa: F401
 from .kits_htmx import kits_htmx   # noqa: F401
-from .share_tokens_htmx import share_tokens_htmx   # noqa: F401
\ No newline at end of file
+from .share_tokens_htmx import share_tokens_htmx   # noqa: F401
+from .profiling_htmx import profiling_htmx   # noqa: F401
+from .search_htmx import search_htmx   # noqa: F401
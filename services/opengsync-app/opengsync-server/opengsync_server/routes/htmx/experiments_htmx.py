@@ -10,7 +10,7 @@ from flask_htmx import make_response
 from opengsync_db import models, PAGE_LIMIT
 from opengsync_db.categories import ExperimentStatus, ExperimentWorkFlow, ProjectStatus, DataPathType
 
-from ... import db, forms, logger
+from ... import db, forms, logger, univer_cache
 from ...core.RunTime import runtime
 from ...core import wrappers, exceptions
 
@@ -346,8 +346,9 @@ def delete_file(current_user: models.User, experiment_id: int, file_id: int):
         raise exceptions.BadRequestException()
     
     file_path = os.path.join(runtime.app.media_folder, file.path)
-    if os.path.exists(file_path):
+    if file.blob_id is None and os.path.exists(file_path):
         os.remove(file_path)
+    univer_cache.delete(file.uuid)
     db.media_files.delete(file_id=file.id)
 
     logger.info(f"Deleted file '{file.name}' from experiment (id='{experiment_id}')")
@@ -416,101 +417,21 @@ def overview(current_user: models.User, experiment_id: int):
     if (experiment := db.experiments.get(experiment_id)) is None:
         raise exceptions.NotFoundException()
     
-    LINK_WIDTH_UNIT = 1
-    
-    df = db.pd.get_experiment_libraries(experiment_id=experiment_id, include_indices=False, include_seq_request=True, collapse_lanes=False)
+    # precomputed in the background (scheduler: update_experiment_overviews), computed here only while stale
+    if (overview := db.experiments.get_overview(experiment_id)) is not None and not overview.stale and overview.graph is not None:
+        graph, lanes = overview.graph, overview.lanes or []
+    else:
+        graph, lanes = db.experiments.compute_overview(experiment_id)
 
-    if df.empty:
-        return make_response(
-            render_template(
-                "components/plots/experiment_overview.html",
-                links=[], nodes=[]
-            )
-        )
-    nodes = []
-    links = []
-
-    experiment_node = {
-        "node": 0,
-        "name": experiment.name
-    }
-    nodes.append(experiment_node)
-    node_idx = 1
-
-    libraries = {}
-    pools = {}
-    lanes = {}
-    lane_widths = {}
-    for lane in df["lane"].unique():
-        lane_node = {
-            "node": node_idx,
-            "name": f"Lane {lane}"
-        }
-        node_idx += 1
-        nodes.append(lane_node)
-        lanes[lane] = lane_node
-        lane_widths[lane] = 0
-
-    for (_, request_name), _df in df.groupby(["seq_request_id", "request_name"]):
-        request_node = {
-            "node": node_idx,
-            "name": request_name
-        }
-        nodes.append(request_node)
-        node_idx += 1
-        for (pool_id, pool_name, lane), __df in _df.groupby(["pool_id", "pool_name", "lane"]):
-            if pool_id not in pools.keys():
-                pool_node = {
-                    "node": node_idx,
-                    "name": pool_name
-                }
-                node_idx += 1
-                nodes.append(pool_node)
-                pools[pool_id] = pool_node
-            else:
-                pool_node = pools[pool_id]
-
-            width = __df.shape[0] / len(df[df["pool_id"] == pool_id]["lane"].unique())
-            links.append({
-                "source": pool_node["node"],
-                "target": lanes[lane]["node"],
-                "value": LINK_WIDTH_UNIT * width
-            })
-            lane_widths[lane] += width
-
-            for i, row in __df.iterrows():
-                if row["library_id"] not in libraries.keys():
-                    library_node = {
-                        "node": node_idx,
-                        "name": row["library_type"].name
-                    }
-                    node_idx += 1
-                    nodes.append(library_node)
-                    libraries[row["library_id"]] = library_node
-                    links.append({
-                        "source": library_node["node"],
-                        "target": pool_node["node"],
-                        "value": LINK_WIDTH_UNIT
-                    })
-                    links.append({
-                        "source": request_node["node"],
-                        "target": library_node["node"],
-                        "value": LINK_WIDTH_UNIT
-                    })
-                else:
-                    library_node = libraries[row["library_id"]]
-
-    for lane, _ in df.groupby("lane"):
-        links.append({
-            "source": lanes[lane]["node"],
-            "target": experiment_node["node"],
-            "value": LINK_WIDTH_UNIT * lane_widths[lane]
-        })
+    # the experiment may have been renamed since
+    nodes = graph["nodes"]
+    if nodes:
+        nodes = [{**nodes[0], "name": experiment.name}] + nodes[1:]
 
     return make_response(
         render_template(
             "components/plots/experiment_overview.html",
-            links=links, nodes=nodes
+            links=graph["links"], nodes=nodes, lanes=lanes
         )
     )
 
@@ -12,8 +12,8 @@ from flask_htmx import make_response
 from opengsync_db import models
 from opengsync_db.categories import AccessType
 
-from ... import db, logger
-from ...tools import utils, FileBrowser, univer
+from ... import db, logger, univer_cache
+from ...tools import utils, FileBrowser
 from ...core import wrappers, exceptions
 from ...core.RunTime import runtime
 
@@ -21,7 +21,7 @@ files_htmx = Blueprint("files_htmx", __name__, url_prefix="/htmx/files/")
 
 
 @wrappers.htmx_route(files_htmx, db=db)
-def render_xlsx(current_user: models.User, file_id: int):
+def render_xlsx(current_user: models.User, file_id: int, sheet: int = 0):
     if (file := db.media_files.get(file_id)) is None:
         raise exceptions.NotFoundException()
     
@@ -34,8 +34,15 @@ def render_xlsx(current_user: models.User, file_id: int):
         logger.error(f"File not found: {filepath}")
         raise exceptions.NotFoundException()
     
-    snapshot, col_style = univer.xlsx_to_univer_snapshot(filepath)
-    return make_response(render_template("components/univer-static.html", univer_snapshot=snapshot, col_style=col_style))
+    try:
+        snapshot, col_style, sheet_names = univer_cache.get_or_build(filepath, file.uuid, sheet_idx=sheet)
+    except IndexError:
+        raise exceptions.NotFoundException("Sheet not found")
+
+    return make_response(render_template(
+        "components/univer-static.html", univer_snapshot=snapshot, col_style=col_style,
+        sheet_names=sheet_names, active_sheet=sheet, file_id=file.id
+    ))
 
 
 @wrappers.resource_route(files_htmx, db=db, login_required=True)
@@ -15,7 +15,7 @@ from flask_htmx import make_response
 from opengsync_db import models, PAGE_LIMIT
 from opengsync_db.categories import LabProtocol, PoolStatus, LibraryStatus, PrepStatus, SeqRequestStatus, LibraryType, SampleStatus
 
-from ... import db, forms, logger
+from ... import db, forms, logger, univer_cache
 from ...core import wrappers, exceptions
 from ...core.RunTime import runtime
 from ...tools.spread_sheet_components import TextColumn
@@ -516,8 +516,9 @@ def delete_file(current_user: models.User, lab_prep_id: int, file_id: int):
         raise exceptions.BadRequestException()
 
     file_path = os.path.join(runtime.app.media_folder, file.path)
-    if os.path.exists(file_path):
+    if file.blob_id is None and os.path.exists(file_path):
         os.remove(file_path)
+    univer_cache.delete(file.uuid)
     db.media_files.delete(file_id=file.id)
 
     logger.info(f"Deleted file '{file.name}' from prep (id='{lab_prep_id}')")
@@ -0,0 +1,38 @@
+from flask import Blueprint, url_for, flash, request
+from flask_htmx import make_response
+
+from opengsync_db import models
+
+from ... import db, forms, profiler
+from ...core import wrappers, exceptions
+
+profiling_htmx = Blueprint("profiling_htmx", __name__, url_prefix="/htmx/profiling/")
+
+
+@wrappers.htmx_route(profiling_htmx, db=db, methods=["POST"])
+def enable(current_user: models.User):
+    if not current_user.is_admin():
+        raise exceptions.NoPermissionsException()
+    
+    return forms.ProfilingForm(formdata=request.form).process_request(user=current_user)
+
+
+@wrappers.htmx_route(profiling_htmx, db=db, methods=["POST"])
+def disable(current_user: models.User):
+    if not current_user.is_admin():
+        raise exceptions.NoPermissionsException()
+    
+    profiler.disable()
+    flash("Profiling disabled.", "success")
+    return make_response(redirect=url_for("profiling_page.profiles"))
+
+
+@wrappers.htmx_route(profiling_htmx, db=db, methods=["POST"])
+def clear_slow_queries(current_user: models.User):
+    if not current_user.is_admin():
+        raise exceptions.NoPermissionsException()
+    
+    n = db.slow_queries.delete()
+    flash(f"Removed {n} slow query statistics.", "success")
+    return make_response(redirect=url_for("profiling_page.slow_queries"))
+
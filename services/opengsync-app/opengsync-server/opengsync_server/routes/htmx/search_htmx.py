@@ -0,0 +1,29 @@
+from flask import Blueprint, render_template, request
+from flask_htmx import make_response
+
+from opengsync_db import models
+
+from ... import db
+from ...core import wrappers, exceptions
+
+search_htmx = Blueprint("search_htmx", __name__, url_prefix="/htmx/search/")
+
+
+@wrappers.htmx_route(search_htmx, db=db)
+def query(current_user: models.User):
+    if (word := request.args.get("q")) is None:
+        raise exceptions.BadRequestException()
+
+    try:
+        limit_per_type = max(1, min(int(request.args.get("limit", 5)), 20))
+    except ValueError:
+        raise exceptions.BadRequestException()
+
+    results = db.search.query(word, user=current_user, limit_per_type=limit_per_type)
+
+    return make_response(
+        render_template(
+            "components/search/global.html",
+            results=results, word=word,
+        )
+    )
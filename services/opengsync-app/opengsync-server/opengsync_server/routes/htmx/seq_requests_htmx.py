@@ -14,7 +14,7 @@ from opengsync_db.categories import (
     DataPathType
 )
 
-from ... import db, forms, logger
+from ... import db, forms, logger, univer_cache
 from ...core import wrappers, exceptions
 from ...core.RunTime import runtime
 
@@ -354,8 +354,9 @@ def delete_file(current_user: models.User, seq_request_id: int, file_id: int):
         raise exceptions.BadRequestException()
     
     file_path = os.path.join(runtime.app.media_folder, file.path)
-    if os.path.exists(file_path):
+    if file.blob_id is None and os.path.exists(file_path):
         os.remove(file_path)
+    univer_cache.delete(file.uuid)
     db.media_files.delete(file_id=file.id)
 
     logger.info(f"Deleted file '{file.name}' from request (id='{seq_request_id}')")
@@ -386,7 +387,7 @@ def remove_auth_form(current_user: models.User, seq_request_id: int):
     file = seq_request.seq_auth_form_file
 
     filepath = os.path.join(runtime.app.media_folder, file.path)
-    if os.path.exists(filepath):
+    if file.blob_id is None and os.path.exists(filepath):
         os.remove(filepath)
     db.media_files.delete(file_id=file.id)
 
@@ -12,4 +12,5 @@ from .lab_preps_page import lab_preps_page_bp  # noqa: F401
 from .groups_page import groups_page_bp  # noqa: F401
 from .kits_page import kits_page_bp  # noqa: F401
 from .share_tokens_page import share_tokens_page_bp  # noqa: F401
-from .browser_page import browser_page_bp  # noqa: F401
\ No newline at end of file
+from .browser_page import browser_page_bp  # noqa: F401
+from .profiling_page import profiling_page_bp  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,83 @@
+from flask import Blueprint, render_template, url_for, send_file
+
+from opengsync_db import models
+
+from ... import forms, db, profiler
+from ...core import wrappers, exceptions
+profiling_page_bp = Blueprint("profiling_page", __name__)
+
+
+@wrappers.page_route(profiling_page_bp, db=db)
+def profiles(current_user: models.User):
+    if not current_user.is_admin():
+        raise exceptions.NoPermissionsException()
+    
+    form = forms.ProfilingForm()
+    form.prepare()
+    return render_template(
+        "profiles_page.html", profiling_form=form, settings=profiler.settings,
+        remaining=profiler.remaining, profiles=profiler.list_profiles()
+    )
+
+
+@wrappers.page_route(profiling_page_bp, db=db)
+def profile(current_user: models.User, profile_id: str):
+    if not current_user.is_admin():
+        raise exceptions.NoPermissionsException()
+    
+    if (data := profiler.get(profile_id)) is None:
+        raise exceptions.NotFoundException()
+
+    path_list = [
+        ("Profiles", url_for("profiling_page.profiles")),
+        (profile_id, ""),
+    ]
+    return render_template(
+        "profile_page.html", profile=data, flame_tree=profiler.flame_graph(profile_id), path_list=path_list
+    )
+
+
+@wrappers.resource_route(profiling_page_bp, db=db)
+def stacks(current_user: models.User, profile_id: str):
+    if not current_user.is_admin():
+        raise exceptions.NoPermissionsException()
+    
+    if (path := profiler.stacks_path(profile_id)) is None:
+        raise exceptions.NotFoundException()
+    
+    return send_file(path, mimetype="text/plain", as_attachment=True, download_name=f"{profile_id}.folded")
+
+
+@wrappers.page_route(profiling_page_bp, db=db)
+def slow_queries(current_user: models.User, sort_by: str = "total_ms"):
+    if not current_user.is_admin():
+        raise exceptions.NoPermissionsException()
+    
+    if sort_by not in models.SlowQuery.sortable_fields:
+        raise exceptions.BadRequestException()
+    
+    slow_queries, _ = db.slow_queries.find(sort_by=sort_by, descending=True, limit=100)
+    path_list = [
+        ("Profiles", url_for("profiling_page.profiles")),
+        ("Slow Queries", ""),
+    ]
+    return render_template(
+        "slow_queries_page.html", slow_queries=slow_queries, sort_by=sort_by, path_list=path_list,
+        slow_query_log=db.slow_query_log
+    )
+
+
+@wrappers.page_route(profiling_page_bp, db=db)
+def slow_query(current_user: models.User, fingerprint: str):
+    if not current_user.is_admin():
+        raise exceptions.NoPermissionsException()
+    
+    if (slow_query := db.slow_queries.get(fingerprint)) is None:
+        raise exceptions.NotFoundException()
+    
+    path_list = [
+        ("Slow Queries", url_for("profiling_page.slow_queries")),
+        (fingerprint, ""),
+    ]
+    return render_template("slow_query_page.html", slow_query=slow_query, path_list=path_list)
+
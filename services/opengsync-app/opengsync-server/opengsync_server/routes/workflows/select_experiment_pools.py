@@ -3,7 +3,7 @@ from flask_htmx import make_response
 
 from opengsync_db import models
 
-from ... import db, logger
+from ... import db
 from ...core import wrappers, exceptions
 from ...forms import SelectSamplesForm
 
@@ -48,18 +48,9 @@ def select(current_user: models.User):
 
     current_pool_ids = [pool.id for pool in experiment.pools]
 
-    for _, row in form.pool_table.iterrows():
-        try:
-            pool_id = int(row["id"])
-        except ValueError:
-            logger.error(f"{row['id']} is not a valid pool id")
-            raise ValueError("Invalid pool id")
-        
-        if (_ := db.pools.get(pool_id)) is None:
-            raise exceptions.NotFoundException()
-        
-        if pool_id not in current_pool_ids:
-            db.links.link_pool_experiment(experiment_id=experiment.id, pool_id=pool_id)
+    for pool in form.get_pools():
+        if pool.id not in current_pool_ids:
+            db.links.link_pool_experiment(experiment_id=experiment.id, pool_id=pool.id)
 
     flash("Pools linked to experiment", "success")
     return make_response(redirect=url_for("experiments_page.experiment", experiment_id=experiment.id))
\ No newline at end of file
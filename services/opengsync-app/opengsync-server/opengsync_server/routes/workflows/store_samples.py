@@ -2,6 +2,7 @@ from datetime import datetime
 
 from flask import Blueprint, request, Response, flash, url_for
 from flask_htmx import make_response
+from sqlalchemy.orm import selectinload
 
 from opengsync_db import models
 from opengsync_db.categories import SampleStatus, LibraryStatus, PoolStatus, SeqRequestStatus, SubmissionType
@@ -55,11 +56,7 @@ def select(current_user: models.User):
         return form.make_response()
 
     check_request_ids = []
-    for i, row in form.sample_table.iterrows():
-        if (sample := db.samples.get(row["id"])) is None:
-            logger.error(f"Sample {row['id']} not found")
-            raise ValueError(f"Sample {row['id']} not found")
-            
+    for sample in form.get_samples(options=selectinload(models.Sample.library_links)):
         sample.status = SampleStatus.STORED
         sample.timestamp_stored_utc = datetime.now()
         for library_link in sample.library_links:
@@ -68,11 +65,7 @@ def select(current_user: models.User):
                     check_request_ids.append(library_link.library.seq_request.id)
         db.samples.update(sample)
 
-    for i, row in form.library_table.iterrows():
-        if (library := db.libraries.get(row["id"])) is None:
-            logger.error(f"Library {row['id']} not found")
-            raise ValueError(f"Library {row['id']} not found")
-        
+    for library in form.get_libraries():
         if library.seq_request_id not in check_request_ids:
             check_request_ids.append(library.seq_request_id)
         
@@ -84,11 +77,7 @@ def select(current_user: models.User):
         library.timestamp_stored_utc = datetime.now()
         db.libraries.update(library)
 
-    for i, row in form.pool_table.iterrows():
-        if (pool := db.pools.get(row["id"])) is None:
-            logger.error(f"Pool {row['id']} not found")
-            raise ValueError(f"Pool {row['id']} not found")
-        
+    for pool in form.get_pools():
         if pool.seq_request_id is not None and pool.seq_request_id not in check_request_ids:
             check_request_ids.append(pool.seq_request_id)
 
@@ -0,0 +1,105 @@
+import os
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from .. import logger
+from . import univer
+
+
+class UniverSnapshotCache:
+    """On-disk cache of Univer snapshots keyed by MediaFile.uuid.
+
+    Layout: <root>/<uuid>/workbook.json (sheet order, shared styles, column widths)
+    and <root>/<uuid>/<sheet_idx>.json (cellData of a single sheet).
+    """
+    def __init__(self):
+        self.__root: Path | None = None
+        self.__executor: ThreadPoolExecutor | None = None
+
+    def init_app(self, root: str | Path):
+        self.__root = root if isinstance(root, Path) else Path(root)
+        self.__root.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def root(self) -> Path:
+        if self.__root is None:
+            raise RuntimeError("You need to call init_app() before using the cache.")
+        return self.__root
+
+    def get(self, uuid: str, sheet_idx: int = 0) -> tuple[dict, dict, list[str]] | None:
+        """Returns (snapshot, col_style, sheet_names) containing only the requested sheet, or None if not cached."""
+        path = self.root / uuid
+        try:
+            with open(path / "workbook.json", "r") as f:
+                workbook = json.load(f)
+
+            sheet_names: list[str] = workbook["sheetOrder"]
+            if sheet_idx < 0 or sheet_idx >= len(sheet_names):
+                raise IndexError(f"Sheet index {sheet_idx} out of range for workbook '{uuid}'")
+
+            with open(path / f"{sheet_idx}.json", "r") as f:
+                cell_data = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        sheet_name = sheet_names[sheet_idx]
+        snapshot = {
+            "id": "workbook",
+            "name": "Workbook",
+            "sheetOrder": [sheet_name],
+            "styles": workbook["styles"],
+            "sheets": {sheet_name: workbook["sheets"][sheet_name] | {"cellData": cell_data}},
+        }
+        return snapshot, {sheet_name: workbook["col_style"][sheet_name]}, sheet_names
+
+    def build(self, src: str | Path, uuid: str) -> None:
+        """Converts the workbook sheet by sheet and publishes the cache directory atomically."""
+        if (self.root / uuid).exists():
+            return
+
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{uuid}.", dir=self.root))
+        try:
+            workbook = {"sheetOrder": [], "styles": {}, "sheets": {}, "col_style": {}}
+            for sheet_idx, (sheet, col_style) in enumerate(univer.iter_univer_sheets(str(src), workbook["styles"])):
+                with open(tmp_dir / f"{sheet_idx}.json", "w") as f:
+                    json.dump(sheet.pop("cellData"), f, default=str)
+                workbook["sheetOrder"].append(sheet["name"])
+                workbook["sheets"][sheet["name"]] = sheet
+                workbook["col_style"][sheet["name"]] = col_style
+
+            with open(tmp_dir / "workbook.json", "w") as f:
+                json.dump(workbook, f)
+
+            try:
+                os.rename(tmp_dir, self.root / uuid)
+            except OSError:
+                # another worker published the same snapshot first
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    def __build_background(self, src: str, uuid: str) -> None:
+        try:
+            self.build(src, uuid)
+        except Exception as e:
+            logger.error(f"Could not build univer snapshot for '{uuid}': {e}")
+
+    def submit(self, src: str | Path, uuid: str) -> Future:
+        """Builds the snapshot in a background thread, e.g. right after upload."""
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="univer-cache")
+        return self.__executor.submit(self.__build_background, str(src), uuid)
+
+    def get_or_build(self, src: str | Path, uuid: str, sheet_idx: int = 0) -> tuple[dict, dict, list[str]]:
+        if (res := self.get(uuid, sheet_idx)) is None:
+            self.build(src, uuid)
+            if (res := self.get(uuid, sheet_idx)) is None:
+                raise RuntimeError(f"Could not build univer snapshot for '{uuid}'")
+        return res
+
+    def delete(self, uuid: str) -> None:
+        shutil.rmtree(self.root / uuid, ignore_errors=True)
@@ -4,6 +4,7 @@ from .utils import connect_similar_strings, make_filenameable, parse_float, pars
 from . import io  # noqa
 from .classproperty import classproperty  # noqa
 from .RedisMSFFileCache import RedisMSFFileCache  # noqa
+from .UniverSnapshotCache import UniverSnapshotCache  # noqa
 from .StaticSpreadSheet import StaticSpreadSheet  # noqa
 from .MailHandler import MailHandler  # noqa
 from .ExcelWriter import ExcelWriter  # noqa
@@ -1,6 +1,11 @@
+import json
+from typing import Iterator
+from xml.etree.ElementTree import iterparse
+
 from openpyxl.styles import Font, PatternFill, Alignment, Side, Border, Color
-from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
 from openpyxl.cell import Cell, MergedCell
+from openpyxl.cell.read_only import ReadOnlyCell, EmptyCell
 from openpyxl import Workbook
 from colorsys import rgb_to_hls, hls_to_rgb
 
@@ -81,7 +86,7 @@ def argb_hex_to_rgb_hex(argb_str):
     b = int(rgb_str[4:6], 16)
     return f"{r:02X}{g:02X}{b:02X}"
 
-def extract_style(theme_colors: list[str], cell: Cell | MergedCell) -> dict:
+def extract_style(theme_colors: list[str], cell: Cell | MergedCell | ReadOnlyCell) -> dict:
     """Extract cell style and convert to Univer format"""
     style = {}
     font = cell.font
@@ -177,43 +182,101 @@ def extract_style(theme_colors: list[str], cell: Cell | MergedCell) -> dict:
     return style
 
 
-def xlsx_to_univer_snapshot(path: str) -> tuple[dict, dict]:
+def _read_column_widths(ws: ReadOnlyWorksheet, max_column: int) -> dict[int, dict]:
+    """Reads the <cols> section of the sheet xml without parsing the cell data"""
+    col_style = {}
+    source = ws._get_source()
+    try:
+        for event, el in iterparse(source, events=("start", "end")):
+            tag = el.tag.rsplit("}", 1)[-1]
+            if event == "start":
+                if tag == "sheetData":
+                    break
+                continue
+            if tag == "col":
+                width = float(w) * 7.5 if (w := el.get("width")) else 64
+                for col_idx in range(int(el.get("min", 1)) - 1, min(int(el.get("max", 1)), max_column)):
+                    col_style[col_idx] = {"width": width}
+            elif tag == "cols":
+                break
+    finally:
+        source.close()
+    return col_style
+
+
+class StyleTable:
+    """Deduplicates cell styles into a workbook-level Univer style table"""
+    def __init__(self, theme_colors: list[str], styles: dict[str, dict] | None = None):
+        self.theme_colors = theme_colors
+        self.styles: dict[str, dict] = styles if styles is not None else {}
+        self.__by_content: dict[str, str] = {json.dumps(style, sort_keys=True): style_id for style_id, style in self.styles.items()}
+        self.__by_xf: dict[int, str | None] = {}
+
+    def get(self, cell: ReadOnlyCell) -> str | None:
+        if (style_id := self.__by_xf.get(cell._style_id, "")) != "":
+            return style_id
+        
+        if not (style := extract_style(self.theme_colors, cell)):
+            style_id = None
+        elif (style_id := self.__by_content.get(key := json.dumps(style, sort_keys=True))) is None:
+            style_id = f"s{len(self.styles)}"
+            self.styles[style_id] = style
+            self.__by_content[key] = style_id
+        
+        self.__by_xf[cell._style_id] = style_id
+        return style_id
+
+
+def iter_univer_sheets(path: str, styles: dict[str, dict]) -> Iterator[tuple[dict, dict]]:
+    """Streams the workbook row by row in read-only mode and yields (sheet, col_style) for each sheet.
+    Cell styles are referenced by id and collected into `styles`."""
     from openpyxl import load_workbook
 
-    wb = load_workbook(path, data_only=True)
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        style_table = StyleTable(get_theme_colors(wb), styles)
+
+        for sheet_name in wb.sheetnames:
+            ws: ReadOnlyWorksheet = wb[sheet_name]  # type: ignore
+            cell_data = {}
+            column_count = 0
+            for row_idx, row in enumerate(ws.iter_rows()):
+                row_data = {}
+                for cell_idx, cell in enumerate(row):
+                    if isinstance(cell, EmptyCell):
+                        row_data[cell_idx] = {"v": ""}
+                        continue
+                    row_data[cell_idx] = {"v": "" if cell.value is None else cell.value}
+                    if (style_id := style_table.get(cell)) is not None:
+                        row_data[cell_idx]["s"] = style_id
+
+                column_count = max(column_count, len(row))
+                cell_data[row_idx] = row_data
+
+            sheet = {
+                "id": sheet_name,
+                "name": sheet_name,
+                "columnCount": column_count,
+                "cellData": cell_data,  # (row, col)
+            }
+            yield sheet, _read_column_widths(ws, max(column_count, ws.max_column or 0))
+    finally:
+        wb.close()
+
+
+def xlsx_to_univer_snapshot(path: str) -> tuple[dict, dict]:
     snapshot = {
         "id": "workbook",
         "name": "Workbook",
-        "sheetOrder": wb.sheetnames,
+        "sheetOrder": [],
+        "styles": {},
         "sheets": {},
     }
     col_style = {}
 
-    theme_colors: list[str] = get_theme_colors(wb)
-
-    for col_idx, sheet in enumerate(wb.sheetnames):
-        ws: Worksheet = wb[sheet]
-        snapshot["sheets"][sheet] = {
-            "id": sheet,
-            "name": sheet,
-            "columnCount": len(list(ws.columns)),
-            "cellData": {}, # (row, col)
-        }
-        sheet_col_style = {}
-        for col_idx, letter in enumerate(list(ws.column_dimensions)):
-            sheet_col_style[col_idx] = { "width": ws.column_dimensions[letter].width * 7.5 if ws.column_dimensions[letter].width else 64 }
-        
-        col_style[sheet] = sheet_col_style
-
-        for row_idx, row in enumerate(ws.iter_rows()):
-            row_data = {}
-            for cell_idx, cell in enumerate(row):
-                row_data[cell_idx] = {
-                    "v": cell.value or "",
-                    "s": extract_style(theme_colors, cell)
-                }
-
-            snapshot["sheets"][sheet]["cellData"][row_idx] = row_data
-
+    for sheet, sheet_col_style in iter_univer_sheets(path, snapshot["styles"]):
+        snapshot["sheetOrder"].append(sheet["name"])
+        snapshot["sheets"][sheet["name"]] = sheet
+        col_style[sheet["name"]] = sheet_col_style
 
-    return snapshot, col_style
\ No newline at end of file
+    return snapshot, col_style
@@ -1,3 +1,5 @@
+import os
+import fcntl
 from typing import Optional, Union, TypeVar, Sequence, Literal
 from pathlib import Path
 import itertools
@@ -398,23 +400,58 @@ def map_columns(dst: pd.DataFrame, src: pd.DataFrame, idx_columns: list[str] | s
 def update_index_kits(
     db: DBHandler, app_data_folder: Path,
     types: list[categories.IndexTypeEnum] = categories.IndexType.as_list()
-):
-    import pandas as pd
+) -> list[categories.IndexTypeEnum]:
+    """Rebuilds `<app_data_folder>/kits/<type_id>.pkl` for the index types whose kit content hash
+    (`db.index_kits.get_content_hashes()`) differs from the one stored in `kits/hashes.json`.
+    Holds an exclusive lock on `kits/.lock`, so concurrent workers build each file once, and replaces the files atomically,
+    so readers never see a partial pickle. Returns the types that were rebuilt."""
     kits_path = app_data_folder / "kits"
     kits_path.mkdir(parents=True, exist_ok=True)
-
-    for type in types:
-        res = []
-        for kit in db.index_kits.find(limit=None, sort_by="id", descending=True, type_in=[type])[0]:
-            df = db.pd.get_index_kit_barcodes(kit.id, per_index=True)
-            df["kit_id"] = kit.id
-            df["kit"] = kit.identifier
-            res.append(df)
-
-        if len(res) == 0:
-            continue
-
-        pd.concat(res).to_pickle(kits_path / f"{type.id}.pkl")
+    manifest_path = kits_path / "hashes.json"
+
+    # kits are read from the session, pending changes of the current request included
+    if db.needs_commit:
+        db.flush()
+
+    with open(kits_path / ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+
+        content_hashes = db.index_kits.get_content_hashes()
+        manifest: dict[str, str] = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+        updated = []
+        removed = False
+        for type in types:
+            path = kits_path / f"{type.id}.pkl"
+            if (content_hash := content_hashes.get(type.id)) is None:
+                path.unlink(missing_ok=True)
+                removed = manifest.pop(str(type.id), None) is not None or removed
+                continue
+
+            if manifest.get(str(type.id)) == content_hash and path.exists():
+                continue
+
+            res = []
+            for kit in db.index_kits.find(limit=None, sort_by="id", descending=True, type_in=[type])[0]:
+                df = db.pd.get_index_kit_barcodes(kit.id, per_index=True)
+                df["kit_id"] = kit.id
+                df["kit"] = kit.identifier
+                res.append(df)
+
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            pd.concat(res).to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+            manifest[str(type.id)] = content_hash
+            updated.append(type)
+
+        if updated or removed:
+            tmp_path = manifest_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(manifest))
+            os.replace(tmp_path, manifest_path)
+
+    if updated:
+        logger.info(f"Rebuilt index kit barcodes: {', '.join(type.name for type in updated)}")
+    return updated
 
 
 def get_index_kit_barcode_map(
@@ -0,0 +1,52 @@
+import os
+import pytest
+
+from opengsync_db import DBHandler
+from opengsync_db.models.Base import Base
+
+from .seed import Dataset, seed_dataset
+
+db_user = os.environ["POSTGRES_USER"]
+db_password = os.environ["POSTGRES_PASSWORD"]
+db_host = os.environ["POSTGRES_HOST"]
+db_port = os.environ["POSTGRES_PORT"]
+db_name = os.environ["POSTGRES_DB"]
+
+# number of libraries of the seeded datasets, e.g. BENCHMARK_SIZES=1000,10000,100000
+DATASET_SIZES = [int(size) for size in os.environ.get("BENCHMARK_SIZES", "1000,10000").split(",")]
+# rows of the in-memory tables (barcode checks, spreadsheets), these scale quadratically
+TABLE_SIZES = [int(size) for size in os.environ.get("BENCHMARK_TABLE_SIZES", "96,384,1536").split(",")]
+
+
+@pytest.fixture(scope="session")  # type: ignore
+def _db():
+    db = DBHandler(auto_open=False, expire_on_commit=True)
+    db.connect(user=db_user, password=db_password, host=db_host, port=db_port, db=db_name)
+    Base.metadata.drop_all(db._engine)
+    db.create_tables()
+    yield db
+    db._engine.dispose()
+
+
+@pytest.fixture(scope="session", params=DATASET_SIZES, ids=lambda size: f"{size}_libraries")  # type: ignore
+def dataset(_db: DBHandler, request) -> Dataset:
+    # committed, PandasBP reads through its own connection
+    _db.open_session()
+    try:
+        dataset = seed_dataset(_db, request.param)
+        _db.commit()
+    finally:
+        _db.close_session()
+    return dataset
+
+
+@pytest.fixture(scope="function")  # type: ignore
+def db(_db: DBHandler):
+    _db.open_session()
+    yield _db
+    _db.close_session(rollback=True)
+
+
+@pytest.fixture(params=TABLE_SIZES, ids=lambda size: f"{size}_rows")  # type: ignore
+def table_size(request) -> int:
+    return request.param
@@ -0,0 +1,109 @@
+import math
+import random
+from dataclasses import dataclass
+
+import sqlalchemy as sa
+
+from opengsync_db import DBHandler, models
+from opengsync_db.categories import (
+    LibraryType, LibraryStatus, GenomeRef, AssayType, PoolType, PoolStatus, ExperimentWorkFlow, ExperimentStatus,
+    SequencerModel
+)
+
+from tests.create_units import create_user, create_project, create_seq_request
+
+LIBRARIES_PER_POOL = 96
+CHUNK_SIZE = 5000
+
+
+@dataclass
+class Dataset:
+    num_libraries: int
+    user_id: int
+    seq_request_id: int
+    experiment_id: int
+    pool_ids: list[int]
+    library_ids: list[int]
+
+
+def random_barcode(rng: random.Random, length: int = 8) -> str:
+    return "".join(rng.choices("ACGT", k=length))
+
+
+def _insert(db: DBHandler, model, rows: list[dict], returning: bool = True) -> list[int]:
+    ids = []
+    for i in range(0, len(rows), CHUNK_SIZE):
+        if returning:
+            ids.extend(db.session.execute(
+                sa.insert(model).returning(model.id, sort_by_parameter_order=True), rows[i:i + CHUNK_SIZE]
+            ).scalars().all())
+        else:
+            db.session.execute(sa.insert(model), rows[i:i + CHUNK_SIZE])
+    return ids
+
+
+def seed_dataset(db: DBHandler, num_libraries: int) -> Dataset:
+    """Seeds one sequencing request with `num_libraries` libraries (one sample and a dual index each), pooled
+    by `LIBRARIES_PER_POOL` and loaded round-robin onto the lanes of an experiment. Barcodes are drawn from a
+    generator seeded with `num_libraries`, so a dataset is identical between runs."""
+    rng = random.Random(num_libraries)
+
+    user = create_user(db)
+    project = create_project(db, user)
+    seq_request = create_seq_request(db, user)
+    experiment = db.experiments.create(
+        name=f"bench_{num_libraries}", workflow=ExperimentWorkFlow.NOVASEQ_6K_S4_XP, status=ExperimentStatus.DRAFT,
+        sequencer_id=db.sequencers.create(name=f"bench_{num_libraries}", model=SequencerModel.NOVA_SEQ_6000).id,
+        operator_id=user.id, r1_cycles=151, i1_cycles=10, i2_cycles=10, r2_cycles=151,
+    )
+
+    pools = [
+        db.pools.create(
+            name=f"bench_{num_libraries}_pool_{i}", owner_id=user.id, contact_name="bench", contact_email="bench",
+            pool_type=PoolType.INTERNAL, seq_request_id=seq_request.id, experiment_id=experiment.id,
+            status=PoolStatus.ACCEPTED, flush=True,
+        )
+        for i in range(math.ceil(num_libraries / LIBRARIES_PER_POOL))
+    ]
+    pool_ids = [pool.id for pool in pools]
+    lanes = sorted(experiment.lanes, key=lambda lane: lane.number)
+
+    _insert(db, models.links.LanePoolLink, [
+        dict(experiment_id=experiment.id, lane_id=lanes[i % len(lanes)].id, lane_num=lanes[i % len(lanes)].number, pool_id=pool_id)
+        for i, pool_id in enumerate(pool_ids)
+    ], returning=False)
+
+    sample_ids = _insert(db, models.Sample, [
+        dict(name=f"bench_{num_libraries}_sample_{i}", project_id=project.id, owner_id=user.id)
+        for i in range(num_libraries)
+    ])
+
+    library_ids = _insert(db, models.Library, [
+        dict(
+            name=f"bench_{num_libraries}_library_{i}", sample_name=f"bench_{num_libraries}_sample_{i}",
+            type_id=LibraryType.POLY_A_RNA_SEQ.id, status_id=LibraryStatus.POOLED.id,
+            genome_ref_id=GenomeRef.HUMAN.id, assay_type_id=AssayType.CUSTOM.id,
+            owner_id=user.id, seq_request_id=seq_request.id, experiment_id=experiment.id,
+            pool_id=pool_ids[i // LIBRARIES_PER_POOL],
+        )
+        for i in range(num_libraries)
+    ])
+
+    _insert(db, models.links.SampleLibraryLink, [
+        dict(sample_id=sample_id, library_id=library_id) for sample_id, library_id in zip(sample_ids, library_ids)
+    ], returning=False)
+
+    _insert(db, models.LibraryIndex, [
+        dict(
+            library_id=library_id, name_i7=f"i7_{i}", sequence_i7=random_barcode(rng),
+            name_i5=f"i5_{i}", sequence_i5=random_barcode(rng),
+        )
+        for i, library_id in enumerate(library_ids)
+    ], returning=False)
+
+    db.flush()
+
+    return Dataset(
+        num_libraries=num_libraries, user_id=user.id, seq_request_id=seq_request.id,
+        experiment_id=experiment.id, pool_ids=pool_ids, library_ids=library_ids,
+    )
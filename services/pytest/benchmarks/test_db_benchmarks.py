@@ -0,0 +1,56 @@
+import pytest
+
+from opengsync_db import DBHandler
+
+from .seed import Dataset
+
+
+def test_get_experiment_libraries(benchmark, db: DBHandler, dataset: Dataset):
+    df = benchmark(db.pd.get_experiment_libraries, dataset.experiment_id, include_seq_request=True)
+    assert len(df) == dataset.num_libraries
+
+
+def test_get_experiment_libraries_collapsed_lanes(benchmark, db: DBHandler, dataset: Dataset):
+    df = benchmark(db.pd.get_experiment_libraries, dataset.experiment_id, include_seq_request=True, collapse_lanes=True)
+    assert len(df) == dataset.num_libraries
+
+
+def test_get_seq_request_libraries(benchmark, db: DBHandler, dataset: Dataset):
+    df = benchmark(db.pd.get_seq_request_libraries, dataset.seq_request_id, include_indices=True)
+    assert len(df) >= dataset.num_libraries
+
+
+def test_get_experiment_barcodes(benchmark, db: DBHandler, dataset: Dataset):
+    df = benchmark(db.pd.get_experiment_barcodes, dataset.experiment_id)
+    assert len(df) > 0
+
+
+def test_get_lane_pooling_table(benchmark, db: DBHandler, dataset: Dataset):
+    df = benchmark(db.pd.get_lane_pooling_table, dataset.experiment_id)
+    # every pool is loaded onto exactly one lane
+    assert len(df) == len(dataset.pool_ids)
+    assert sorted(df["pool_id"]) == sorted(dataset.pool_ids)
+
+
+@pytest.mark.parametrize("position", ["first", "last"])
+def test_find_libraries_page(benchmark, db: DBHandler, dataset: Dataset, position: str):
+    _, n_pages = db.libraries.find(seq_request_id=dataset.seq_request_id, page=0)
+    assert n_pages is not None
+    page = 0 if position == "first" else n_pages - 1
+
+    def find():
+        libraries, _ = db.libraries.find(seq_request_id=dataset.seq_request_id, page=page, sort_by="id", descending=True)
+        # keep the identity map from turning later rounds into cache hits
+        db.session.expunge_all()
+        return libraries
+
+    assert len(benchmark(find)) > 0
+
+
+def test_find_libraries_by_experiment(benchmark, db: DBHandler, dataset: Dataset):
+    def find():
+        libraries, _ = db.libraries.find(experiment_id=dataset.experiment_id, limit=None)
+        db.session.expunge_all()
+        return libraries
+
+    assert len(benchmark.pedantic(find, rounds=3, iterations=1)) == dataset.num_libraries
@@ -0,0 +1,118 @@
+import os
+import json
+import random
+
+import pytest
+import pandas as pd
+
+pytest.importorskip("opengsync_server", reason="opengsync-server is not installed (bench.sh builds an image with it)")
+
+from flask import Flask, Response  # noqa: E402
+from werkzeug.datastructures import MultiDict  # noqa: E402
+
+from opengsync_db import DBHandler  # noqa: E402
+
+from opengsync_server import msf_cache  # noqa: E402
+from opengsync_server.tools import utils  # noqa: E402
+from opengsync_server.tools.spread_sheet_components import TextColumn, IntegerColumn, FloatColumn  # noqa: E402
+from opengsync_server.forms.SpreadsheetInput import SpreadsheetInput  # noqa: E402
+from opengsync_server.forms.MultiStepForm import MultiStepForm  # noqa: E402
+
+from .seed import Dataset, random_barcode  # noqa: E402
+
+
+@pytest.fixture(scope="module")  # type: ignore
+def app(tmp_path_factory):
+    app = Flask("benchmark")
+    app.config.update(SECRET_KEY="benchmark", WTF_CSRF_ENABLED=False)
+    app.uploads_folder = tmp_path_factory.mktemp("uploads")  # type: ignore[attr-defined]
+    with app.test_request_context():
+        yield app
+
+
+def barcode_table(num_rows: int, num_lanes: int = 1) -> pd.DataFrame:
+    rng = random.Random(num_rows)
+    return pd.DataFrame({
+        "lane": [i % num_lanes + 1 for i in range(num_rows)],
+        "sequence_i7": [random_barcode(rng, 10) for _ in range(num_rows)],
+        "sequence_i5": [random_barcode(rng, 10) for _ in range(num_rows)],
+    })
+
+
+def test_check_indices(benchmark, table_size: int):
+    df = benchmark(utils.check_indices, barcode_table(table_size))
+    assert len(df) == table_size
+
+
+def test_check_indices_per_lane(benchmark, table_size: int):
+    df = benchmark(utils.check_indices, barcode_table(table_size, num_lanes=4), groupby="lane")
+    assert len(df) == table_size
+
+
+def spreadsheet_columns() -> list:
+    return [
+        TextColumn("library_name", "Library Name", 250, required=True, unique=True, max_length=64),
+        TextColumn("sample_name", "Sample Name", 250, required=True, max_length=64),
+        TextColumn("sequence_i7", "Sequence i7", 150, max_length=32, validation_fnc=utils.check_string),
+        TextColumn("sequence_i5", "Sequence i5", 150, max_length=32, validation_fnc=utils.check_string),
+        IntegerColumn("lane", "Lane", 80),
+        FloatColumn("num_m_reads", "M Reads", 80),
+    ]
+
+
+def test_spreadsheet_validate(benchmark, app: Flask, table_size: int):
+    barcodes = barcode_table(table_size, num_lanes=4)
+    data = [
+        [f"library_{i}", f"sample_{i}", row.sequence_i7, row.sequence_i5, str(row.lane), "12.5"]
+        for i, row in enumerate(barcodes.itertuples())
+    ]
+    columns = spreadsheet_columns()
+    formdata = MultiDict({
+        "spreadsheet": json.dumps(data),
+        "columns": json.dumps(",".join(column.name for column in columns)),
+    })
+
+    def validate() -> SpreadsheetInput:
+        form = SpreadsheetInput(columns=spreadsheet_columns(), post_url="", csrf_token=None, formdata=formdata)
+        assert form.validate(), form._errors
+        return form
+
+    assert len(benchmark(validate).df) == table_size
+
+
+class BenchmarkForm(MultiStepForm):
+    _workflow_name = "benchmark"
+    _step_name = "benchmark"
+
+    def __init__(self, uuid: str | None, step_name: str = "benchmark"):
+        MultiStepForm.__init__(
+            self, workflow=BenchmarkForm._workflow_name, uuid=uuid, step_name=step_name, step_args={},
+            formdata=MultiDict({"csrf_token": "benchmark"}),
+        )
+
+    def process_request(self) -> Response:
+        """Persists the step, the next request continues with the same `uuid`."""
+        self.update_data()
+        return Response(status=204)
+
+
+def test_multi_step_form_round_trip(benchmark, app: Flask, db: DBHandler, dataset: Dataset):
+    """Two steps of a workflow: write the library table, read it back in the next request and write it again."""
+    if (redis_host := os.environ.get("REDIS_HOST")) is None:
+        pytest.skip("REDIS_HOST is not set")
+    msf_cache.connect(redis_host, int(os.environ["REDIS_PORT"]), 0)
+
+    library_table = db.pd.get_seq_request_libraries(dataset.seq_request_id, include_indices=True)
+
+    def round_trip():
+        form = BenchmarkForm(uuid=None, step_name="first")
+        form.add_table("library_table", library_table)
+        form.update_data()
+
+        form = BenchmarkForm(uuid=form.uuid, step_name="second")
+        table = form.tables["library_table"]
+        form.update_table("library_table", table)
+        form.complete()
+        return table
+
+    assert len(benchmark(round_trip)) == len(library_table)
@@ -1,4 +1,7 @@
-from opengsync_db import DBHandler
+import pytest
+
+from opengsync_db import DBHandler, exceptions
+from opengsync_db.categories import IndexType, BarcodeType
 
 from .create_units import create_user
 
@@ -29,4 +32,34 @@ def test_db(db: DBHandler):
 
     db.rollback()
 
-    assert len(db.users.find(limit=None)[0]) == 1
\ No newline at end of file
+    assert len(db.users.find(limit=None)[0]) == 1
+
+
+def test_get_many(db: DBHandler):
+    users = [create_user(db) for _ in range(3)]
+    ids = [user.id for user in users]
+
+    res = db.users.get_many(ids + [ids[0]])
+    assert list(sorted(res.keys())) == sorted(ids)
+    assert all(res[user.id] is user for user in users)
+
+    assert db.users.get_many([]) == {}
+
+    missing_id = max(ids) + 1000
+    with pytest.raises(exceptions.ElementDoesNotExist, match=str(missing_id)):
+        db.users.get_many(ids + [missing_id])
+
+    assert db.users.get_many(ids + [missing_id], missing_ok=True).keys() == set(ids)
+
+
+def test_index_kit_content_hashes(db: DBHandler):
+    kit = db.index_kits.create(identifier="hash_kit", name="hash_kit", supported_protocols=[], type=IndexType.SINGLE_INDEX_I7)
+    hashes = db.index_kits.get_content_hashes()
+    assert IndexType.SINGLE_INDEX_I7.id in hashes
+
+    adapter = db.adapters.create(index_kit_id=kit.id, well="A1")
+    db.barcodes.create(name="SI-A1", sequence="ACGTACGT", well="A1", type=BarcodeType.INDEX_I7, adapter_id=adapter.id)
+    updated = db.index_kits.get_content_hashes()
+    assert updated[IndexType.SINGLE_INDEX_I7.id] != hashes[IndexType.SINGLE_INDEX_I7.id]
+    assert {k: v for k, v in updated.items() if k != IndexType.SINGLE_INDEX_I7.id} == {k: v for k, v in hashes.items() if k != IndexType.SINGLE_INDEX_I7.id}
+    assert db.index_kits.get_content_hashes() == updated
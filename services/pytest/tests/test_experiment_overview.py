@@ -0,0 +1,117 @@
+import sqlalchemy as sa
+
+from opengsync_db import DBHandler, categories, models
+from opengsync_db.categories import ExperimentWorkFlow
+
+from .create_units import create_user, create_seq_request, create_library, create_pool, create_experiment
+
+
+def is_stale(db: DBHandler, experiment_id: int) -> bool | None:
+    # written by the triggers, not through the session
+    return db.session.execute(
+        sa.select(models.ExperimentOverview.stale).where(models.ExperimentOverview.experiment_id == experiment_id)
+    ).scalar_one_or_none()
+
+
+def test_experiment_overview(db: DBHandler):
+    user = create_user(db)
+    seq_request = create_seq_request(db, user)
+    experiment = create_experiment(db, user, ExperimentWorkFlow.NOVASEQ_6K_S4_XP)
+
+    # lanes created with the experiment
+    assert is_stale(db, experiment.id) is True
+    assert db.experiments.update_overviews([experiment.id]) == [experiment.id]
+    assert is_stale(db, experiment.id) is False
+
+    overview = db.experiments.get_overview(experiment.id)
+    assert overview is not None
+    db.refresh(overview)
+    assert overview.graph == {"nodes": [], "links": []}
+    assert overview.lanes is not None
+    assert [lane["lane"] for lane in overview.lanes] == list(range(1, experiment.num_lanes + 1))
+    assert all(lane["num_libraries"] == 0 for lane in overview.lanes)
+
+    pool = create_pool(db, user, seq_request)
+    pool.num_m_reads_requested = 100
+    libraries = [create_library(db, user, seq_request) for _ in range(2)]
+    for library in libraries:
+        db.libraries.add_to_pool(library_id=library.id, pool_id=pool.id)
+    db.flush()
+    assert is_stale(db, experiment.id) is False
+
+    db.links.link_pool_experiment(experiment.id, pool.id)
+    db.links.add_pool_to_lane(experiment.id, pool_id=pool.id, lane_num=1)
+    db.links.add_pool_to_lane(experiment.id, pool_id=pool.id, lane_num=2)
+    assert is_stale(db, experiment.id) is True
+
+    assert experiment.id in db.experiments.update_overviews()
+    assert is_stale(db, experiment.id) is False
+
+    overview = db.experiments.get_overview(experiment.id)
+    assert overview is not None
+    db.refresh(overview)
+    assert overview.graph is not None
+    assert overview.graph["nodes"][0]["name"] == experiment.name
+    assert len(overview.graph["nodes"]) == 1 + 2 + 1 + 1 + len(libraries)
+    lane_links = [link for link in overview.graph["links"] if link["target"] == 0]
+    assert [link["value"] for link in lane_links] == [1.0, 1.0]
+
+    assert overview.lanes is not None
+    lanes = {lane["lane"]: lane for lane in overview.lanes}
+    assert lanes[1]["num_pools"] == 1
+    assert lanes[1]["num_libraries"] == len(libraries)
+    assert lanes[1]["num_m_reads_requested"] == 50
+    assert lanes[1]["share"] == 0.5
+    assert lanes[3]["num_libraries"] == 0
+    assert lanes[3]["share"] is None
+
+    # columns not shown in the overview
+    library = db.libraries[libraries[0].id]
+    library.status = categories.LibraryStatus.SEQUENCED
+    db.libraries.update(library)
+    pool = db.pools[pool.id]
+    pool.status = categories.PoolStatus.SEQUENCED
+    db.pools.update(pool)
+    db.flush()
+    assert is_stale(db, experiment.id) is False
+
+    pool.num_m_reads_requested = 200
+    db.pools.update(pool)
+    db.flush()
+    assert is_stale(db, experiment.id) is True
+    db.experiments.update_overviews([experiment.id])
+    db.refresh(overview)
+
+    assert db.experiments.compute_overview(experiment.id) == (overview.graph, overview.lanes)
+
+    # requests are shown by name
+    seq_request = db.seq_requests[seq_request.id]
+    seq_request.name = "renamed"
+    db.seq_requests.update(seq_request)
+    db.flush()
+    assert is_stale(db, experiment.id) is True
+    db.experiments.update_overviews([experiment.id])
+    db.refresh(overview)
+    assert overview.graph is not None
+    assert "renamed" in [node["name"] for node in overview.graph["nodes"]]
+
+
+def test_experiment_overview_commit(db: DBHandler):
+    user = create_user(db)
+    experiment = create_experiment(db, user, ExperimentWorkFlow.NOVASEQ_6K_S4_XP)
+    experiment_id, sequencer_id, user_id = experiment.id, experiment.sequencer_id, user.id
+    db.commit()
+
+    try:
+        assert is_stale(db, experiment_id) is True
+        assert db.experiments.update_overviews([experiment_id]) == [experiment_id]
+        assert db.close_session(commit=True)
+
+        db.open_session()
+        assert is_stale(db, experiment_id) is False
+    finally:
+        # committed, i.e. not rolled back with the test session
+        db.experiments.delete(experiment_id)
+        db.sequencers.delete(sequencer_id)
+        db.users.delete(user_id)
+        db.commit()
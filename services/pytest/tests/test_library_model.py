@@ -1,4 +1,6 @@
-from opengsync_db import DBHandler, categories
+import pandas as pd
+
+from opengsync_db import DBHandler, categories, models
 
 from .create_units import (
     create_user, create_project, create_seq_request, create_sample, create_library,
@@ -172,3 +174,52 @@ def test_experiment_link(db: DBHandler):
     db.refresh(experiment)
     assert len(experiment.pools) == 0
     assert len(experiment.libraries) == 0
+
+
+def test_library_seq_qualities(db: DBHandler):
+    user = create_user(db)
+    seq_request = create_seq_request(db, user)
+    pool = create_pool(db, user, seq_request)
+    libraries = [create_library(db, user, seq_request) for _ in range(3)]
+    for library in libraries:
+        db.libraries.add_to_pool(library.id, pool.id)
+    experiment = create_experiment(db, user, categories.ExperimentWorkFlow.NOVASEQ_6K_S4_XP)
+
+    df = pd.DataFrame({
+        "library_id": [libraries[0].id, libraries[1].id, None, libraries[0].id],
+        "lane": [1, 1, 1, 2],
+        "num_lane_reads": [100, 100, 100, 50],
+        "num_library_reads": [60, 30, 10, 50],
+        "mean_quality_pf_r1": [35.0, 36.0, None, 34.0],
+        "q30_perc_r1": [93.0, 94.0, None, 92.0],
+    })
+    assert db.libraries.set_seq_qualities(experiment.id, df) == 4
+    assert db.libraries.set_seq_qualities(experiment.id, df.assign(num_library_reads=[61, 29, 10, 50])) == 4
+
+    qualities = db.session.query(models.SeqQuality).where(models.SeqQuality.experiment_id == experiment.id).all()
+    assert len(qualities) == 4
+    assert {(q.library_id, q.lane): q.num_library_reads for q in qualities} == {
+        (libraries[0].id, 1): 61, (libraries[1].id, 1): 29, (None, 1): 10, (libraries[0].id, 2): 50,
+    }
+
+    # the same library listed twice (by name and by id) in one batch
+    duplicated = pd.DataFrame({
+        "library_id": [libraries[1].id, libraries[1].id],
+        "lane": [2, 2],
+        "num_lane_reads": [50, 50],
+        "num_library_reads": [10, 30],
+        "mean_quality_pf_r1": [30.0, 34.0],
+        "q30_perc_r1": [90.0, None],
+    })
+    assert db.libraries.set_seq_qualities(experiment.id, duplicated) == 1
+    quality = db.session.query(models.SeqQuality).where(
+        models.SeqQuality.experiment_id == experiment.id, models.SeqQuality.library_id == libraries[1].id, models.SeqQuality.lane == 2,
+    ).one()
+    assert quality.num_library_reads == 40
+    assert quality.mean_quality_pf_r1 == 33.0
+    assert quality.q30_perc_r1 == 90.0
+
+    db.refresh(pool)
+    assert pool.status == categories.PoolStatus.SEQUENCED
+    assert [library.status for library in pool.libraries if library.id != libraries[2].id] == [categories.LibraryStatus.SEQUENCED] * 2
+    assert db.libraries.get(libraries[2].id).status != categories.LibraryStatus.SEQUENCED  # type: ignore
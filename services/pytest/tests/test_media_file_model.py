@@ -0,0 +1,56 @@
+import hashlib
+
+from opengsync_db import DBHandler
+from opengsync_db.categories import MediaFileType
+
+from .create_units import create_user, create_seq_request
+
+
+def test_media_blob_ref_count(db: DBHandler):
+    user = create_user(db)
+    seq_request_1 = create_seq_request(db, user)
+    seq_request_2 = create_seq_request(db, user)
+    sha256 = hashlib.sha256(b"test_media_blob_ref_count").hexdigest()
+
+    file_1 = db.media_files.create(
+        name="report", type=MediaFileType.BIOANALYZER_REPORT, uploader_id=user.id,
+        extension=".PDF", size_bytes=25, sha256=sha256, seq_request_id=seq_request_1.id,
+    )
+    file_2 = db.media_files.create(
+        name="report", type=MediaFileType.BIOANALYZER_REPORT, uploader_id=user.id,
+        extension=".pdf", size_bytes=25, sha256=sha256, seq_request_id=seq_request_2.id,
+    )
+
+    assert file_1.uuid != file_2.uuid
+    assert file_1.blob_id is not None
+    assert file_1.blob_id == file_2.blob_id
+    assert file_1.path == file_2.path
+    assert file_1.path.endswith(f"{sha256}.pdf")
+
+    blob = db.media_files.acquire_blob(sha256=sha256, extension=".pdf", size_bytes=25)
+    assert blob.ref_count == 2
+    assert blob.unreferenced_utc is None
+
+    db.media_files.delete(file_1.id)
+    db.session.refresh(blob)
+    assert blob.ref_count == 1
+    assert blob.unreferenced_utc is None
+
+    # cascaded delete releases the reference as well
+    db.seq_requests.delete(seq_request_2.id)
+    db.session.refresh(blob)
+    assert blob.ref_count == 0
+    assert blob.unreferenced_utc is not None
+
+
+def test_media_file_without_blob(db: DBHandler):
+    user = create_user(db)
+    seq_request = create_seq_request(db, user)
+
+    file = db.media_files.create(
+        name="pooling", type=MediaFileType.LANE_POOLING_TABLE, uploader_id=user.id,
+        extension=".tsv", size_bytes=10, seq_request_id=seq_request.id,
+    )
+    assert file.blob_id is None
+    assert file.path.endswith(f"{file.uuid}.tsv")
+    assert file.blob is None
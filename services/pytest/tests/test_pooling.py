@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from opengsync_db import models, pooling
+
+
+def test_molarity():
+    pool = models.Pool(qubit_concentration=2.0, avg_fragment_size=400)
+    assert pool.molarity == pooling.molarity(2.0, 400)
+    assert np.isclose(pool.molarity, 7.5757575)  # type: ignore
+
+    colors = pooling.molarity_color(pd.Series([0.1, 2.0, np.nan, 100.0]), models.Pool)
+    assert colors.tolist() == ["cemm-red", "cemm-green", "cemm-green", "cemm-red"]
+
+
+def test_pipetting_table():
+    df = pd.DataFrame({
+        "lane_id": [1, 1, 2],
+        "num_m_reads": [100.0, 300.0, 50.0],
+        "qubit_concentration": [2.0, 4.0, 2.0],
+        "avg_fragment_size": [400, 400, 400],
+    })
+    df = pooling.pipetting_table(df, target_molarity=3.0, total_volume=50.0, by="lane_id")
+    assert df["share"].tolist() == [0.25, 0.75, 1.0]
+    assert np.allclose(df["pipet"], 3.0 / df["molarity"] * df["share"] * 50.0)
+
+    df = pooling.pipetting_table(df, target_molarity=3.0, total_volume=50.0)
+    assert np.isclose(df["share"].sum(), 1.0)
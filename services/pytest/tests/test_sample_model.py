@@ -0,0 +1,39 @@
+import pytest
+import pandas as pd
+
+from opengsync_db import DBHandler, exceptions
+from opengsync_db.categories import AttributeType
+
+from .create_units import create_user, create_project, create_sample
+
+
+def test_set_attributes(db: DBHandler):
+    user = create_user(db)
+    project = create_project(db, user)
+    samples = [create_sample(db, user, project) for _ in range(3)]
+
+    db.samples.set_attribute(samples[0].id, value="old", type=AttributeType.CUSTOM, name="kept")
+    db.samples.set_attribute(samples[0].id, value="liver", type=AttributeType.TISSUE, name=None)
+
+    n = db.samples.set_attributes(pd.DataFrame([
+        dict(sample_id=samples[0].id, name="tissue", type=AttributeType.TISSUE, value=None),
+        dict(sample_id=samples[0].id, name="Batch Number", type=AttributeType.CUSTOM, value=3),
+        dict(sample_id=samples[1].id, name="whatever", type=AttributeType.SEX, value="female"),
+        dict(sample_id=samples[1].id, name="unknown", type=AttributeType.CUSTOM, value=None),
+    ]))
+    assert n == 2
+
+    for sample in samples:
+        db.refresh(sample)
+
+    assert {a.name: a.value for a in samples[0].attributes} == {"kept": "old", "batch_number": 3}
+    assert samples[0].get_attribute("batch_number").type == AttributeType.CUSTOM  # type: ignore[union-attr]
+    assert {a.name: a.value for a in samples[1].attributes} == {"sex": "female"}
+    assert samples[1].get_attribute("sex").type == AttributeType.SEX  # type: ignore[union-attr]
+    assert samples[2].attributes == []
+
+    with pytest.raises(exceptions.ElementDoesNotExist):
+        db.samples.set_attributes(pd.DataFrame([dict(sample_id=-1, name="sex", type=AttributeType.SEX, value="male")]))
+
+    with pytest.raises(ValueError):
+        db.samples.set_attributes(pd.DataFrame([dict(sample_id=samples[2].id, name=None, type=AttributeType.CUSTOM, value="x")]))
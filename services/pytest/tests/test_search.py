@@ -0,0 +1,52 @@
+import pytest
+import sqlalchemy as sa
+
+from opengsync_db import DBHandler
+from opengsync_db.categories import UserRole
+
+from .create_units import create_user, create_project
+
+
+@pytest.fixture
+def trgm(db: DBHandler):
+    if db.session.execute(sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).scalar() is None:
+        pytest.skip("pg_trgm is not installed")
+
+
+def test_fuzzy_query(db: DBHandler, trgm):
+    user = create_user(db)
+    project = create_project(db, user)
+    for name in ["organoid_1", "organoid_2", "liver_1"]:
+        db.samples.create(name=name, owner_id=user.id, project_id=project.id, status=None)
+
+    samples = db.samples.query("organoid", project_id=project.id)
+    assert sorted(sample.name for sample in samples) == ["organoid_1", "organoid_2"]
+
+    samples = db.samples.query("LIVER", project_id=project.id)
+    assert [sample.name for sample in samples] == ["liver_1"]
+
+    assert db.samples.query("xyz", project_id=project.id) == []
+    assert len(db.samples.query("", project_id=project.id)) == 3
+
+
+def test_global_search(db: DBHandler, trgm):
+    owner = db.users.create(
+        email="client@email.com", first_name="Client", last_name="User",
+        role=UserRole.CLIENT, hashed_password="password",
+    )
+    other = create_user(db)
+    own_project = create_project(db, owner)
+    other_project = create_project(db, other)
+    for i in range(3):
+        db.samples.create(name=f"kidney_{i}", owner_id=owner.id, project_id=own_project.id, status=None)
+        db.samples.create(name=f"kidney_{i + 3}", owner_id=other.id, project_id=other_project.id, status=None)
+
+    results = db.search.query("kidney", user=owner, limit_per_type=2)
+    assert "user" not in results
+    assert len(results["sample"]) == 2
+    assert all(result.name in ("kidney_0", "kidney_1", "kidney_2") for result in results["sample"])
+    assert results["sample"][0].similarity >= results["sample"][1].similarity
+
+    results = db.search.query("kidney", user=other, limit_per_type=10)
+    assert len(results["sample"]) == 6
+    assert db.search.query(" ", user=other) == {}
@@ -0,0 +1,107 @@
+from opengsync_db import DBHandler
+from opengsync_db.categories import SeqRequestStatus, LibraryStatus, PoolStatus, SampleStatus, ProjectStatus
+
+from .create_units import (
+    create_user, create_seq_request, create_project, create_sample, create_library, create_pool, create_feature
+)
+
+
+def test_process_seq_request(db: DBHandler):
+    user = create_user(db)
+    project = create_project(db, user)
+    seq_request = create_seq_request(db, user)
+    pool = create_pool(db, user, seq_request)
+
+    libraries = [create_library(db, user, seq_request) for _ in range(4)]
+    for library in libraries[:2]:
+        db.libraries.add_to_pool(library.id, pool.id)
+
+    stored_sample = create_sample(db, user, project)
+    stored_sample.status = SampleStatus.DRAFT
+    external_sample = create_sample(db, user, project)
+    for i, library in enumerate(libraries):
+        db.links.link_sample_library(sample_id=(stored_sample if i % 2 == 0 else external_sample).id, library_id=library.id)
+
+    seq_request, counts = db.seq_requests.process(seq_request.id, SeqRequestStatus.ACCEPTED)
+    assert counts == dict(samples=1, libraries=4, pools=1, projects=1)
+    assert seq_request.status == SeqRequestStatus.ACCEPTED
+
+    for library in libraries:
+        db.refresh(library)
+    assert [library.status for library in libraries] == [LibraryStatus.POOLED] * 2 + [LibraryStatus.ACCEPTED] * 2
+
+    db.refresh(pool)
+    db.refresh(stored_sample)
+    db.refresh(external_sample)
+    db.refresh(project)
+    assert pool.status == PoolStatus.ACCEPTED
+    assert stored_sample.status == SampleStatus.WAITING_DELIVERY
+    assert external_sample.status is None
+    assert project.status == ProjectStatus.PROCESSING
+
+    seq_request, counts = db.seq_requests.process(seq_request.id, SeqRequestStatus.DRAFT)
+    assert counts["libraries"] == 4
+    assert seq_request.timestamp_submitted_utc is None
+    for library in libraries:
+        db.refresh(library)
+        assert library.status == LibraryStatus.DRAFT
+    db.refresh(stored_sample)
+    assert stored_sample.status == SampleStatus.DRAFT
+
+
+def test_clone_seq_request(db: DBHandler):
+    user = create_user(db)
+    project = create_project(db, user)
+    seq_request = create_seq_request(db, user)
+    pools = [create_pool(db, user, seq_request) for _ in range(2)]
+    feature = create_feature(db)
+
+    libraries = [create_library(db, user, seq_request) for _ in range(5)]
+    for i, library in enumerate(libraries):
+        sample = create_sample(db, user, project)
+        db.links.link_sample_library(sample_id=sample.id, library_id=library.id, mux={"barcode": f"BC{i}"})
+        db.links.link_feature_library(feature_id=feature.id, library_id=library.id)
+        db.libraries.add_index(
+            library_id=library.id, index_kit_i7_id=None, name_i7=f"i7_{i}", sequence_i7="ACGTACGT",
+            index_kit_i5_id=None, name_i5=f"i5_{i}", sequence_i5="TTGGCCAA", orientation=None,
+        )
+        if i < 4:
+            db.libraries.add_to_pool(library.id, pools[i % 2].id)
+
+    cloned = db.seq_requests.clone(seq_request.id, method="pooled")
+    assert len(cloned.libraries) == len(libraries)
+    assert len(cloned.pools) == len(pools)
+    assert {pool.original_pool_id for pool in cloned.pools} == {pool.id for pool in pools}
+    assert all(pool.status == PoolStatus.STORED and pool.timestamp_stored_utc is not None for pool in cloned.pools)
+    assert {pool.contact_id for pool in cloned.pools}.isdisjoint({pool.contact_id for pool in pools})
+
+    cloned_pools = {pool.original_pool_id: pool.id for pool in cloned.pools}
+    originals = {library.id: library for library in libraries}
+    for library in cloned.libraries:
+        original = originals[library.original_library_id]
+        assert library.name == original.name
+        assert library.clone_number == 1
+        assert library.status == LibraryStatus.POOLED
+        assert library.pool_id == (cloned_pools[original.pool_id] if original.pool_id is not None else None)
+        assert [(link.sample_id, link.mux) for link in library.sample_links] == [(link.sample_id, link.mux) for link in original.sample_links]
+        assert [f.id for f in library.features] == [feature.id]
+        assert [(index.name_i7, index.sequence_i5) for index in library.indices] == [(index.name_i7, index.sequence_i5) for index in original.indices]
+
+    # clones of clones refer to the first original and keep counting
+    recloned = db.seq_requests.clone(cloned.id, method="raw")
+    assert len(recloned.pools) == 0
+    for library in recloned.libraries:
+        assert library.original_library_id in originals
+        assert library.clone_number == 2
+        assert library.status == LibraryStatus.ACCEPTED
+        assert library.pool_id is None
+        assert len(library.indices) == 0
+        assert len(library.sample_links) == 1
+
+    indexed = db.seq_requests.clone(seq_request.id, method="indexed")
+    assert sorted(library.clone_number for library in indexed.libraries) == [3] * len(libraries)
+    assert all(len(library.indices) == 1 and library.status == LibraryStatus.STORED for library in indexed.libraries)
+
+    library = db.libraries.clone(libraries[0].id, seq_request_id=seq_request.id, indexed=False, status=LibraryStatus.DRAFT)
+    assert library.clone_number == 4
+    assert library.original_library_id == libraries[0].id
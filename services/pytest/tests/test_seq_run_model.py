@@ -0,0 +1,60 @@
+import pandas as pd
+import sqlalchemy as sa
+
+from opengsync_db import DBHandler, models, units
+from opengsync_db.categories import RunStatus, ReadType
+
+
+def test_seq_run_metrics(db: DBHandler):
+    seq_run = db.seq_runs.create(
+        experiment_name="test_metrics", status=RunStatus.FINISHED, instrument_name="NovaSeq",
+        run_folder="run_folder", flowcell_id="FC01", read_type=ReadType.PAIRED_END,
+        r1_cycles=151, i1_cycles=10, r2_cycles=151, i2_cycles=10,
+        quantities={"reads_pf": 2.5 * units.m_read, "pct>=q30": 93.1 * units.percent},
+    )
+
+    assert seq_run.get_quantity("reads_pf").base_value == 2.5e6  # type: ignore
+    assert seq_run.get_quantity("missing") is None
+    assert seq_run.quantities_dict["pct>=q30"] == {"value": 93.1, "unit": "percent", "dimension": "percentage"}
+
+    n = db.seq_runs.set_metrics(seq_run.id, pd.DataFrame({
+        "metric": ["reads_pf", "reads_pf", "reads_pf"],
+        "lane": [0, 1, 2],
+        "read": [0, 0, 0],
+        "value": [3e6, 1e6, 2e6],
+        "unit": ["read", "read", "read"],
+    }))
+    assert n == 3
+
+    assert seq_run.get_quantity("reads_pf").base_value == 3e6  # type: ignore
+    assert set(seq_run.quantities.keys()) == {"reads_pf", "pct>=q30"}
+    assert len(seq_run.metrics) == 4
+
+    db.seq_runs.set_metrics(seq_run.id, pd.DataFrame({
+        "metric": ["reads_pf"], "lane": [0], "read": [0], "value": [4e6], "unit": ["read"],
+    }), replace=True)
+    assert seq_run.quantities == {"reads_pf": 4e6 * units.read}
+    assert len(seq_run.metrics) == 1
+
+
+def test_seq_run_metrics_commit(db: DBHandler):
+    seq_run = db.seq_runs.create(
+        experiment_name="metrics_commit", status=RunStatus.FINISHED, instrument_name="NovaSeq",
+        run_folder="run_folder", flowcell_id="FC02", read_type=ReadType.PAIRED_END,
+        r1_cycles=151, i1_cycles=10, r2_cycles=151, i2_cycles=10,
+    )
+    seq_run_id = seq_run.id
+    db.commit()
+
+    try:
+        db.seq_runs.set_metrics(seq_run_id, pd.DataFrame({
+            "metric": ["reads_pf", "reads_pf"], "lane": [0, 1], "read": [0, 0], "value": [3e6, 1e6], "unit": ["read", "read"],
+        }))
+        assert db.close_session(commit=True)
+
+        db.open_session()
+        assert db.session.query(models.SeqRunMetric).where(models.SeqRunMetric.seq_run_id == seq_run_id).count() == 2
+    finally:
+        # committed, i.e. not rolled back with the test session
+        db.session.execute(sa.delete(models.SeqRun).where(models.SeqRun.id == seq_run_id))
+        db.commit()
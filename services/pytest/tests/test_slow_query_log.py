@@ -0,0 +1,52 @@
+import sqlalchemy as sa
+
+from opengsync_db import DBHandler, models, query_source
+from opengsync_db.core.SlowQueryLog import fingerprint
+
+
+def test_fingerprint():
+    a, normalized = fingerprint("SELECT * FROM library WHERE id IN (%(id_1_1)s, %(id_1_2)s) AND name = 'a'")
+    b, _ = fingerprint("SELECT *  FROM library\nWHERE id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s) AND name = 'b'")
+    assert a == b
+    assert normalized == "SELECT * FROM library WHERE id IN (?, ...) AND name = ?"
+
+
+def test_slow_query_log(db: DBHandler):
+    log = db.enable_slow_query_log(threshold_ms=50, explain_sample_rate=1.0)
+    try:
+        with query_source("test_route"):
+            for _ in range(2):
+                db.session.execute(sa.text("SELECT pg_sleep(0.06), CAST(:x AS INTEGER)"), {"x": 1})
+            db.session.execute(sa.text("SELECT 1"))
+        log.wait()
+
+        slow_queries, _ = db.slow_queries.find(source="test_route", limit=None)
+        assert len(slow_queries) == 1
+        slow_query = slow_queries[0]
+        assert slow_query.calls == 2
+        assert slow_query.max_ms >= 60
+        assert slow_query.last_parameters == {"x": 1}
+        assert slow_query.plan is not None and "actual time" in slow_query.plan
+    finally:
+        log.threshold_ms = float("inf")
+        # recorded on a separate connection, i.e. not rolled back with the test session
+        with db._engine.begin() as conn:
+            conn.execute(sa.delete(models.SlowQuery))
+
+
+def test_slow_query_delete_commit(db: DBHandler):
+    with db._engine.begin() as conn:
+        conn.execute(sa.insert(models.SlowQuery).values(
+            fingerprint="delete_commit", statement="SELECT ?", calls=1, total_ms=1.0, max_ms=1.0, last_ms=1.0,
+            first_seen_utc=sa.func.now(), last_seen_utc=sa.func.now(), last_statement="SELECT 1",
+        ))
+
+    try:
+        assert db.slow_queries.delete() >= 1
+        assert db.close_session(commit=True)
+
+        db.open_session()
+        assert db.session.query(models.SlowQuery).count() == 0
+    finally:
+        with db._engine.begin() as conn:
+            conn.execute(sa.delete(models.SlowQuery))
@@ -0,0 +1,54 @@
+import psycopg
+import sqlalchemy as sa
+
+from opengsync_db import DBHandler, categories, models, STATUS_CHANNEL, parse_status_notification
+from opengsync_db.core.status_events import MAX_IDS_PER_NOTIFY
+
+from .create_units import create_user, create_seq_request, create_library
+
+
+def test_status_notifications(db: DBHandler):
+    user = create_user(db)
+    seq_request = create_seq_request(db, user)
+    libraries = [create_library(db, user, seq_request) for _ in range(MAX_IDS_PER_NOTIFY + 1)]
+    db.commit()
+
+    try:
+        url = db._engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        with psycopg.connect(url, autocommit=True) as conn:
+            conn.execute(f"LISTEN {STATUS_CHANNEL}")
+
+            # unchanged status, no notification
+            db.session.execute(
+                sa.update(models.Library).where(models.Library.id == libraries[0].id).values(status_id=libraries[0].status_id)
+            )
+            db.commit()
+            assert list(conn.notifies(timeout=0.5)) == []
+
+            library = db.libraries[libraries[0].id]
+            library.status = categories.LibraryStatus.SEQUENCED
+            db.libraries.update(library)
+            db.commit()
+
+            notifies = list(conn.notifies(timeout=0.5))
+            assert [parse_status_notification(n.payload) for n in notifies] == [("library", [library.id])]
+
+            # one set-based update, chunked into several notifications
+            db.session.execute(
+                sa.update(models.Library).where(models.Library.seq_request_id == seq_request.id)
+                .values(status_id=categories.LibraryStatus.ARCHIVED.id)
+            )
+            db.commit()
+
+            notified: list[int] = []
+            for notify in conn.notifies(timeout=0.5):
+                table, ids = parse_status_notification(notify.payload)
+                assert table == "library"
+                assert len(ids) <= MAX_IDS_PER_NOTIFY
+                notified.extend(ids)
+            assert sorted(notified) == sorted(library.id for library in libraries)
+    finally:
+        # committed, i.e. not rolled back with the test session
+        db.seq_requests.delete(seq_request.id)
+        db.users.delete(user.id)
+        db.commit()
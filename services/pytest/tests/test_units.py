@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from opengsync_db import units
+
+
+def test_unit_next_prev():
+    assert units.read.next() is units.k_read
+    assert units.m_read.next() in (units.g_read, units.b_read)
+    assert units.g_read.next() is None
+    assert units.b_read.prev() is units.m_read
+    assert units.read.prev() is None
+
+    assert (5e9 * units.read).compact().unit.factor_to_base == 1e9
+    assert (0.0001 * units.count).compact().unit is units.mu_count
+
+
+def test_quantity_array():
+    reads = np.array([1e6, 2.5e6, np.nan]) * units.read
+    assert isinstance(reads, units.QuantityArray)
+    assert reads.compact().unit is units.m_read
+    assert np.allclose(reads.to(units.k_read).values[:2], [1e3, 2.5e3])
+
+    total = reads + 1 * units.k_read
+    assert total.unit is units.read
+    assert np.allclose(total.values[:2], [1.001e6, 2.501e6])
+    assert np.isnan(total.values[2])
+
+    restored = units.from_dict(reads.to_dict())
+    assert isinstance(restored, units.QuantityArray)
+    assert np.array_equal(restored.values, reads.values, equal_nan=True)
+
+    q = units.from_dict((5 * units.k_count).to_dict())
+    assert isinstance(q, units.Quantity)
+    assert q.base_value == 5000
+
+
+def test_quantity_dtype():
+    s = pd.Series([1e6, 3e6], name="reads_pf") * units.read
+    assert str(s.dtype) == "quantity[read]"
+    assert s.sum().to(units.m_read).value == 4.0
+    assert (s > 2 * units.m_read).tolist() == [False, True]
+
+    converted = s.astype("quantity[m_read]")
+    assert converted.to_numpy(dtype=float).tolist() == [1.0, 3.0]
+
+    concatenated = pd.concat([s, pd.Series(np.array([2.0]) * units.m_read)])
+    assert concatenated.dtype == s.dtype
+    assert concatenated.to_numpy(dtype=float).tolist() == [1e6, 3e6, 2e6]
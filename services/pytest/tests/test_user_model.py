@@ -1,8 +1,8 @@
 from opengsync_db import DBHandler
-from opengsync_db.categories import UserRole
+from opengsync_db.categories import UserRole, AccessType, AffiliationType
 
 from .create_units import (
-    create_user, create_project, create_seq_request, create_sample, create_library, create_pool,
+    create_user, create_project, create_seq_request, create_sample, create_library, create_pool, create_group,
 )
 
 
@@ -180,3 +180,49 @@ def test_user_links(db: DBHandler):
     assert user is not None
     assert user.num_seq_requests == 0
     assert len(user.requests) == 0
+
+
+def test_access_types(db: DBHandler):
+    owner = create_user(db)
+    member = create_user(db)
+    stranger = create_user(db)
+    admin = create_user(db)
+    for user in (owner, member, stranger):
+        user.role_id = UserRole.CLIENT.id
+        db.users.update(user)
+
+    group = create_group(db, owner)
+    db.groups.add_user(member.id, group.id, AffiliationType.MEMBER)
+
+    project = create_project(db, owner)
+    seq_request = create_seq_request(db, owner)
+    grouped_request = create_seq_request(db, owner)
+    grouped_request.group_id = group.id
+    db.seq_requests.update(grouped_request)
+
+    library = create_library(db, owner, grouped_request)
+    pool = create_pool(db, owner, grouped_request)
+    sample = create_sample(db, owner, project)
+    db.links.link_sample_library(sample.id, library.id)
+    other_sample = create_sample(db, owner, project)
+
+    request_ids = [seq_request.id, grouped_request.id]
+    assert db.seq_requests.get_access_types(request_ids, owner) == {seq_request.id: AccessType.OWNER, grouped_request.id: AccessType.OWNER}
+    assert db.seq_requests.get_access_types(request_ids, member) == {seq_request.id: AccessType.NONE, grouped_request.id: AccessType.EDIT}
+    assert db.seq_requests.get_access_types(request_ids, stranger) == {seq_request.id: AccessType.NONE, grouped_request.id: AccessType.NONE}
+
+    assert db.samples.get_access_types([sample.id, other_sample.id], member) == {sample.id: AccessType.EDIT, other_sample.id: AccessType.NONE}
+    assert db.libraries.get_access_types([library.id], member) == {library.id: AccessType.EDIT}
+    assert db.pools.get_access_types([pool.id], member) == {pool.id: AccessType.EDIT}
+    assert db.projects.get_access_types([project.id, -1], member) == {project.id: AccessType.NONE, -1: AccessType.NONE}
+
+    assert db.libraries.get_access_type(library, member) == AccessType.EDIT
+    assert db.samples.get_access_type(sample, owner) == AccessType.OWNER
+    assert db.pools.get_access_type(pool, stranger) == AccessType.NONE
+    assert db.projects.get_access_types([project.id], admin) == {project.id: AccessType.ADMIN}
+
+    # memoized until the session writes
+    assert (db.samples.name, member.id, sample.id) in db.access_types
+    db.groups.remove_user(member.id, group.id)
+    db.flush()
+    assert db.samples.get_access_types([sample.id], member) == {sample.id: AccessType.NONE}